@@ -90,6 +90,19 @@ for child in Path("src/Plugins").iterdir():
         ),
     )
 
+# Data used by the plugins (e.g. the DefinitionList lemmas); the scripts that generate the data are
+# not needed at runtime.
+for child in Path("src/Plugins/Data").iterdir():
+    if child.suffix != ".txt":
+        continue
+
+    include_files.append(
+        (
+            str(child),
+            str(Path(*child.parts[1:])),
+        ),
+    )
+
 for child in Path("src/Examples").iterdir():
     if not child.is_file:
         continue
@@ -15,7 +15,10 @@
 # ----------------------------------------------------------------------
 """EndToEnd tests invoked from a development environment."""
 
+import io
+import json
 import re
+import subprocess
 import sys
 import textwrap
 
@@ -25,6 +28,7 @@ from unittest.mock import MagicMock as Mock
 
 import click
 import pytest
+import typer
 
 from Common_Foundation.ContextlibEx import ExitStack
 from Common_Foundation import PathEx
@@ -35,7 +39,8 @@ from Common_Foundation import PathEx
 # ----------------------------------------------------------------------
 sys.path.insert(0, str(PathEx.EnsureDir(Path(__file__).parent.parent.parent)))
 with ExitStack(lambda: sys.path.pop(0)):
-    from EntryPoint.__main__ import Execute, Validate
+    from EntryPoint.__main__ import Batch, Execute, OutputFormat, ProgressDisplay, Validate, _ModifyContent, _SummaryProgress
+    from MarkdownModifier.Session import Session
 
 
 # ----------------------------------------------------------------------
@@ -185,6 +190,79 @@ class TestStandard(object):
         assert _file_system.HasChanged(Path("Dir2/Dir3/10.md")) is False
         assert _file_system.HasChanged(Path("Dir2/Dir3/20.md")) is False
 
+    # ----------------------------------------------------------------------
+    def test_CacheDir(self, _file_system, _executor):
+        cache_dir = Path("Cache").resolve()
+
+        _executor(Path(), cache_dir=cache_dir)
+
+        assert (cache_dir / "DefinitionList.stems.json").is_file()
+        assert _file_system.HasChanged(Path("Two.md"))
+
+    # ----------------------------------------------------------------------
+    def test_ExportedDefinitions(self, _file_system, _executor):
+        # Definitions exported by a file are linked in all files, regardless of the order in which
+        # the files are found.
+        with Path("Dir1/Page.md").open("w") as f:
+            f.write("Some widgets.\n")
+
+        with Path("Glossary.md").open("w") as f:
+            f.write(
+                textwrap.dedent(
+                    """\
+                    <!-- [[[
+                        DefinitionList(
+                            {
+                                "widget": "The definition for widget.",
+                            },
+                            export=True,
+                        )
+                    ]]] -->
+
+                    <!-- [[[end]]] -->
+                    """,
+                ),
+            )
+
+        _executor(Path())
+
+        assert Path("Dir1/Page.md").open().read() == 'Some <a href="../Glossary.md#widget" data-definition-list-link=1>widgets</a>.\n'
+
+    # ----------------------------------------------------------------------
+    def test_ReadPrerequisitesOnce(self, tmp_path, _executor, monkeypatch):
+        (tmp_path / "A.md").write_text(_TABLE_OF_CONTENTS)
+        (tmp_path / "Glossary.md").write_text(_GLOSSARY.format(definitions='"widget": "A widget.",'))
+
+        read_filenames: list[str] = []
+
+        original_open = Path.open
+
+        # ----------------------------------------------------------------------
+        def Open(self, mode="r", *args, **kwargs):
+            if self.parent == tmp_path and "r" in mode:
+                read_filenames.append(self.name)
+
+            return original_open(self, mode, *args, **kwargs)
+
+        # ----------------------------------------------------------------------
+
+        monkeypatch.setattr(Path, "open", Open)
+
+        # Prerequisites are read once, even though their content is used to determine the order in
+        # which files are processed; the content of other files isn't retained, so they are read
+        # again when they are processed.
+        assert _executor(tmp_path) == 0
+        assert sorted(read_filenames) == ["A.md", "A.md", "Glossary.md"]
+
+    # ----------------------------------------------------------------------
+    def test_InvalidEncoding(self, tmp_path, _executor, capsys):
+        (tmp_path / "A.md").write_bytes(b"\xff\xfe Invalid\n")
+        (tmp_path / "B.md").write_text(_TABLE_OF_CONTENTS)
+
+        # Files that can't be read are errors, but don't prevent the other files from being processed
+        assert _executor(tmp_path, output_format=OutputFormat.ndjson) != 0
+        assert _GetRecordStatuses(capsys) == [("A.md", "error"), ("B.md", "modified")]
+
 
 # ----------------------------------------------------------------------
 class TestValidate(object):
@@ -197,12 +275,589 @@ class TestValidate(object):
         assert _validator(Path("Three.md")) == 0
 
 
+# ----------------------------------------------------------------------
+class TestNdjson(object):
+    # ----------------------------------------------------------------------
+    def test_Execute(self, _file_system, _executor, capsys):
+        assert _executor(Path("Dir1"), output_format=OutputFormat.ndjson) == 0
+
+        records = sorted(
+            (json.loads(line) for line in capsys.readouterr().out.splitlines()),
+            key=lambda record: record["filename"],
+        )
+
+        assert [(Path(record["filename"]).name, record["status"]) for record in records] == [
+            ("A.md", "unchanged"),
+            ("B.md", "modified"),
+        ]
+
+        for record in records:
+            assert set(record) == {"filename", "status", "duration", "input_size", "output_size", "cache_hit", "plugins"}
+            assert record["duration"] >= 0
+
+        assert records[0]["input_size"] == records[0]["output_size"] == len(_file_system.GetContent(Path("Dir1/A.md")))
+        assert records[0]["plugins"] == ["DefinitionList"]
+
+        assert records[1]["input_size"] == len(_file_system.GetContent(Path("Dir1/B.md")))
+        assert records[1]["output_size"] > records[1]["input_size"]
+        assert records[1]["plugins"] == ["TableOfContents"]
+
+        assert _file_system.HasChanged(Path("Dir1/A.md")) is False
+        assert _file_system.HasChanged(Path("Dir1/B.md"))
+
+    # ----------------------------------------------------------------------
+    def test_Error(self, _file_system, _executor, capsys):
+        with Path("Error.md").open("w") as f:
+            f.write("<!-- [[[ DoesNotExist() ]]] -->\n<!-- [[[end]]] -->\n")
+
+        assert _executor(Path("Error.md"), output_format=OutputFormat.ndjson) != 0
+
+        records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+        assert len(records) == 1
+        assert records[0]["status"] == "error"
+        assert records[0]["output_size"] is None
+        assert "DoesNotExist" in records[0]["error"]
+
+    # ----------------------------------------------------------------------
+    @pytest.mark.parametrize("output_format", [OutputFormat.text, OutputFormat.ndjson])
+    def test_ErrorWritesNothing(self, tmp_path, _executor, output_format):
+        (tmp_path / "A.md").write_text(_TABLE_OF_CONTENTS)
+        (tmp_path / "B.md").write_text("<!-- [[[ DoesNotExist() ]]] -->\n<!-- [[[end]]] -->\n")
+
+        # Files are only written if all files were processed successfully, regardless of the format
+        assert _executor(tmp_path, output_format=output_format) != 0
+        assert (tmp_path / "A.md").read_text() == _TABLE_OF_CONTENTS
+
+    # ----------------------------------------------------------------------
+    def test_BlockCacheHit(self, tmp_path):
+        (tmp_path / "BlockCacheHitPlugin.py").write_text(
+            textwrap.dedent(
+                """\
+                from dataclasses import dataclass
+                from pathlib import Path
+                from typing import ClassVar, Optional
+
+                from MarkdownModifier.Plugin import Plugin as PluginBase
+
+
+                @dataclass(frozen=True)
+                class Plugin(PluginBase):
+                    name: ClassVar[str] = "Pure"
+
+                    def GetPureExecuteVersion(self) -> Optional[str]:
+                        return "1"
+
+                    def Execute(self, filename: Path) -> str:
+                        return "Output"
+                """,
+            ),
+        )
+
+        records: list[dict[str, Any]] = []
+
+        with Session(tmp_path) as session:
+            for _ in range(2):
+                record: dict[str, Any] = {}
+
+                _ModifyContent(
+                    session,
+                    Path("Test.md"),
+                    "<!-- [[[ Pure() ]]] -->\n<!-- [[[end]]] -->\n",
+                    record=record,
+                )
+
+                records.append(record)
+
+        # Output served from the block cache is a cache hit
+        assert [record["cache_hit"] for record in records] == [False, True]
+
+    # ----------------------------------------------------------------------
+    def test_Validate(self, _file_system, _validator, capsys):
+        assert _validator(Path("Dir1"), output_format=OutputFormat.ndjson) == 1
+
+        records = sorted(
+            (json.loads(line) for line in capsys.readouterr().out.splitlines()),
+            key=lambda record: record["filename"],
+        )
+
+        assert [(Path(record["filename"]).name, record["status"]) for record in records] == [
+            ("A.md", "unchanged"),
+            ("B.md", "modified"),
+        ]
+
+        assert _file_system.HasChanged(Path("Dir1/B.md")) is False
+
+    # ----------------------------------------------------------------------
+    def test_Stdin(self, _file_system, _executor):
+        with pytest.raises(typer.BadParameter):
+            _executor(Path("-"), output_format=OutputFormat.ndjson)
+
+
+# ----------------------------------------------------------------------
+class TestGit(object):
+    # ----------------------------------------------------------------------
+    def test_ChangedSince(self, _git_repo, _validator, capsys):
+        (_git_repo / "B.md").write_text(_TABLE_OF_CONTENTS + "## Heading 2\n")
+        (_git_repo / "C.md").write_text(_TABLE_OF_CONTENTS)
+
+        assert _validator(_git_repo, changed_since="HEAD", output_format=OutputFormat.ndjson) == 1
+        assert _GetRecordStatuses(capsys) == [("B.md", "modified"), ("C.md", "modified")]
+
+    # ----------------------------------------------------------------------
+    def test_ChangedSinceIncludeFilename(self, _git_repo, _validator, capsys):
+        (_git_repo / "B.md").write_text(_TABLE_OF_CONTENTS + "## Heading 2\n")
+        (_git_repo / "C.md").write_text(_TABLE_OF_CONTENTS)
+
+        assert _validator(
+            _git_repo,
+            changed_since="HEAD",
+            include_filenames=[r".+C\.md"],
+            output_format=OutputFormat.ndjson,
+        ) == 1
+
+        assert _GetRecordStatuses(capsys) == [("C.md", "modified")]
+
+    # ----------------------------------------------------------------------
+    def test_NoChanges(self, _git_repo, _validator):
+        assert _validator(_git_repo, changed_since="HEAD") == 0
+
+    # ----------------------------------------------------------------------
+    def test_Staged(self, _git_repo, _validator, capsys):
+        # The staged content is validated, not the content in the working tree
+        (_git_repo / "B.md").write_text("Nothing to change.\n")
+        _RunGit(_git_repo, "add", "B.md")
+        (_git_repo / "B.md").write_text(_TABLE_OF_CONTENTS)
+
+        (_git_repo / "C.md").write_text(_TABLE_OF_CONTENTS)
+
+        assert _validator(_git_repo, staged=True, output_format=OutputFormat.ndjson) == 0
+        assert _GetRecordStatuses(capsys) == [("B.md", "unchanged")]
+
+    # ----------------------------------------------------------------------
+    def test_StagedExecute(self, _git_repo, _executor, capsys):
+        (_git_repo / "B.md").write_text(_TABLE_OF_CONTENTS + "## Heading 2\n")
+        (_git_repo / "C.md").write_text(_TABLE_OF_CONTENTS + "## Heading 2\n")
+        _RunGit(_git_repo, "add", "B.md", "C.md")
+
+        # Files with unstaged changes are errors, as writing them would lose the unstaged changes
+        (_git_repo / "C.md").write_text("Unstaged\n")
+
+        assert _executor(_git_repo, staged=True, output_format=OutputFormat.ndjson) != 0
+        assert _GetRecordStatuses(capsys) == [("B.md", "modified"), ("C.md", "error")]
+
+        assert (_git_repo / "C.md").read_text() == "Unstaged\n"
+
+        # Files are only written if all files were processed successfully
+        assert "<div>" not in (_git_repo / "B.md").read_text()
+
+        (_git_repo / "C.md").write_text(_TABLE_OF_CONTENTS + "## Heading 2\n")
+
+        assert _executor(_git_repo, staged=True, output_format=OutputFormat.ndjson) == 0
+        assert _GetRecordStatuses(capsys) == [("B.md", "modified"), ("C.md", "modified")]
+
+        assert "Heading 2" in (_git_repo / "B.md").read_text()
+        assert "<div>" in (_git_repo / "B.md").read_text()
+
+    # ----------------------------------------------------------------------
+    def test_Dependents(self, _git_repo, _executor, _validator, tmp_path_factory, capsys):
+        cache_dir = tmp_path_factory.mktemp("cache")
+
+        (_git_repo / "Glossary.md").write_text(_GLOSSARY.format(definitions='"widget": "A widget.",'))
+        (_git_repo / "Page.md").write_text("Some widgets and gadgets.\n")
+
+        assert _executor(_git_repo, cache_dir=cache_dir) == 0
+        assert (cache_dir / "Dependencies.json").is_file()
+
+        _RunGit(_git_repo, "add", ".")
+        _RunGit(_git_repo, "commit", "--quiet", "-m", "Widget")
+        capsys.readouterr()
+
+        # Files that depend upon a changed file are processed as well; all files depend upon the files
+        # that export definitions.
+        (_git_repo / "Glossary.md").write_text(
+            _GLOSSARY.format(definitions='"widget": "A widget.", "gadget": "A gadget.",'),
+        )
+
+        assert _executor(_git_repo, changed_since="HEAD", cache_dir=cache_dir, output_format=OutputFormat.ndjson) == 0
+        assert _GetRecordStatuses(capsys) == [
+            ("A.md", "unchanged"),
+            ("B.md", "unchanged"),
+            ("Glossary.md", "modified"),
+            ("Page.md", "modified"),
+        ]
+
+        _RunGit(_git_repo, "commit", "--quiet", "-am", "Gadget")
+
+        # Files that a changed file depends upon are processed (so that their definitions are
+        # available), but aren't reported.
+        (_git_repo / "Page.md").write_text("Some gadgets.\n")
+
+        assert _executor(_git_repo, changed_since="HEAD", cache_dir=cache_dir, output_format=OutputFormat.ndjson) == 0
+        assert _GetRecordStatuses(capsys) == [("Page.md", "modified")]
+
+        assert (_git_repo / "Page.md").read_text() == (
+            'Some <a href="Glossary.md#gadget" data-definition-list-link=1>gadgets</a>.\n'
+        )
+
+    # ----------------------------------------------------------------------
+    @pytest.mark.parametrize("use_cache_dir", [False, True])
+    def test_NewPrerequisite(self, _git_repo, _executor, tmp_path_factory, capsys, use_cache_dir):
+        cache_dir = tmp_path_factory.mktemp("cache") if use_cache_dir else None
+
+        (_git_repo / "Page.md").write_text("Some widgets.\n")
+
+        assert _executor(_git_repo, cache_dir=cache_dir) == 0
+
+        _RunGit(_git_repo, "add", ".")
+        _RunGit(_git_repo, "commit", "--quiet", "-m", "Page")
+        capsys.readouterr()
+
+        # Files that didn't depend upon a prerequisite when they were last processed are processed
+        # when a prerequisite is added.
+        (_git_repo / "Glossary.md").write_text(_GLOSSARY.format(definitions='"widget": "A widget.",'))
+
+        assert _executor(_git_repo, changed_since="HEAD", cache_dir=cache_dir, output_format=OutputFormat.ndjson) == 0
+        assert _GetRecordStatuses(capsys) == [
+            ("A.md", "unchanged"),
+            ("B.md", "unchanged"),
+            ("Glossary.md", "modified"),
+            ("Page.md", "modified"),
+        ]
+
+        assert (_git_repo / "Page.md").read_text() == (
+            'Some <a href="Glossary.md#widget" data-definition-list-link=1>widgets</a>.\n'
+        )
+
+    # ----------------------------------------------------------------------
+    @pytest.mark.parametrize("use_cache_dir", [False, True])
+    def test_DeletedPrerequisite(self, _git_repo, _executor, tmp_path_factory, capsys, use_cache_dir):
+        cache_dir = tmp_path_factory.mktemp("cache") if use_cache_dir else None
+
+        (_git_repo / "Glossary.md").write_text(_GLOSSARY.format(definitions='"widget": "A widget.",'))
+        (_git_repo / "Page.md").write_text("Some widgets.\n")
+
+        assert _executor(_git_repo, cache_dir=cache_dir) == 0
+        assert "data-definition-list-link" in (_git_repo / "Page.md").read_text()
+
+        _RunGit(_git_repo, "add", ".")
+        _RunGit(_git_repo, "commit", "--quiet", "-m", "Widget")
+        capsys.readouterr()
+
+        # Files that depended upon a deleted file are processed (all files depend upon the files that
+        # export definitions); all files are processed when there isn't a dependency graph, as any
+        # of them may have depended upon the deleted file.
+        (_git_repo / "Glossary.md").unlink()
+
+        assert _executor(_git_repo, changed_since="HEAD", cache_dir=cache_dir, output_format=OutputFormat.ndjson) == 0
+        assert _GetRecordStatuses(capsys) == [("A.md", "unchanged"), ("B.md", "unchanged"), ("Page.md", "modified")]
+
+        assert (_git_repo / "Page.md").read_text() == "Some widgets.\n"
+
+    # ----------------------------------------------------------------------
+    def test_MissingDependencyGraph(self, _git_repo, _executor, tmp_path_factory, capsys):
+        cache_dir = tmp_path_factory.mktemp("cache")
+
+        (_git_repo / "B.md").write_text(_TABLE_OF_CONTENTS + "## Heading 2\n")
+
+        # The files that depend upon the changed files aren't known until the dependency graph has
+        # been created, so all files are processed.
+        assert _executor(_git_repo, changed_since="HEAD", cache_dir=cache_dir, output_format=OutputFormat.ndjson) == 0
+        assert _GetRecordStatuses(capsys) == [("A.md", "modified"), ("B.md", "modified")]
+
+        assert (cache_dir / "Dependencies.json").is_file()
+
+        _RunGit(_git_repo, "commit", "--quiet", "-am", "Modified")
+
+        (_git_repo / "B.md").write_text(_TABLE_OF_CONTENTS + "## Heading 3\n")
+
+        assert _executor(_git_repo, changed_since="HEAD", cache_dir=cache_dir, output_format=OutputFormat.ndjson) == 0
+        assert _GetRecordStatuses(capsys) == [("B.md", "modified")]
+
+    # ----------------------------------------------------------------------
+    @pytest.mark.parametrize("staged", [False, True])
+    def test_Prerequisites(self, _git_repo, _executor, capsys, staged):
+        (_git_repo / "Glossary.md").write_text(_GLOSSARY.format(definitions='"widget": "A widget.",'))
+        (_git_repo / "Page.md").write_text("Some widgets.\n")
+
+        assert _executor(_git_repo) == 0
+
+        _RunGit(_git_repo, "add", ".")
+        _RunGit(_git_repo, "commit", "--quiet", "-m", "Widget")
+        capsys.readouterr()
+
+        # Prerequisites are processed when only the files that use them have changed (so that their
+        # definitions are available), even without a dependency graph, but they aren't reported.
+        (_git_repo / "Page.md").write_text("Some widgets.\nMore widgets.\n")
+
+        if staged:
+            _RunGit(_git_repo, "add", "Page.md")
+
+        assert _executor(
+            _git_repo,
+            changed_since=None if staged else "HEAD",
+            staged=staged,
+            output_format=OutputFormat.ndjson,
+        ) == 0
+
+        assert _GetRecordStatuses(capsys) == [("Page.md", "modified")]
+
+        assert (_git_repo / "Page.md").read_text() == (
+            'Some <a href="Glossary.md#widget" data-definition-list-link=1>widgets</a>.\n'
+            'More <a href="Glossary.md#widget" data-definition-list-link=1>widgets</a>.\n'
+        )
+
+    # ----------------------------------------------------------------------
+    def test_InvalidRef(self, _git_repo, _validator):
+        assert _validator(_git_repo, changed_since="DoesNotExist") != 0
+
+    # ----------------------------------------------------------------------
+    def test_InvalidOptions(self, _git_repo, _validator):
+        with pytest.raises(typer.BadParameter):
+            _validator(_git_repo, changed_since="HEAD", staged=True)
+
+
+# ----------------------------------------------------------------------
+class TestBlockLimits(object):
+    # ----------------------------------------------------------------------
+    def test_TimeLimit(self, tmp_path, _executor, capsys):
+        (tmp_path / "A.md").write_text(_TABLE_OF_CONTENTS)
+        (tmp_path / "B.md").write_text("Text\n\n<!-- [[[\nwhile True:\n    pass\n]]] -->\n<!-- [[[end]]] -->\n")
+        (tmp_path / "C.md").write_text(_TABLE_OF_CONTENTS)
+
+        assert _executor(tmp_path, block_timeout=1.0, output_format=OutputFormat.ndjson) != 0
+
+        output = capsys.readouterr()
+
+        records = sorted((json.loads(line) for line in output.out.splitlines()), key=lambda record: record["filename"])
+
+        # The other files are processed
+        assert [record["status"] for record in records] == ["modified", "error", "modified"]
+        assert records[1]["error"].endswith("B.md(3): The block exceeded the 1 second time limit.")
+
+    # ----------------------------------------------------------------------
+    def test_InvalidLimits(self, tmp_path, _executor):
+        with pytest.raises(typer.BadParameter):
+            _executor(tmp_path, block_timeout=0.0)
+
+
+# ----------------------------------------------------------------------
+class TestProgress(object):
+    # ----------------------------------------------------------------------
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"progress": ProgressDisplay.summary},
+            {"quiet": True},
+        ],
+    )
+    def test_Standard(self, _file_system, _executor, kwargs):
+        assert _executor(Path(), **kwargs) == 0
+
+        assert _file_system.HasChanged(Path("One.md"))
+        assert _file_system.HasChanged(Path("Two.md"))
+        assert _file_system.HasChanged(Path("Three.md")) is False
+        assert _file_system.HasChanged(Path("Dir1/B.md"))
+
+    # ----------------------------------------------------------------------
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"progress": ProgressDisplay.summary},
+            {"quiet": True},
+        ],
+    )
+    def test_Error(self, tmp_path, _executor, kwargs):
+        (tmp_path / "A.md").write_text("<!-- [[[ DoesNotExist() ]]] -->\n<!-- [[[end]]] -->\n")
+
+        assert _executor(tmp_path, **kwargs) != 0
+
+    # ----------------------------------------------------------------------
+    def test_Summary(self):
+        dm = Mock()
+
+        summary_progress = _SummaryProgress(dm, "Transforming", 3, redraw_interval=3600)
+
+        summary_progress.OnFileComplete()
+        summary_progress.OnFileComplete()
+        summary_progress.OnFileComplete()
+        summary_progress.Close()
+
+        # Progress is redrawn for the first and last files only, as the redraw interval hasn't elapsed
+        statuses = [call.args[0] for call in dm.WriteStatus.call_args_list]
+
+        assert len(statuses) == 3
+        assert statuses[0].startswith("Transforming: 1 of 3 files, ")
+        assert statuses[1].startswith("Transforming: 3 of 3 files, ")
+        assert statuses[2] == ""
+
+        assert summary_progress.CreateStatus(summary_progress._start + 2) == "Transforming: 3 of 3 files, 1.5 files/s, ETA 0:00:00"  # pylint: disable=protected-access
+
+
+# ----------------------------------------------------------------------
+class TestStdin(object):
+    # ----------------------------------------------------------------------
+    def test_Execute(self, _file_system, _executor, monkeypatch, capsys):
+        monkeypatch.setattr(sys, "stdin", io.StringIO(_file_system.GetContent(Path("Dir1/B.md"))))
+
+        assert _executor(Path("-")) == 0
+
+        assert capsys.readouterr().out == textwrap.dedent(
+            """\
+            <!-- [[[TableOfContents()]]] -->
+            <div>1 <a href="#heading-1">Heading 1</a></div>
+            <!-- [[[end]]] -->
+
+            # Heading 1
+            """,
+        )
+
+        assert _file_system.HasChanged(Path("Dir1/B.md")) is False
+
+    # ----------------------------------------------------------------------
+    def test_ExecuteNoChanges(self, _file_system, _executor, monkeypatch, capsys):
+        monkeypatch.setattr(sys, "stdin", io.StringIO("Nothing to change.\n"))
+
+        assert _executor(Path("-")) == 0
+        assert capsys.readouterr().out == "Nothing to change.\n"
+
+    # ----------------------------------------------------------------------
+    def test_Filename(self, _file_system, _executor, monkeypatch, capsys):
+        # Plugins are created for each invocation, so definitions exported by files processed by
+        # other invocations aren't available; the filename is provided to plugins and used in errors.
+        monkeypatch.setattr(sys, "stdin", io.StringIO("<!-- [[[ DoesNotExist() ]]] -->\n<!-- [[[end]]] -->\n"))
+
+        assert _executor(Path("-"), filename=Path("Dir1/Page.md").resolve()) != 0
+        assert str(Path("Dir1/Page.md").resolve()) in capsys.readouterr().err
+
+    # ----------------------------------------------------------------------
+    def test_FilenameWithoutStdin(self, _file_system, _executor):
+        with pytest.raises(typer.BadParameter):
+            _executor(Path(), filename=Path("Page.md").resolve())
+
+    # ----------------------------------------------------------------------
+    def test_ValidateChanges(self, _file_system, _validator, monkeypatch, capsys):
+        monkeypatch.setattr(sys, "stdin", io.StringIO(_file_system.GetContent(Path("Dir1/B.md"))))
+
+        assert _validator(Path("-")) == 1
+        assert capsys.readouterr().out == ""
+
+    # ----------------------------------------------------------------------
+    def test_ValidateNoChanges(self, _file_system, _validator, monkeypatch):
+        monkeypatch.setattr(sys, "stdin", io.StringIO("Nothing to change.\n"))
+
+        assert _validator(Path("-")) == 0
+
+
+# ----------------------------------------------------------------------
+class TestBatch(object):
+    # ----------------------------------------------------------------------
+    def test_Standard(self, _file_system, _batcher):
+        result, records = _batcher(
+            [
+                # Prerequisites are written first
+                {"filename": "Glossary.md", "content": _file_system.GetContent(Path("Glossary.md"))},
+                {"filename": "Dir1/Page.md", "content": "Some widgets.\n"},
+                {"filename": "Three.md", "content": _file_system.GetContent(Path("Three.md"))},
+            ],
+        )
+
+        assert result == 0
+
+        assert [(record["filename"], record["status"]) for record in records] == [
+            ("Glossary.md", "modified"),
+            ("Dir1/Page.md", "modified"),
+            ("Three.md", "unchanged"),
+        ]
+
+        assert '<a id="widget">widget</a>' in records[0]["content"]
+        assert records[1]["content"] == 'Some <a href="../Glossary.md#widget" data-definition-list-link=1>widgets</a>.\n'
+        assert records[2]["content"] == "Nothing to change.\n"
+
+        # Files are not modified
+        assert _file_system.HasChanged(Path("Three.md")) is False
+
+    # ----------------------------------------------------------------------
+    def test_Errors(self, _file_system, _batcher):
+        result, records = _batcher(
+            [
+                "Not JSON",
+                {"filename": "One.md"},
+                {"filename": "Two.md", "content": "<!-- [[[ DoesNotExist() ]]] -->\n<!-- [[[end]]] -->\n"},
+                {"filename": "Three.md", "content": "Nothing to change.\n"},
+            ],
+        )
+
+        assert result != 0
+
+        assert [(record["filename"], record["status"]) for record in records] == [
+            (None, "error"),
+            ("One.md", "error"),
+            ("Two.md", "error"),
+            ("Three.md", "unchanged"),
+        ]
+
+        assert records[1]["error"] == "Invalid record: 'content' must be a string."
+        assert "DoesNotExist" in records[2]["error"]
+
+
+# ----------------------------------------------------------------------
 # ----------------------------------------------------------------------
 # ----------------------------------------------------------------------
+_TABLE_OF_CONTENTS                          = textwrap.dedent(
+    """\
+    <!-- [[[ TableOfContents() ]]] -->
+    <!-- [[[end]]] -->
+
+    # Heading 1
+    """,
+)
+
+_GLOSSARY                                   = textwrap.dedent(
+    """\
+    <!-- [[[
+        DefinitionList(
+            {{
+                {definitions}
+            }},
+            export=True,
+        )
+    ]]] -->
+    <!-- [[[end]]] -->
+    """,
+)
+
+
+# ----------------------------------------------------------------------
+def _RunGit(
+    working_dir: Path,
+    *args: str,
+) -> None:
+    subprocess.run(
+        ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com", *args],
+        cwd=working_dir,
+        check=True,
+        capture_output=True,
+    )
+
+
+# ----------------------------------------------------------------------
+def _GetRecordStatuses(
+    capsys,
+) -> list[tuple[str, str]]:
+    return sorted(
+        (Path(record["filename"]).name, record["status"])
+        for record in (json.loads(line) for line in capsys.readouterr().out.splitlines())
+    )
+
+
 # ----------------------------------------------------------------------
 class _FileSystem(object):
     # ----------------------------------------------------------------------
     def __init__(self, fs):
+        # Plugins are loaded by each invocation
+        fs.add_real_directory(Path(__file__).resolve().parent.parent.parent / "Plugins")
+
         self._hold_fs = fs
         self._content: dict[Path, Optional[str]] = {
             Path("One.md"): textwrap.dedent(
@@ -249,6 +904,20 @@ class _FileSystem(object):
                 Nothing to change.
                 """,
             ),
+            Path("Glossary.md"): textwrap.dedent(
+                """\
+                <!-- [[[
+                    DefinitionList(
+                        {
+                            "widget": "The definition for widget.",
+                        },
+                        export=True,
+                    )
+                ]]] -->
+
+                <!-- [[[end]]] -->
+                """,
+            ),
             Path("EmptyDir"): None,
             Path("Dir1/A.md"): textwrap.dedent(
                 """\
@@ -325,6 +994,16 @@ class _FileSystem(object):
 
         return content != self._content[filename]
 
+    # ----------------------------------------------------------------------
+    def GetContent(
+        self,
+        filename: Path,
+    ) -> str:
+        content = self._content[filename]
+        assert content is not None
+
+        return content
+
 
 # ----------------------------------------------------------------------
 @pytest.fixture
@@ -332,6 +1011,22 @@ def _file_system(fs) -> _FileSystem:
     return _FileSystem(fs)
 
 
+# ----------------------------------------------------------------------
+@pytest.fixture
+def _git_repo(tmp_path) -> Path:
+    """A git repository with committed files that would be modified."""
+
+    _RunGit(tmp_path, "init", "--quiet")
+
+    (tmp_path / "A.md").write_text(_TABLE_OF_CONTENTS)
+    (tmp_path / "B.md").write_text(_TABLE_OF_CONTENTS)
+
+    _RunGit(tmp_path, "add", "A.md", "B.md")
+    _RunGit(tmp_path, "commit", "--quiet", "-m", "Initial")
+
+    return tmp_path
+
+
 # ----------------------------------------------------------------------
 @pytest.fixture
 def _executor() -> Callable[[Any], int]:
@@ -342,10 +1037,18 @@ def _executor() -> Callable[[Any], int]:
                 *args,
                 **{
                     **{
+                        "filename": None,
+                        "changed_since": None,
+                        "staged": False,
                         "include_filenames": [],
                         "exclude_filenames": [],
                         "include_plugins": [],
                         "exclude_plugins": [],
+                        "cache_dir": None,
+                        "block_timeout": None,
+                        "block_memory": None,
+                        "output_format": OutputFormat.text,
+                        "progress": ProgressDisplay.tasks,
                         "quiet": False,
                         "verbose": False,
                         "debug": False,
@@ -373,10 +1076,18 @@ def _validator() -> Callable[[Any], int]:
                 *args,
                 **{
                     **{
+                        "filename": None,
+                        "changed_since": None,
+                        "staged": False,
                         "include_filenames": [],
                         "exclude_filenames": [],
                         "include_plugins": [],
                         "exclude_plugins": [],
+                        "cache_dir": None,
+                        "block_timeout": None,
+                        "block_memory": None,
+                        "output_format": OutputFormat.text,
+                        "progress": ProgressDisplay.tasks,
                         "quiet": False,
                         "verbose": False,
                         "debug": False,
@@ -392,3 +1103,47 @@ def _validator() -> Callable[[Any], int]:
     # ----------------------------------------------------------------------
 
     return Validator
+
+
+# ----------------------------------------------------------------------
+@pytest.fixture
+def _batcher(monkeypatch, capsys) -> Callable[[list[Any]], tuple[int, list[dict[str, Any]]]]:
+    # ----------------------------------------------------------------------
+    def Batcher(
+        records: list[Any],
+        **kwargs,
+    ) -> tuple[int, list[dict[str, Any]]]:
+        monkeypatch.setattr(
+            sys,
+            "stdin",
+            io.StringIO(
+                "".join(
+                    "{}\n".format(record if isinstance(record, str) else json.dumps(record))
+                    for record in records
+                ),
+            ),
+        )
+
+        try:
+            Batch(
+                **{
+                    **{
+                        "include_plugins": [],
+                        "exclude_plugins": [],
+                        "cache_dir": None,
+                        "block_timeout": None,
+                        "block_memory": None,
+                        "verbose": False,
+                        "debug": False,
+                    },
+                    **kwargs,
+                },
+            )
+        except click.exceptions.Exit as ex:
+            return ex.exit_code, [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+        assert False, "Unexpected"
+
+    # ----------------------------------------------------------------------
+
+    return Batcher
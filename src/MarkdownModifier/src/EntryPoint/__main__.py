@@ -15,16 +15,20 @@
 # ----------------------------------------------------------------------
 """Augments a markdown file (or collection of files)."""
 
-import importlib
+import datetime
+import json
 import re
+import subprocess
 import sys
 import textwrap
+import time
 import traceback
 
 from dataclasses import dataclass
+from enum import Enum
 from io import StringIO
 from pathlib import Path
-from typing import Callable, cast, Optional, Pattern
+from typing import Any, Callable, cast, Optional, Pattern, Union
 
 from Common_Foundation.ContextlibEx import ExitStack
 from Common_Foundation.EnumSource import EnumSource
@@ -59,86 +63,39 @@ with ExitStack(lambda: sys.path.pop(0)):
     #       - This file as 'EntryPoint/__main__.py' rather than '../EntryPoint.py'
     #       - Build.py/setup.py located outside of 'src'
 
-    from MarkdownModifier.MarkdownModifier import Modify, Status
-    from MarkdownModifier.Plugin import Plugin                              # pylint: disable=import-error
+    from MarkdownModifier.BlockWorker import BlockLimits
+    from MarkdownModifier.DependencyGraph import DependencyGraph
+    from MarkdownModifier.LanguageServer import LanguageServer
+    from MarkdownModifier.MarkdownModifier import Status
+    from MarkdownModifier.Session import LoadPlugins, Session
 
 
 # ----------------------------------------------------------------------
-def _LoadPlugins() -> dict[str, Plugin]:
-    # Ensure that the MarkdownModifier directory is accessible on the path
-    lib_dir = PathEx.EnsureDir(Path(__file__).parent.parent / "MarkdownModifier")
+_PLUGIN_DIR                                 = Path(__file__).resolve().parent.parent / "Plugins"
+_PLUGINS                                    = LoadPlugins(_PLUGIN_DIR)
 
-    sys.path.insert(0, str(lib_dir))
-    with ExitStack(lambda: sys.path.pop(0)):
-        plugin_dir = Path(__file__).parent.parent / "Plugins"
-        if not plugin_dir.is_dir():
-            raise Exception("The plugin directory '{}' does not exist.".format(plugin_dir))
 
-        sys.path.insert(0, str(plugin_dir))
-        with ExitStack(lambda: sys.path.pop(0)):
-            # ----------------------------------------------------------------------
-            @dataclass(frozen=True)
-            class PluginData(object):
-                filename: Path
-                plugin: Plugin
-
-            # ----------------------------------------------------------------------
-
-            potential_plugin_names: list[str] = ["Plugin", ]
-
-            all_plugins: dict[str, PluginData] = {}
-
-            for filename in plugin_dir.iterdir():
-                if filename.suffix != ".py":
-                    continue
-
-                if not filename.stem.endswith("Plugin"):
-                    continue
-
-                mod = importlib.import_module(filename.stem)
-
-                plugin: Optional[Plugin] = None
-
-                for potential_plugin_name in potential_plugin_names:
-                    potential_plugin = getattr(mod, potential_plugin_name, None)
-                    if potential_plugin is None:
-                        continue
-
-                    plugin = cast(Plugin, potential_plugin())
-                    break
-
-                if plugin is None:
-                    raise Exception("A plugin was not found in '{}'.".format(filename))
-
-                prev_plugin = all_plugins.get(plugin.name, None)
-                if prev_plugin is not None:
-                    raise Exception(
-                        "The plugin '{}', defined in '{}', was already defined in '{}'.".format(
-                            plugin.name,
-                            filename,
-                            prev_plugin.filename,
-                        ),
-                    )
-
-                all_plugins[plugin.name] = PluginData(filename, plugin)
-
-            if not all_plugins:
-                raise Exception("No plugins were found in '{}'.".format(plugin_dir))
-
-            # If here, all plugins are valid and there weren't any conflicts
-            return {k: v.plugin for k, v in all_plugins.items()}
+# ----------------------------------------------------------------------
+class NaturalOrderGrouper(TyperGroup):
+    # ----------------------------------------------------------------------
+    def list_commands(self, *args, **kwargs):  # pylint: disable=unused-argument
+        return self.commands.keys()
 
 
-_PLUGINS                                    = _LoadPlugins()
+# ----------------------------------------------------------------------
+class OutputFormat(str, Enum):
+    """Format of the results written to stdout."""
 
-del _LoadPlugins
+    text                                    = "text"
+    ndjson                                  = "ndjson"
 
 
 # ----------------------------------------------------------------------
-class NaturalOrderGrouper(TyperGroup):
-    # ----------------------------------------------------------------------
-    def list_commands(self, *args, **kwargs):  # pylint: disable=unused-argument
-        return self.commands.keys()
+class ProgressDisplay(str, Enum):
+    """How progress is displayed while files are processed."""
+
+    tasks                                   = "tasks"
+    summary                                 = "summary"
 
 
 # ----------------------------------------------------------------------
@@ -176,6 +133,13 @@ app                                         = typer.Typer(
 )
 
 
+# ----------------------------------------------------------------------
+_STDIN_ARGUMENT                             = "-"
+_STDIN_DEFAULT_FILENAME                     = "stdin.md"
+
+_SUMMARY_PROGRESS_REDRAW_INTERVAL           = 0.25          # Seconds
+
+
 # ----------------------------------------------------------------------
 def _ValidatePluginNames(
     names: list[str],
@@ -188,7 +152,11 @@ def _ValidatePluginNames(
 
 
 # ----------------------------------------------------------------------
-_input_file_or_directory_argument           = typer.Argument(..., exists=True, resolve_path=True, help="Input filename or directory to search for files.")
+_input_file_or_directory_argument           = typer.Argument(..., exists=True, resolve_path=True, allow_dash=True, help="Input filename or directory to search for files; '-' reads markdown content from stdin and writes the results to stdout.")
+_filename_option                            = typer.Option(None, "--filename", dir_okay=False, resolve_path=True, help="Filename provided to plugins when reading markdown content from stdin; defaults to '{}' in the current directory.".format(_STDIN_DEFAULT_FILENAME))
+
+_changed_since_option                       = typer.Option(None, "--changed-since", help="Only process markdown files that differ from this git ref (for example, 'origin/main'), including untracked files.")
+_staged_option                              = typer.Option(False, "--staged", help="Only process markdown files with staged changes, using their staged content rather than the content in the working tree.")
 
 _include_filename_option                    = typer.Option(None, "--include-filename", help="Regular expression matching filenames to include; can be specified multiple times on the command line.")
 _exclude_filename_option                    = typer.Option(None, "--exclude-filename", help="Regular expression matching filenames to exclude; can be specified multiple times on the command line.")
@@ -196,7 +164,16 @@ _exclude_filename_option                    = typer.Option(None, "--exclude-file
 _include_plugins_option                     = typer.Option(None, "--include-plugin", callback=_ValidatePluginNames, help="Name of a plugin to include when modifying markdown content; can be specified multiple times on the command line.")
 _exclude_plugins_option                     = typer.Option(None, "--exclude-plugin", callback=_ValidatePluginNames, help="Name of a plugin to exclude when modifying markdown content; can be specified multiple times on the command line.")
 
-_quiet_option                               = typer.Option(False, "--quiet", help="Reduce the amount of information written to the terminal.")
+_cache_dir_option                           = typer.Option(None, "--cache-dir", file_okay=False, resolve_path=True, help="Directory used to persist plugin caches across runs; caches are not persisted if this value is not provided.")
+
+_block_timeout_option                       = typer.Option(None, "--block-timeout", min=0, help="Maximum number of seconds that a '[[[ ]]]' block can execute; blocks are executed in a supervised worker process when this value is provided, and files with blocks that exceed the limit are errors. Arguments passed to plugins must be picklable (for example, lambdas can't be passed) when blocks are executed in the worker process.")
+_block_memory_option                        = typer.Option(None, "--block-memory", min=1, help="Maximum amount of memory (in MB) that a '[[[ ]]]' block can allocate; blocks are executed in a supervised worker process when this value is provided, and files with blocks that exceed the limit are errors (Linux only). Arguments passed to plugins must be picklable (for example, lambdas can't be passed) when blocks are executed in the worker process.")
+
+_output_format_option                       = typer.Option(OutputFormat.text, "--output-format", case_sensitive=False, help="Format of the results written to stdout; 'ndjson' writes a JSON record for each file (with its status, duration, input and output sizes, cache use, and the plugins that ran) as soon as the file has been processed and writes all other output to stderr. Regardless of the format, files are only written if all files were processed successfully.")
+
+_progress_option                            = typer.Option(ProgressDisplay.tasks, "--progress", case_sensitive=False, help="How progress is displayed while files are processed; 'tasks' displays the status of each file, while 'summary' displays the number of files processed, files per second, and estimated time remaining, redrawn at a fixed rate (which is faster when processing many files).")
+
+_quiet_option                               = typer.Option(False, "--quiet", help="Reduce the amount of information written to the terminal; progress is not displayed.")
 _verbose_option                             = typer.Option(False, "--verbose", help="Write verbose information to the terminal.")
 _debug_option                               = typer.Option(False, "--debug", help="Write debug information to the terminal.")
 
@@ -209,19 +186,105 @@ _debug_option                               = typer.Option(False, "--debug", hel
 )
 def Execute(
     input_file_or_directory: Path=_input_file_or_directory_argument,
+    filename: Optional[Path]=_filename_option,
+    changed_since: Optional[str]=_changed_since_option,
+    staged: bool=_staged_option,
     include_filenames: list[str]=_include_filename_option,
     exclude_filenames: list[str]=_exclude_filename_option,
     include_plugins: list[str]=_include_plugins_option,
     exclude_plugins: list[str]=_exclude_plugins_option,
+    cache_dir: Optional[Path]=_cache_dir_option,
+    block_timeout: Optional[float]=_block_timeout_option,
+    block_memory: Optional[int]=_block_memory_option,
+    output_format: OutputFormat=_output_format_option,
+    progress: ProgressDisplay=_progress_option,
     quiet: bool=_quiet_option,
     verbose: bool=_verbose_option,
     debug: bool=_debug_option,
 ) -> None:
     """Modifies markdown files."""
 
+    block_limits = _CreateBlockLimits(block_timeout, block_memory)
+
+    if str(input_file_or_directory) == _STDIN_ARGUMENT:
+        _ValidateStdinOutputFormatOption(output_format)
+
+        with DoneManager.CreateCommandLine(
+            sys.stderr,
+            output_flags=DoneManagerFlags.Create(verbose=verbose, debug=debug),
+        ) as dm:
+            content = sys.stdin.read()
+
+            modified_content = _TransformContent(
+                dm,
+                filename,
+                content,
+                include_plugins=include_plugins or None,
+                exclude_plugins=exclude_plugins or None,
+                cache_dir=cache_dir,
+                block_limits=block_limits,
+            )
+
+            if dm.result != 0:
+                return
+
+            # The content is always written, so that this can be used as a filter
+            sys.stdout.write(content if modified_content is None else modified_content)
+            sys.stdout.flush()
+
+        return
+
+    _ValidateFilenameOption(filename)
+    _ValidateGitOptions(changed_since, staged)
+
     with DoneManager.CreateCommandLine(
+        sys.stderr if output_format == OutputFormat.ndjson else sys.stdout,
         output_flags=DoneManagerFlags.Create(verbose=verbose, debug=debug),
     ) as dm:
+        if output_format == OutputFormat.ndjson:
+            # Records are written as soon as files have been processed, but (as with text output)
+            # files are only written if all files were processed successfully.
+            modified_contents: dict[Path, str] = {}
+
+            # ----------------------------------------------------------------------
+            def OnRecord(
+                path: Path,
+                record: dict[str, Any],
+                modified_content: Optional[str],
+            ) -> None:
+                if modified_content is not None:
+                    modified_contents[path] = modified_content
+
+                _WriteRecord(record)
+
+            # ----------------------------------------------------------------------
+
+            _Transform(
+                dm,
+                input_file_or_directory,
+                include_filenames=include_filenames or None,
+                exclude_filenames=exclude_filenames or None,
+                include_plugins=include_plugins or None,
+                exclude_plugins=exclude_plugins or None,
+                cache_dir=cache_dir,
+                block_limits=block_limits,
+                progress=progress,
+                quiet=quiet,
+                changed_since=changed_since,
+                staged=staged,
+                allow_unstaged_changes=False,
+                on_record_func=OnRecord,
+            )
+
+            if dm.result != 0:
+                return
+
+            for path, modified_content in modified_contents.items():
+                with path.open("w", encoding="UTF-8") as f:
+                    f.write(modified_content)
+
+            return
+
         results = _Transform(
             dm,
             input_file_or_directory,
@@ -229,7 +292,13 @@ def Execute(
             exclude_filenames=exclude_filenames or None,
             include_plugins=include_plugins or None,
             exclude_plugins=exclude_plugins or None,
+            cache_dir=cache_dir,
+            block_limits=block_limits,
+            progress=progress,
             quiet=quiet,
+            changed_since=changed_since,
+            staged=staged,
+            allow_unstaged_changes=False,
         )
 
         if not results or dm.result != 0:
@@ -266,19 +335,98 @@ def Execute(
 )
 def Validate(
     input_file_or_directory: Path=_input_file_or_directory_argument,
+    filename: Optional[Path]=_filename_option,
+    changed_since: Optional[str]=_changed_since_option,
+    staged: bool=_staged_option,
     include_filenames: list[str]=_include_filename_option,
     exclude_filenames: list[str]=_exclude_filename_option,
     include_plugins: list[str]=_include_plugins_option,
     exclude_plugins: list[str]=_exclude_plugins_option,
+    cache_dir: Optional[Path]=_cache_dir_option,
+    block_timeout: Optional[float]=_block_timeout_option,
+    block_memory: Optional[int]=_block_memory_option,
+    output_format: OutputFormat=_output_format_option,
+    progress: ProgressDisplay=_progress_option,
     quiet: bool=_quiet_option,
     verbose: bool=_verbose_option,
     debug: bool=_debug_option,
 ) -> None:
     """Causes an error if any files would be modified when processing the markdown files."""
 
+    block_limits = _CreateBlockLimits(block_timeout, block_memory)
+
+    if str(input_file_or_directory) == _STDIN_ARGUMENT:
+        _ValidateStdinOutputFormatOption(output_format)
+
+        with DoneManager.CreateCommandLine(
+            sys.stderr,
+            output_flags=DoneManagerFlags.Create(verbose=verbose, debug=debug),
+        ) as dm:
+            modified_content = _TransformContent(
+                dm,
+                filename,
+                sys.stdin.read(),
+                include_plugins=include_plugins or None,
+                exclude_plugins=exclude_plugins or None,
+                cache_dir=cache_dir,
+                block_limits=block_limits,
+            )
+
+            if dm.result != 0:
+                return
+
+            if modified_content is None:
+                dm.WriteLine("No changes were detected.\n")
+            else:
+                dm.WriteLine("Changes were detected.\n")
+                dm.result = 1
+
+        return
+
+    _ValidateFilenameOption(filename)
+    _ValidateGitOptions(changed_since, staged)
+
     with DoneManager.CreateCommandLine(
+        sys.stderr if output_format == OutputFormat.ndjson else sys.stdout,
         output_flags=DoneManagerFlags.Create(verbose=verbose, debug=debug),
     ) as dm:
+        if output_format == OutputFormat.ndjson:
+            modified_filenames: list[Path] = []
+
+            # ----------------------------------------------------------------------
+            def OnRecord(
+                path: Path,
+                record: dict[str, Any],
+                modified_content: Optional[str],
+            ) -> None:
+                if modified_content is not None:
+                    modified_filenames.append(path)
+
+                _WriteRecord(record)
+
+            # ----------------------------------------------------------------------
+
+            _Transform(
+                dm,
+                input_file_or_directory,
+                include_filenames=include_filenames or None,
+                exclude_filenames=exclude_filenames or None,
+                include_plugins=include_plugins or None,
+                exclude_plugins=exclude_plugins or None,
+                cache_dir=cache_dir,
+                block_limits=block_limits,
+                progress=progress,
+                quiet=quiet,
+                changed_since=changed_since,
+                staged=staged,
+                on_record_func=OnRecord,
+            )
+
+            if dm.result == 0 and modified_filenames:
+                dm.result = 1
+
+            return
+
         results = _Transform(
             dm,
             input_file_or_directory,
@@ -286,7 +434,12 @@ def Validate(
             exclude_filenames=exclude_filenames or None,
             include_plugins=include_plugins or None,
             exclude_plugins=exclude_plugins or None,
+            cache_dir=cache_dir,
+            block_limits=block_limits,
+            progress=progress,
             quiet=quiet,
+            changed_since=changed_since,
+            staged=staged,
         )
 
         if dm.result != 0:
@@ -306,7 +459,242 @@ def Validate(
 
 
 # ----------------------------------------------------------------------
+@app.command(
+    "Batch",
+    epilog=_HelpEpilog(),
+    no_args_is_help=False,
+)
+def Batch(
+    include_plugins: list[str]=_include_plugins_option,
+    exclude_plugins: list[str]=_exclude_plugins_option,
+    cache_dir: Optional[Path]=_cache_dir_option,
+    block_timeout: Optional[float]=_block_timeout_option,
+    block_memory: Optional[int]=_block_memory_option,
+    verbose: bool=_verbose_option,
+    debug: bool=_debug_option,
+) -> None:
+    """\
+    Modifies markdown content streamed as NDJSON records via stdin, writing NDJSON records to stdout.
+
+    Each input line is a record in the form '{"filename": "<filename>", "content": "<markdown>"}'. Each
+    output line is a record in the form written by '--output-format ndjson' (whose "status" is
+    "modified", "unchanged", or "error"), with the modified markdown in "content" (or the error in
+    "error"); records are written in input order as soon as the corresponding input record has been
+    processed. Relative filenames are relative to the current directory.
+
+    Plugins are loaded once and their state is preserved across records, so records that are
+    prerequisites for other records (for example, glossaries that export definitions) should be
+    written first.
+    """
+
+    block_limits = _CreateBlockLimits(block_timeout, block_memory)
+
+    with DoneManager.CreateCommandLine(
+        sys.stderr,
+        output_flags=DoneManagerFlags.Create(verbose=verbose, debug=debug),
+    ) as dm:
+        with _CreateSession(
+            include_plugins,
+            exclude_plugins,
+            cache_dir,
+            block_limits,
+        ) as session:
+            for line in sys.stdin:
+                line = line.strip()
+                if not line:
+                    continue
+
+                result: dict[str, Any] = {"filename": None}
+
+                try:
+                    record = json.loads(line)
+
+                    if not isinstance(record, dict):
+                        raise ValueError("Records must be objects.")
+
+                    result["filename"] = record.get("filename", None)
+
+                    if not isinstance(record.get("filename", None), str):
+                        raise ValueError("'filename' must be a string.")
+                    if not isinstance(record.get("content", None), str):
+                        raise ValueError("'content' must be a string.")
+
+                except ValueError as ex:
+                    result.update({"status": "error", "error": "Invalid record: {}".format(ex)})
+                    dm.WriteError("Invalid record: {}\n".format(ex))
+
+                else:
+                    try:
+                        result["content"] = _ModifyContent(
+                            session,
+                            Path(record["filename"]).resolve(),
+                            record["content"],
+                            record=result,
+                        )
+
+                    except Exception as ex:  # pylint: disable=broad-exception-caught
+                        _WriteException(dm, record["filename"], ex)
+
+                _WriteRecord(result)
+
+        _WriteStatistics(dm, session)
+
+
 # ----------------------------------------------------------------------
+@app.command(
+    "LanguageServer",
+    epilog=_HelpEpilog(),
+    no_args_is_help=False,
+)
+def LanguageServerCommand(
+    include_plugins: list[str]=_include_plugins_option,
+    exclude_plugins: list[str]=_exclude_plugins_option,
+    cache_dir: Optional[Path]=_cache_dir_option,
+    verbose: bool=_verbose_option,
+    debug: bool=_debug_option,
+) -> None:
+    """\
+    Runs a Language Server Protocol server via stdin/stdout.
+
+    Open documents are kept in memory and updated as they are edited. Diagnostics are published for
+    documents that can't be modified or whose generated content is out of date, and the modified
+    content is offered as a code action. Prerequisites in the workspace (for example, glossaries
+    that export definitions) are modified when the server is initialized.
+    """
+
+    with DoneManager.CreateCommandLine(
+        sys.stderr,
+        output_flags=DoneManagerFlags.Create(verbose=verbose, debug=debug),
+    ) as dm:
+        with _CreateSession(include_plugins, exclude_plugins, cache_dir) as session:
+            dm.result = LanguageServer(session).Run(sys.stdin.buffer, sys.stdout.buffer)
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class _GitFiles(object):
+    """Files reported as changed by git."""
+
+    root: Path
+    filenames: set[Path]                    # Resolved filenames
+    is_staged: bool
+    unstaged_filenames: set[Path]           # Resolved filenames with unstaged changes (only populated if `is_staged`)
+    deleted_filenames: set[Path]            # Resolved filenames that were deleted (they aren't in `filenames`)
+
+    # ----------------------------------------------------------------------
+    @classmethod
+    def Create(
+        cls,
+        working_dir: Path,
+        changed_since: Optional[str],       # Staged files are used if None
+    ) -> "_GitFiles":
+        root = Path(_RunGit(working_dir, "rev-parse", "--show-toplevel").strip())
+
+        # Deleted files are tracked separately, as there isn't anything to process (but the files
+        # that depended upon them must be processed).
+        if changed_since is None:
+            output = _RunGit(root, "diff", "--cached", "--name-only", "--diff-filter=d", "-z")
+            deleted_output = _RunGit(root, "diff", "--cached", "--name-only", "--diff-filter=D", "-z")
+        else:
+            output = _RunGit(root, "diff", "--name-only", "--diff-filter=d", "-z", changed_since, "--")
+            output += _RunGit(root, "ls-files", "--others", "--exclude-standard", "-z")
+            deleted_output = _RunGit(root, "diff", "--name-only", "--diff-filter=D", "-z", changed_since, "--")
+
+        unstaged_filenames: set[Path] = set()
+
+        if changed_since is None:
+            unstaged_filenames = set(
+                (root / name).resolve()
+                for name in _RunGit(root, "diff", "--name-only", "-z").split("\0")
+                if name
+            )
+
+        return cls(
+            root,
+            set((root / name).resolve() for name in output.split("\0") if name),
+            changed_since is None,
+            unstaged_filenames,
+            set((root / name).resolve() for name in deleted_output.split("\0") if name),
+        )
+
+    # ----------------------------------------------------------------------
+    def ReadStagedContent(
+        self,
+        filename: Path,
+    ) -> str:
+        resolved_filename = filename.resolve()
+
+        # The staged content of a file without staged or unstaged changes is the content in the
+        # working tree, which is much less expensive to read than invoking git for each file.
+        if resolved_filename not in self.filenames and resolved_filename not in self.unstaged_filenames:
+            with filename.open(encoding="UTF-8") as f:
+                return f.read()
+
+        return _RunGit(self.root, "show", ":{}".format(resolved_filename.relative_to(self.root.resolve()).as_posix()))
+
+
+# ----------------------------------------------------------------------
+class _SummaryProgress(object):
+    """Displays aggregated progress, redrawn at a fixed rate rather than whenever a file is processed."""
+
+    # ----------------------------------------------------------------------
+    def __init__(
+        self,
+        dm: DoneManager,
+        description: str,
+        num_files: int,
+        redraw_interval: float=_SUMMARY_PROGRESS_REDRAW_INTERVAL,
+    ):
+        self._dm                            = dm
+        self._description                   = description
+        self._num_files                     = num_files
+        self._redraw_interval               = redraw_interval
+
+        self._start                         = time.perf_counter()
+        self._next_redraw                   = self._start
+        self._num_completed                 = 0
+
+    # ----------------------------------------------------------------------
+    def OnFileComplete(self) -> None:
+        self._num_completed += 1
+
+        now = time.perf_counter()
+
+        if now < self._next_redraw and self._num_completed != self._num_files:
+            return
+
+        self._dm.WriteStatus(self.CreateStatus(now))
+        self._next_redraw = now + self._redraw_interval
+
+    # ----------------------------------------------------------------------
+    def Close(self) -> None:
+        self._dm.WriteStatus("")
+
+    # ----------------------------------------------------------------------
+    def CreateStatus(
+        self,
+        now: float,
+    ) -> str:
+        elapsed = now - self._start
+
+        files_per_second = self._num_completed / elapsed if elapsed else 0.0
+
+        if files_per_second:
+            eta = str(datetime.timedelta(seconds=round((self._num_files - self._num_completed) / files_per_second)))
+        else:
+            eta = "unknown"
+
+        return "{}: {} of {}, {:.1f} files/s, ETA {}".format(
+            self._description,
+            self._num_completed,
+            inflect.no("file", self._num_files),
+            files_per_second,
+            eta,
+        )
+
+
 # ----------------------------------------------------------------------
 def _Transform(
     dm: DoneManager,
@@ -316,8 +704,33 @@ def _Transform(
     exclude_filenames: Optional[list[str]],
     include_plugins: Optional[list[str]],
     exclude_plugins: Optional[list[str]],
+    cache_dir: Optional[Path],
     quiet: bool,
+    progress: ProgressDisplay=ProgressDisplay.tasks,
+    block_limits: Optional[BlockLimits]=None,
+    changed_since: Optional[str]=None,
+    staged: bool=False,
+    allow_unstaged_changes: bool=True,
+    on_record_func: Optional[Callable[[Path, dict[str, Any], Optional[str]], None]]=None,
 ) -> dict[Path, Optional[str]]:
+    """\
+    Returns the modified content of each file that was processed successfully (or None if the file
+    was not modified).
+
+    When `changed_since` or `staged` is provided, only the markdown files that git reports as changed
+    are processed; when `staged` is provided, their staged content is processed (and files with
+    unstaged changes are errors unless `allow_unstaged_changes`). When `cache_dir` is provided, the
+    files that depend upon the changed or deleted files (according to the dependency graph persisted
+    by previous runs) are processed as well. All files are processed if a prerequisite (see
+    `Plugin.IsPrerequisite`) changed, if `cache_dir` is provided and the dependency graph hasn't been
+    persisted yet, or if `cache_dir` isn't provided and a file was deleted. Prerequisites and the files that the processed files depend upon are
+    processed so that their content is available, but their results are not returned.
+
+    When `on_record_func` is provided, it is invoked with the file's record (see `_ModifyContent`)
+    and its modified content as soon as each file has been processed; the modified content is not
+    returned.
+    """
+
     filenames: list[Path] = _GetFilenames(
         dm,
         input_file_or_directory,
@@ -325,40 +738,187 @@ def _Transform(
         exclude_filenames,
     )
 
-    if not filenames:
-        dm.WriteLine("No markdown files were found.\n")
-        return {}
+    dependency_graph: Optional[DependencyGraph] = None
+    has_dependency_graph = False
+
+    if cache_dir is not None:
+        dependency_graph = DependencyGraph.Load(cache_dir)
+
+        if dependency_graph is None:
+            # The graph is created by processing all of the files
+            dependency_graph = DependencyGraph()
+        else:
+            has_dependency_graph = True
+
+    git_files: Optional[_GitFiles] = None
+
+    if filenames and (changed_since is not None or staged):
+        try:
+            git_files = _GitFiles.Create(
+                input_file_or_directory if input_file_or_directory.is_dir() else input_file_or_directory.parent,
+                changed_since,
+            )
+        except Exception as ex:  # pylint: disable=broad-exception-caught
+            dm.WriteError("{}\n".format(str(ex).rstrip()))
+            return {}
 
     if dm.result != 0:
         return {}
 
-    plugins = list(_PLUGINS.values())
+    # ----------------------------------------------------------------------
+    def ReadContent(
+        filename: Path,
+    ) -> str:
+        if git_files is not None and git_files.is_staged:
+            return git_files.ReadStagedContent(filename)
+
+        with filename.open(encoding="UTF-8") as f:
+            return f.read()
 
     # ----------------------------------------------------------------------
-    def TransformStep1(
-        context: Path,
-        on_simple_status_func: Callable[[str], None],  # pylint: disable=unused-argument
-    ) -> tuple[Optional[int], ExecuteTasks.TransformStep2FuncType]:
-        filename = context
-        del context
+
+    with _CreateSession(
+        include_plugins,
+        exclude_plugins,
+        cache_dir,
+        block_limits,
+    ) as session:
+        # Files that are prerequisites for other files (for example, files that define content used
+        # by other files) are processed first; files are processed in order as cog is not thread
+        # safe.
+        #
+        # Only the content of prerequisites is retained when determining if a file is a prerequisite
+        # (and released when the file is processed); other files are read again when they are
+        # processed, so that the content of all of the files is never held in memory at once.
+        prerequisite_contents: dict[Path, str] = {}
+
+        for filename in filenames:
+            try:
+                file_content = ReadContent(filename)
+            except Exception:  # pylint: disable=broad-exception-caught
+                # The error is raised when the file is processed
+                continue
+
+            if any(plugin.IsPrerequisite(filename, file_content) for plugin in session.plugins.values()):
+                prerequisite_contents[filename] = file_content
+
+        # Files processed only so that their content is available to other files
+        dependency_filenames: set[Path] = set()
+
+        if git_files is not None:
+            resolved_filenames = {filename.resolve(): filename for filename in filenames}
+
+            changed_filenames = set(git_files.filenames).intersection(resolved_filenames)
+
+            # Deleted markdown files may have been prerequisites (or otherwise used by other files)
+            deleted_filenames = set(filename for filename in git_files.deleted_filenames if filename.suffix == ".md")
+
+            if (
+                (cache_dir is not None and not has_dependency_graph)
+                or (dependency_graph is None and deleted_filenames)
+                or any(resolved_filenames[filename] in prerequisite_contents for filename in changed_filenames)
+            ):
+                # All files are processed when the files that depend upon the changed files aren't
+                # known: when the dependency graph hasn't been created yet (or isn't used and a file
+                # was deleted), or when a prerequisite changed (a new or modified prerequisite may be
+                # used by files that didn't depend upon it when they were last processed).
+                process_filenames = set(resolved_filenames)
+            elif dependency_graph is None:
+                process_filenames = changed_filenames
+            else:
+                process_filenames = changed_filenames | dependency_graph.GetDependents(
+                    changed_filenames | deleted_filenames,
+                ).intersection(resolved_filenames)
+
+            if process_filenames:
+                # Prerequisites are always processed, as the dependency graph (if any) only records
+                # the prerequisites that existed when the files were last processed.
+                dependency_filenames = set(
+                    filename
+                    for filename in prerequisite_contents
+                    if filename.resolve() not in process_filenames
+                )
+
+                if dependency_graph is not None:
+                    dependency_filenames.update(
+                        resolved_filenames[filename]
+                        for filename in dependency_graph.GetDependencies(process_filenames).intersection(resolved_filenames)
+                        if filename not in process_filenames
+                    )
+
+            dm.WriteVerbose(
+                "{} changed, {} dependent, {} required.\n".format(
+                    inflect.no("file", len(changed_filenames)),
+                    inflect.no("file", len(process_filenames) - len(changed_filenames)),
+                    inflect.no("file", len(dependency_filenames)),
+                ),
+            )
+
+            filenames = [
+                filename
+                for filename in filenames
+                if filename.resolve() in process_filenames or filename in dependency_filenames
+            ]
+
+        if not filenames:
+            dm.WriteLine("No markdown files were found.\n")
+            return {}
+
+        filenames.sort(key=lambda filename: filename not in prerequisite_contents)
 
         # ----------------------------------------------------------------------
-        def Step2(
-            status: ExecuteTasks.Status,  # pylint: disable=unused-argument
+        def TransformFile(
+            filename: Path,
+            on_status_func: Optional[Callable[[Status, str], None]],
         ) -> tuple[Optional[str], Optional[str]]:
-            with filename.open(encoding="UTF-8") as f:
-                content = f.read()
+            is_dependency = filename in dependency_filenames
 
-            original_content = content
+            record: Optional[dict[str, Any]] = None if on_record_func is None or is_dependency else {"filename": str(filename)}
+            dependencies: set[Path] = set()
 
-            content = Modify(
-                filename,
-                content,
-                plugins,
-                lambda status_id, text: cast(None, status.OnProgress(status_id.value, text)),
-                include_plugin_names=set(include_plugins or []),
-                exclude_plugin_names=set(exclude_plugins or []),
-            )
+            try:
+                content = prerequisite_contents.pop(filename, None)
+
+                if content is None:
+                    content = ReadContent(filename)
+
+                if (
+                    git_files is not None
+                    and git_files.is_staged
+                    and not allow_unstaged_changes
+                    and not is_dependency
+                ):
+                    with filename.open(encoding="UTF-8") as f:
+                        if f.read() != content:
+                            raise Exception("The file has unstaged changes; stage or stash them before modifying the staged content.")
+
+                original_content = content
+
+                content = _ModifyContent(
+                    session,
+                    filename,
+                    content,
+                    on_status_func=on_status_func,
+                    record=record,
+                    dependencies=dependencies,
+                )
+            except Exception as ex:
+                if record is not None:
+                    assert on_record_func is not None
+
+                    # The record is incomplete if the exception was raised before the content was modified
+                    record.setdefault("status", "error")
+                    record.setdefault("error", str(ex).strip())
+
+                    on_record_func(filename, record, None)
+
+                raise
+
+            if dependency_graph is not None:
+                dependency_graph.Update(filename.resolve(), set(dependency.resolve() for dependency in dependencies))
+
+            if is_dependency:
+                return None, "Dependency"
 
             if content == original_content:
                 content = None
@@ -366,60 +926,367 @@ def _Transform(
             else:
                 status_text = None
 
+            if record is not None:
+                assert on_record_func is not None
+                on_record_func(filename, record, content)
+
+                content = None
+
             return content, status_text
 
         # ----------------------------------------------------------------------
+        def TransformStep1(
+            context: Path,
+            on_simple_status_func: Callable[[str], None],  # pylint: disable=unused-argument
+        ) -> tuple[Optional[int], ExecuteTasks.TransformStep2FuncType]:
+            filename = context
+            del context
 
-        return len(Status), Step2
+            # ----------------------------------------------------------------------
+            def Step2(
+                status: ExecuteTasks.Status,
+            ) -> tuple[Optional[str], Optional[str]]:
+                return TransformFile(
+                    filename,
+                    lambda status_id, text: cast(None, status.OnProgress(status_id.value, text)),
+                )
 
-    # ----------------------------------------------------------------------
+            # ----------------------------------------------------------------------
 
-    results: dict[Path, Optional[str]] = {}
+            return len(Status), Step2
 
-    for filename, content in zip(
-        filenames,
-        ExecuteTasks.Transform(
-            dm,
-            "Transforming",
-            [ExecuteTasks.TaskData(str(filename), filename) for filename in filenames],
-            TransformStep1,
-            quiet=quiet,
-            max_num_threads=1, # Note that cogapp is not thread safe as it is overwriting sys.stdout and sys.stderr
-            return_exceptions=True,
+        # ----------------------------------------------------------------------
+
+        transformed_contents: list[Union[Optional[str], Exception]]
+
+        if quiet or progress == ProgressDisplay.summary:
+            # Files are processed without the per-file status objects (and the rendering of every
+            # status update) used to display tasks, which is measurable when processing many small
+            # files.
+            summary_progress = None if quiet else _SummaryProgress(dm, "Transforming", len(filenames))
+
+            transformed_contents = []
+
+            for filename in filenames:
+                try:
+                    transformed_contents.append(TransformFile(filename, None)[0])
+                except Exception as ex:  # pylint: disable=broad-exception-caught
+                    transformed_contents.append(ex)
+
+                if summary_progress is not None:
+                    summary_progress.OnFileComplete()
+
+            if summary_progress is not None:
+                summary_progress.Close()
+        else:
+            transformed_contents = ExecuteTasks.Transform(
+                dm,
+                "Transforming",
+                [ExecuteTasks.TaskData(str(filename), filename) for filename in filenames],
+                TransformStep1,
+                quiet=quiet,
+                max_num_threads=1, # Note that cogapp is not thread safe as it is overwriting sys.stdout and sys.stderr
+                return_exceptions=True,
+            )
+
+        results: dict[Path, Optional[str]] = {}
+
+        for filename, content in zip(filenames, transformed_contents):
+            if isinstance(content, Exception):
+                _WriteException(dm, filename, content)
+                continue
+
+            if filename in dependency_filenames:
+                continue
+
+            results[filename] = content
+
+        if cache_dir is not None:
+            assert dependency_graph is not None
+            dependency_graph.Save(cache_dir)
+
+    _WriteStatistics(dm, session)
+
+    return results
+
+
+# ----------------------------------------------------------------------
+def _TransformContent(
+    dm: DoneManager,
+    filename: Optional[Path],
+    content: str,
+    *,
+    include_plugins: Optional[list[str]],
+    exclude_plugins: Optional[list[str]],
+    cache_dir: Optional[Path],
+    block_limits: Optional[BlockLimits]=None,
+) -> Optional[str]:
+    """Transforms content read from stdin; returns None if the content was not modified."""
+
+    if filename is None:
+        filename = Path.cwd() / _STDIN_DEFAULT_FILENAME
+
+    with _CreateSession(
+        include_plugins,
+        exclude_plugins,
+        cache_dir,
+        block_limits,
+    ) as session:
+        try:
+            modified_content = _ModifyContent(session, filename, content)
+        except Exception as ex:  # pylint: disable=broad-exception-caught
+            _WriteException(dm, filename, ex)
+            return None
+
+    _WriteStatistics(dm, session)
+
+    return None if modified_content == content else modified_content
+
+
+# ----------------------------------------------------------------------
+def _CreateSession(
+    include_plugins: Optional[list[str]],
+    exclude_plugins: Optional[list[str]],
+    cache_dir: Optional[Path],
+    block_limits: Optional[BlockLimits]=None,
+) -> Session:
+    """\
+    Returns a session with newly created plugins; the plugin and block caches are loaded from
+    `cache_dir` (if provided) and saved when the session is closed.
+    """
+
+    return Session(
+        _PLUGIN_DIR,
+        include_plugin_names=set(include_plugins or []),
+        exclude_plugin_names=set(exclude_plugins or []),
+        cache_dir=cache_dir,
+        block_limits=block_limits,
+    )
+
+
+# ----------------------------------------------------------------------
+def _ModifyContent(
+    session: Session,
+    filename: Path,
+    content: str,
+    *,
+    on_status_func: Optional[Callable[[Status, str], None]]=None,
+    record: Optional[dict[str, Any]]=None,
+    dependencies: Optional[set[Path]]=None,
+) -> str:
+    """\
+    Returns the modified content.
+
+    When `record` is provided, it is populated with information about the modification (even when
+    an exception is raised):
+
+        status:         "modified", "unchanged", or "error"
+        duration:       Time spent modifying the content, in seconds
+        input_size:     Size of the content, in UTF-8 bytes
+        output_size:    Size of the modified content, in UTF-8 bytes (null on error)
+        cache_hit:      true if all of the plugin and block cache lookups made while modifying the
+                        content were hits, false if any were misses, and null if no lookups were made
+        plugins:        Names of the plugins that executed blocks or modified the content
+        error:          The error message (on error)
+    """
+
+    if record is None:
+        return session.Modify(filename, content, on_status_func, dependencies=dependencies)
+
+    record.update(
+        {
+            "status": "error",
+            "duration": None,
+            "input_size": len(content.encode("UTF-8")),
+            "output_size": None,
+            "cache_hit": None,
+            "plugins": [],
+        },
+    )
+
+    active_plugin_names: set[str] = set()
+    initial_cache_hits, initial_cache_misses = _GetCacheLookups(session)
+
+    start = time.perf_counter()
+
+    try:
+        modified_content = session.Modify(
+            filename,
+            content,
+            on_status_func,
+            active_plugin_names=active_plugin_names,
+            dependencies=dependencies,
+        )
+
+        record["status"] = "unchanged" if modified_content == content else "modified"
+        record["output_size"] = len(modified_content.encode("UTF-8"))
+
+        return modified_content
+
+    except Exception as ex:
+        record["error"] = str(ex).strip()
+        raise
+
+    finally:
+        record["duration"] = time.perf_counter() - start
+
+        cache_hits, cache_misses = _GetCacheLookups(session)
+        cache_hits -= initial_cache_hits
+        cache_misses -= initial_cache_misses
+
+        if cache_hits or cache_misses:
+            record["cache_hit"] = cache_misses == 0
+
+        record["plugins"] = sorted(active_plugin_names)
+
+
+# ----------------------------------------------------------------------
+def _GetCacheLookups(
+    session: Session,
+) -> tuple[int, int]:
+    """Returns the number of plugin and block cache hits and misses, based on plugin statistics and the block cache."""
+
+    hits = session.block_cache.hits
+    misses = session.block_cache.misses
+
+    for plugin in session.plugins.values():
+        for key, value in plugin.GetStatistics().items():
+            # By convention, values whose names end in '_hits' and '_misses' are cache lookups
+            if key.endswith("_hits"):
+                hits += value
+            elif key.endswith("_misses"):
+                misses += value
+
+    return hits, misses
+
+
+# ----------------------------------------------------------------------
+def _WriteRecord(
+    record: dict[str, Any],
+) -> None:
+    sys.stdout.write(json.dumps(record) + "\n")
+    sys.stdout.flush()
+
+
+# ----------------------------------------------------------------------
+def _WriteException(
+    dm: DoneManager,
+    filename: Union[Path, str],
+    ex: Exception,
+) -> None:
+    if dm.is_debug:
+        sink = StringIO()
+
+        traceback.print_exception(ex, file=sink)
+
+        error = sink.getvalue()
+    else:
+        error = str(ex)
+
+    dm.WriteError(
+        textwrap.dedent(
+            """\
+            {}
+                {}
+
+            """,
+        ).format(
+            filename,
+            TextwrapEx.Indent(
+                error.rstrip(),
+                4,
+                skip_first_line=True,
+            ),
         ),
-    ):
-        if isinstance(content, Exception):
-            if dm.is_debug:
-                sink = StringIO()
+    )
 
-                traceback.print_exception(content, file=sink)
 
-                error = sink.getvalue()
-            else:
-                error = str(content)
+# ----------------------------------------------------------------------
+def _WriteStatistics(
+    dm: DoneManager,
+    session: Session,
+) -> None:
+    if not dm.is_verbose:
+        return
 
-            dm.WriteError(
-                textwrap.dedent(
-                    """\
-                    {}
-                        {}
+    for plugin in session.plugins.values():
+        statistics = plugin.GetStatistics()
+        if not statistics:
+            continue
 
-                    """,
-                ).format(
-                    filename,
-                    TextwrapEx.Indent(
-                        error.rstrip(),
-                        4,
-                        skip_first_line=True,
-                    ),
+        dm.WriteVerbose(
+            "{}: {}\n".format(
+                plugin.name,
+                ", ".join(
+                    # By convention, values whose names end in '_rate' are ratios
+                    "{}={}".format(key, "{:.1%}".format(value) if key.endswith("_rate") else value)
+                    for key, value in statistics.items()
                 ),
-            )
+            ),
+        )
 
-            continue
 
-        results[filename] = content
+# ----------------------------------------------------------------------
+def _ValidateFilenameOption(
+    filename: Optional[Path],
+) -> None:
+    if filename is not None:
+        raise typer.BadParameter("'--filename' can only be used when reading markdown content from stdin ('-').")
 
-    return results
+
+# ----------------------------------------------------------------------
+def _CreateBlockLimits(
+    block_timeout: Optional[float],
+    block_memory: Optional[int],
+) -> Optional[BlockLimits]:
+    if block_timeout is None and block_memory is None:
+        return None
+
+    try:
+        return BlockLimits(block_timeout, block_memory)
+    except ValueError as ex:
+        raise typer.BadParameter(str(ex))
+
+
+# ----------------------------------------------------------------------
+def _ValidateGitOptions(
+    changed_since: Optional[str],
+    staged: bool,
+) -> None:
+    if changed_since is not None and staged:
+        raise typer.BadParameter("'--changed-since' and '--staged' can't be used together.")
+
+
+# ----------------------------------------------------------------------
+def _ValidateStdinOutputFormatOption(
+    output_format: OutputFormat,
+) -> None:
+    if output_format != OutputFormat.text:
+        raise typer.BadParameter("'--output-format' can't be used when reading markdown content from stdin ('-'); use the 'Batch' command instead.")
+
+
+# ----------------------------------------------------------------------
+def _RunGit(
+    working_dir: Path,
+    *args: str,
+) -> str:
+    try:
+        result = subprocess.run(
+            ["git", *args],
+            cwd=working_dir,
+            capture_output=True,
+            check=False,
+        )
+    except FileNotFoundError as ex:
+        raise Exception("git was not found.") from ex
+
+    if result.returncode != 0:
+        raise Exception(
+            "'git {}' failed: {}".format(" ".join(args), result.stderr.decode("UTF-8", errors="replace").strip()),
+        )
+
+    # Newlines are translated in the same way as they are for files read from the working tree
+    return result.stdout.decode("UTF-8").replace("\r\n", "\n").replace("\r", "\n")
 
 
 # ----------------------------------------------------------------------
@@ -0,0 +1,207 @@
+# ----------------------------------------------------------------------
+# |
+# |  BlockCache.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-19 21:47:12
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2023
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Contains the BlockCache object"""
+
+import hashlib
+import json
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, ClassVar, Iterable, Optional
+
+
+# ----------------------------------------------------------------------
+class BlockCache(object):
+    """\
+    The output of `[[[ ]]]` blocks that only invoke pure plugins (see `Plugin.GetPureExecuteVersion`),
+    keyed by the source of the block, shared by all of the files modified during a run and
+    optionally persisted across runs.
+
+    Blocks in a file share state, so the key of a block is based on its source and the source of
+    the blocks that precede it in the file.
+
+    The number of entries is bounded; the least recently used entries are evicted first.
+    """
+
+    FILENAME: ClassVar[str]                 = "Blocks.json"
+    VERSION: ClassVar[int]                  = 2
+
+    DEFAULT_MAX_SIZE: ClassVar[int]         = 10000
+
+    # ----------------------------------------------------------------------
+    @dataclass(frozen=True)
+    class Entry(object):
+        output: str
+        plugin_versions: dict[str, str]     # The names and `GetPureExecuteVersion` values of the plugins invoked by the block
+        states: dict[str, Any]              # The names and `GetExecuteState` values of the plugins invoked by the block and the blocks that precede it
+
+    # ----------------------------------------------------------------------
+    def __init__(
+        self,
+        entries: Optional[dict[str, "BlockCache.Entry"]]=None,     # Ordered from least to most recently used
+        max_size: int=DEFAULT_MAX_SIZE,
+    ):
+        self.max_size                       = max_size
+
+        self.hits                           = 0
+        self.misses                         = 0
+
+        self._entries                       = dict(entries or {})
+        self._is_modified                   = False
+
+        while len(self._entries) > self.max_size:
+            del self._entries[next(iter(self._entries))]
+
+    # ----------------------------------------------------------------------
+    @classmethod
+    def Load(
+        cls,
+        cache_dir: Path,
+        max_size: int=DEFAULT_MAX_SIZE,
+    ) -> "BlockCache":
+        """Returns an empty cache if the cache hasn't been saved or can't be read."""
+
+        filename = cache_dir / cls.FILENAME
+
+        if not filename.is_file():
+            return cls(max_size=max_size)
+
+        try:
+            with filename.open(encoding="UTF-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls(max_size=max_size)
+
+        if not isinstance(data, dict) or data.get("version") != cls.VERSION:
+            return cls(max_size=max_size)
+
+        blocks = data.get("blocks")
+        if not isinstance(blocks, dict):
+            return cls(max_size=max_size)
+
+        entries: dict[str, BlockCache.Entry] = {}
+
+        for key, block in blocks.items():
+            if (
+                not isinstance(block, dict)
+                or not isinstance(block.get("output"), str)
+                or not isinstance(block.get("plugins"), dict)
+                or not isinstance(block.get("states"), dict)
+            ):
+                continue
+
+            entries[key] = cls.Entry(block["output"], block["plugins"], block["states"])
+
+        return cls(entries, max_size)
+
+    # ----------------------------------------------------------------------
+    def Save(
+        self,
+        cache_dir: Path,
+    ) -> None:
+        if not self._is_modified:
+            return
+
+        content = json.dumps(
+            {
+                "version": self.__class__.VERSION,
+                "blocks": {
+                    key: {
+                        "output": entry.output,
+                        "plugins": entry.plugin_versions,
+                        "states": entry.states,
+                    }
+                    for key, entry in self._entries.items()
+                },
+            },
+        )
+
+        filename = cache_dir / self.__class__.FILENAME
+
+        filename.parent.mkdir(parents=True, exist_ok=True)
+
+        temp_filename = filename.with_suffix(".tmp")
+
+        with temp_filename.open("w", encoding="UTF-8") as f:
+            f.write(content)
+
+        temp_filename.replace(filename)
+
+        self._is_modified = False
+
+    # ----------------------------------------------------------------------
+    @staticmethod
+    def CreateKeys(
+        sources: Iterable[str],
+    ) -> list[str]:
+        """Returns the keys of the blocks in a file, where `sources` is the source of each block in the order in which they appear."""
+
+        hasher = hashlib.sha256()
+        keys: list[str] = []
+
+        for source in sources:
+            hasher.update("{}\n{}".format(len(source), source).encode("UTF-8"))
+            keys.append(hasher.hexdigest())
+
+        return keys
+
+    # ----------------------------------------------------------------------
+    def Get(
+        self,
+        key: str,
+        plugin_versions: dict[str, str],    # The names and `GetPureExecuteVersion` values of the pure plugins that are currently active
+    ) -> Optional["BlockCache.Entry"]:
+        """Returns None if the output isn't cached or if it was generated by plugins that are no longer active or have changed."""
+
+        entry = self._entries.get(key)
+
+        if entry is not None and any(
+            plugin_versions.get(plugin_name) != version
+            for plugin_name, version in entry.plugin_versions.items()
+        ):
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+            # Reinsert the entry so that it is the last to be evicted
+            del self._entries[key]
+            self._entries[key] = entry
+
+        return entry
+
+    # ----------------------------------------------------------------------
+    def Set(
+        self,
+        key: str,
+        output: str,
+        plugin_versions: dict[str, str],
+        states: dict[str, Any],
+    ) -> None:
+        entry = self.__class__.Entry(output, plugin_versions, states)
+
+        existing_entry = self._entries.pop(key, None)
+
+        if existing_entry != entry:
+            self._is_modified = True
+
+            if existing_entry is None and len(self._entries) >= self.max_size:
+                del self._entries[next(iter(self._entries))]
+
+        # (Re)insert the entry so that it is the last to be evicted
+        self._entries[key] = entry
@@ -0,0 +1,392 @@
+# ----------------------------------------------------------------------
+# |
+# |  BlockWorker.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-19 20:58:16
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2023
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Contains the BlockLimits and BlockWorker objects"""
+
+import importlib
+import inspect
+import multiprocessing
+import re
+import sys
+
+from dataclasses import dataclass
+from io import StringIO
+from multiprocessing.connection import Connection
+from multiprocessing.reduction import ForkingPickler
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from cogapp.cogapp import Cog
+from cogapp.whiteutils import reindentBlock
+
+from .Plugin import Plugin
+
+
+# ----------------------------------------------------------------------
+# |
+# |  Public Types
+# |
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class BlockLimits(object):
+    """Limits applied to each block."""
+
+    max_seconds: Optional[float]            = None
+    max_memory_mb: Optional[int]            = None
+
+    # ----------------------------------------------------------------------
+    def __post_init__(self):
+        if self.max_seconds is not None and self.max_seconds <= 0:
+            raise ValueError("'max_seconds' must be greater than 0.")
+
+        if self.max_memory_mb is not None:
+            if self.max_memory_mb <= 0:
+                raise ValueError("'max_memory_mb' must be greater than 0.")
+
+            if sys.platform != "linux":
+                raise ValueError("Block memory limits are only supported on Linux.")
+
+
+# ----------------------------------------------------------------------
+class BlockWorker(object):
+    """\
+    Executes the code in `[[[ ]]]` blocks in a worker process that is supervised by this process, so
+    that blocks that exceed their limits can be stopped without stopping this process.
+
+    Plugins are not invoked in the worker; invocations are recorded and returned to this process, so
+    plugin state is preserved. As a result, the arguments passed to plugins must be picklable (for
+    example, lambdas can't be passed to plugins). The worker is restarted when a block exceeds its
+    time limit.
+    """
+
+    # ----------------------------------------------------------------------
+    def __init__(
+        self,
+        plugins: list[Plugin],
+        limits: BlockLimits,
+    ):
+        self.limits                         = limits
+
+        self._plugin_types: dict[str, tuple[str, str]]  = {
+            plugin.name: (plugin.__class__.__module__, plugin.__class__.__qualname__)
+            for plugin in plugins
+        }
+
+        # The plugins (and the modules that they import) must be importable in the worker
+        sys_path: list[str] = [str(Path(__file__).parent.parent), str(Path(__file__).parent)]
+
+        for plugin in plugins:
+            plugin_dir = str(Path(inspect.getfile(plugin.__class__)).parent)
+
+            if plugin_dir not in sys_path:
+                sys_path.append(plugin_dir)
+
+        self._sys_path                      = sys_path
+
+        self._process: Optional[multiprocessing.process.BaseProcess]    = None
+        self._connection: Optional[Connection]                          = None
+
+    # ----------------------------------------------------------------------
+    def __enter__(self) -> "BlockWorker":
+        return self
+
+    # ----------------------------------------------------------------------
+    def __exit__(self, *args) -> None:
+        self.Close()
+
+    # ----------------------------------------------------------------------
+    def Close(self) -> None:
+        """Stops the worker process."""
+
+        if self._connection is not None:
+            try:
+                self._connection.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+
+        self._Stop()
+
+    # ----------------------------------------------------------------------
+    def Transform(
+        self,
+        filename: Path,
+        content: str,
+        execute_func: Callable[..., str],   # def Func(block_line, plugin_name, *args, **kwargs) -> str
+    ) -> str:
+        """Returns the content generated by cog, where `execute_func` provides the output of plugins invoked by blocks."""
+
+        if self._connection is None:
+            self._Start()
+
+        assert self._connection is not None
+
+        self._connection.send(content)
+
+        block_line: Optional[int] = None
+
+        while True:
+            # The time limit applies to the block that is currently executing
+            timeout = self.limits.max_seconds if block_line is not None else None
+
+            if not self._connection.poll(timeout):
+                self._Stop()
+
+                raise Exception(
+                    "{}({}): The block exceeded the {:g} second time limit.".format(
+                        filename,
+                        block_line,
+                        self.limits.max_seconds,
+                    ),
+                )
+
+            try:
+                message = self._connection.recv()
+            except EOFError:
+                self._Stop()
+
+                raise Exception(
+                    "{}{}: The block worker exited unexpectedly.".format(
+                        filename,
+                        "" if block_line is None else "({})".format(block_line),
+                    ),
+                ) from None
+
+            message_type = message[0]
+
+            if message_type == "block":
+                block_line = message[1]
+                continue
+
+            if message_type == "error":
+                _, error, is_memory_error = message
+
+                if is_memory_error:
+                    raise Exception(
+                        "{}({}): The block exceeded the {} MB memory limit.".format(
+                            filename,
+                            block_line,
+                            self.limits.max_memory_mb,
+                        ),
+                    )
+
+                raise Exception(error)
+
+            if message_type == "unpicklable":
+                _, invocation_line, plugin_name, error = message
+
+                raise Exception(
+                    "{}({}): The arguments passed to '{}' can't be sent from the block worker, as they can't be pickled ({}); arguments passed to plugins must be picklable when block limits are used.".format(
+                        filename,
+                        invocation_line,
+                        plugin_name,
+                        error,
+                    ),
+                )
+
+            assert message_type == "result", message_type
+            _, output, invocations = message
+
+            break
+
+        # ----------------------------------------------------------------------
+        def Replace(
+            match: re.Match,
+        ) -> str:
+            block_line, plugin_name, args, kwargs = invocations[int(match.group("index"))]
+
+            return reindentBlock(
+                execute_func(block_line, plugin_name, *args, **kwargs).rstrip() + "\n",
+                match.group("prefix"),
+            )
+
+        # ----------------------------------------------------------------------
+
+        # Invoke the plugins in the order in which they were invoked in the worker
+        return _PLACEHOLDER_REGEX.sub(Replace, output)
+
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    def _Start(self) -> None:
+        connection, worker_connection = multiprocessing.Pipe()
+
+        process = multiprocessing.Process(
+            target=_WorkerMain,
+            args=(
+                worker_connection,
+                self._sys_path,
+                self._plugin_types,
+                self.limits.max_memory_mb,
+            ),
+            daemon=True,
+        )
+
+        process.start()
+        worker_connection.close()
+
+        self._process = process
+        self._connection = connection
+
+    # ----------------------------------------------------------------------
+    def _Stop(self) -> None:
+        if self._process is not None:
+            self._process.join(0.5)
+
+            if self._process.is_alive():
+                self._process.kill()
+                self._process.join()
+
+            self._process = None
+
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+# ----------------------------------------------------------------------
+# |
+# |  Private Data
+# |
+# ----------------------------------------------------------------------
+_PLACEHOLDER_TEMPLATE                       = "\x00MarkdownModifierBlockWorker:{}\x00"
+
+_PLACEHOLDER_REGEX                          = re.compile(
+    r"^(?P<prefix>[ \t]*)\x00MarkdownModifierBlockWorker:(?P<index>\d+)\x00\n",
+    re.MULTILINE,
+)
+
+_BLOCK_FUNC_NAME                            = "__MarkdownModifierBlockWorker__"
+
+
+# ----------------------------------------------------------------------
+# |
+# |  Private Functions
+# |
+# ----------------------------------------------------------------------
+def _WorkerMain(
+    connection: Connection,
+    sys_path: list[str],
+    plugin_types: dict[str, tuple[str, str]],
+    max_memory_mb: Optional[int],
+) -> None:
+    sys.path[:0] = sys_path
+
+    globals_template: dict[str, Any] = {}
+
+    for plugin_name, (module_name, class_name) in plugin_types.items():
+        globals_template["{}Type".format(plugin_name)] = getattr(importlib.import_module(module_name), class_name)
+
+    if max_memory_mb is None:
+        SetMemoryLimit = lambda: None  # pylint: disable=unnecessary-lambda-assignment
+        ResetMemoryLimit = lambda: None  # pylint: disable=unnecessary-lambda-assignment
+    else:
+        import resource  # pylint: disable=import-outside-toplevel
+
+        initial_limits = resource.getrlimit(resource.RLIMIT_AS)
+
+        # ----------------------------------------------------------------------
+        def SetMemoryLimit() -> None:
+            # The limit is relative to the memory used when the block begins
+            with open("/proc/self/statm") as f:
+                current_size = int(f.read().split()[0]) * resource.getpagesize()
+
+            limit = current_size + max_memory_mb * 1024 * 1024
+
+            if initial_limits[1] != resource.RLIM_INFINITY:
+                limit = min(limit, initial_limits[1])
+
+            resource.setrlimit(resource.RLIMIT_AS, (limit, initial_limits[1]))
+
+        # ----------------------------------------------------------------------
+        def ResetMemoryLimit() -> None:
+            resource.setrlimit(resource.RLIMIT_AS, initial_limits)
+
+        # ----------------------------------------------------------------------
+
+    while True:
+        try:
+            content = connection.recv()
+        except EOFError:
+            break
+
+        if content is None:
+            break
+
+        cog = Cog()
+
+        cog.options.sBeginSpec = "[[["
+        cog.options.sEndSpec = "]]]"
+
+        # The prologue is executed at the beginning of each block
+        cog.options.sPrologue = "{}(cog.firstLineNum)".format(_BLOCK_FUNC_NAME)
+
+        invocations: list[tuple[int, str, tuple, dict[str, Any]]] = []
+
+        # ----------------------------------------------------------------------
+        def OnBlock(
+            line: int,
+        ) -> None:
+            ResetMemoryLimit()
+            connection.send(("block", line))
+            SetMemoryLimit()
+
+        # ----------------------------------------------------------------------
+        def Invoke(
+            plugin_name: str,
+            *args,
+            **kwargs,
+        ) -> None:
+            invocations.append((cog.cogmodule.firstLineNum, plugin_name, args, kwargs))  # type: ignore  # pylint: disable=no-member
+            cog.cogmodule.outl(_PLACEHOLDER_TEMPLATE.format(len(invocations) - 1))  # type: ignore  # pylint: disable=no-member
+
+        # ----------------------------------------------------------------------
+
+        globals: dict[str, Any] = dict(globals_template)
+
+        globals[_BLOCK_FUNC_NAME] = OnBlock
+
+        for plugin_name in plugin_types:
+            globals[plugin_name] = lambda *args, plugin_name=plugin_name, **kwargs: Invoke(plugin_name, *args, **kwargs)
+
+        output = StringIO()
+
+        try:
+            cog.processFile(StringIO(content), output, globals=globals)
+            result: tuple = ("result", output.getvalue(), invocations)
+
+        except Exception as ex:  # pylint: disable=broad-exception-caught
+            result = ("error", str(ex), isinstance(ex.__context__, MemoryError))
+
+        finally:
+            ResetMemoryLimit()
+
+        try:
+            connection.send(result)
+        except Exception as ex:  # pylint: disable=broad-exception-caught
+            # The plugin arguments can't be sent to the supervisor; identify the invocation so that the
+            # error can be associated with its block.
+            unpicklable_line: Optional[int] = None
+            unpicklable_plugin_name: Optional[str] = None
+
+            for invocation in invocations:
+                try:
+                    ForkingPickler.dumps(invocation)
+                except Exception as invocation_ex:  # pylint: disable=broad-exception-caught
+                    unpicklable_line, unpicklable_plugin_name = invocation[:2]
+                    ex = invocation_ex
+
+                    break
+
+            connection.send(("unpicklable", unpicklable_line, unpicklable_plugin_name, str(ex)))
@@ -0,0 +1,181 @@
+# ----------------------------------------------------------------------
+# |
+# |  DependencyGraph.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-19 19:26:48
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2023
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Contains the DependencyGraph object"""
+
+import json
+
+from pathlib import Path
+from typing import ClassVar, Iterable, Optional
+
+
+# ----------------------------------------------------------------------
+class DependencyGraph(object):
+    """\
+    Files and the other files whose content was used when modifying them (for example, the files
+    that export the definitions linked in a file), persisted across runs.
+
+    Incremental runs use the graph to reprocess the files that depend upon the files that changed
+    and to process the files that they depend upon (so that plugin state, such as exported
+    definitions, is available).
+    """
+
+    FILENAME: ClassVar[str]                 = "Dependencies.json"
+    VERSION: ClassVar[int]                  = 1
+
+    # ----------------------------------------------------------------------
+    def __init__(
+        self,
+        dependencies: Optional[dict[Path, set[Path]]]=None,
+    ):
+        self._dependencies                  = dependencies or {}
+        self._is_modified                   = False
+
+    # ----------------------------------------------------------------------
+    @classmethod
+    def Load(
+        cls,
+        cache_dir: Path,
+    ) -> Optional["DependencyGraph"]:
+        """\
+        Returns None if the graph hasn't been saved or can't be read, in which case the files that
+        depend upon other files aren't known.
+        """
+
+        filename = cache_dir / cls.FILENAME
+
+        if not filename.is_file():
+            return None
+
+        try:
+            with filename.open(encoding="UTF-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if not isinstance(data, dict) or data.get("version") != cls.VERSION:
+            return None
+
+        dependencies = data.get("dependencies")
+        if not isinstance(dependencies, dict):
+            return None
+
+        return cls(
+            {
+                Path(filename): set(Path(dependency) for dependency in file_dependencies)
+                for filename, file_dependencies in dependencies.items()
+            },
+        )
+
+    # ----------------------------------------------------------------------
+    def Save(
+        self,
+        cache_dir: Path,
+    ) -> None:
+        """Saves the graph; files that no longer exist are removed."""
+
+        for filename in [filename for filename in self._dependencies if not filename.is_file()]:
+            del self._dependencies[filename]
+            self._is_modified = True
+
+        filename = cache_dir / self.__class__.FILENAME
+
+        if not self._is_modified and filename.is_file():
+            return
+
+        content = json.dumps(
+            {
+                "version": self.__class__.VERSION,
+                "dependencies": {
+                    str(filename): sorted(str(dependency) for dependency in dependencies)
+                    for filename, dependencies in sorted(self._dependencies.items())
+                },
+            },
+            indent=2,
+        )
+
+        filename.parent.mkdir(parents=True, exist_ok=True)
+
+        temp_filename = filename.with_suffix(".tmp")
+
+        with temp_filename.open("w", encoding="UTF-8") as f:
+            f.write(content)
+
+        temp_filename.replace(filename)
+
+        self._is_modified = False
+
+    # ----------------------------------------------------------------------
+    def Update(
+        self,
+        filename: Path,
+        dependencies: set[Path],
+    ) -> None:
+        """Replaces the dependencies of the file."""
+
+        if self._dependencies.get(filename, set()) == dependencies:
+            return
+
+        if dependencies:
+            self._dependencies[filename] = set(dependencies)
+        else:
+            self._dependencies.pop(filename, None)
+
+        self._is_modified = True
+
+    # ----------------------------------------------------------------------
+    def GetDependencies(
+        self,
+        filenames: Iterable[Path],
+    ) -> set[Path]:
+        """Returns the files that the files depend upon (directly or indirectly), not including the files themselves."""
+
+        return self._Traverse(filenames, self._dependencies)
+
+    # ----------------------------------------------------------------------
+    def GetDependents(
+        self,
+        filenames: Iterable[Path],
+    ) -> set[Path]:
+        """Returns the files that depend upon the files (directly or indirectly), not including the files themselves."""
+
+        dependents: dict[Path, set[Path]] = {}
+
+        for filename, dependencies in self._dependencies.items():
+            for dependency in dependencies:
+                dependents.setdefault(dependency, set()).add(filename)
+
+        return self._Traverse(filenames, dependents)
+
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    @staticmethod
+    def _Traverse(
+        filenames: Iterable[Path],
+        edges: dict[Path, set[Path]],
+    ) -> set[Path]:
+        initial = set(filenames)
+
+        visited: set[Path] = set()
+        pending = list(initial)
+
+        while pending:
+            for filename in edges.get(pending.pop(), set()):
+                if filename not in visited:
+                    visited.add(filename)
+                    pending.append(filename)
+
+        return visited - initial
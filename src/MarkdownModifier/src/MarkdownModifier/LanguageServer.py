@@ -0,0 +1,499 @@
+# ----------------------------------------------------------------------
+# |
+# |  LanguageServer.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-19 20:03:27
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2023
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Contains the LanguageServer object"""
+
+import json
+import queue
+import re
+import threading
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Optional
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+from .Session import Session
+
+
+# ----------------------------------------------------------------------
+# |
+# |  Public Types
+# |
+# ----------------------------------------------------------------------
+class LanguageServer(object):
+    """\
+    A Language Server Protocol server (over a stream, typically stdin/stdout) that keeps open
+    documents in memory, publishes diagnostics for content that can't be modified or whose generated
+    content is out of date, and offers the modified content as a code action.
+
+    Documents are modified after all of the messages that are available have been processed, so a
+    burst of edits (for example, while typing) results in a single modification of the document.
+    Modifications are memoized by content, so documents are only modified when they change.
+    """
+
+    SOURCE                                  = "MarkdownModifier"
+    CODE_ACTION_TITLE                       = "Update generated content"
+
+    # ----------------------------------------------------------------------
+    def __init__(
+        self,
+        session: Session,
+    ):
+        self.session                        = session
+
+        self._documents: dict[str, _Document]           = {}
+        self._is_shutdown                   = False
+
+    # ----------------------------------------------------------------------
+    def Run(
+        self,
+        input_stream: BinaryIO,
+        output_stream: BinaryIO,
+    ) -> int:
+        """Processes messages until 'exit' is received or the input stream is closed; returns the exit code."""
+
+        messages: queue.Queue[Optional[dict[str, Any]]] = queue.Queue()
+
+        # ----------------------------------------------------------------------
+        def Reader() -> None:
+            try:
+                while True:
+                    message = _ReadMessage(input_stream)
+
+                    messages.put(message)
+
+                    if message is None:
+                        break
+            except Exception:  # pylint: disable=broad-exception-caught
+                messages.put(None)
+
+        # ----------------------------------------------------------------------
+
+        threading.Thread(target=Reader, daemon=True).start()
+
+        # ----------------------------------------------------------------------
+        def Send(
+            message: dict[str, Any],
+        ) -> None:
+            _WriteMessage(output_stream, message)
+
+        # ----------------------------------------------------------------------
+
+        while True:
+            message = messages.get()
+            is_complete = False
+
+            while True:
+                if message is None or message.get("method") == "exit":
+                    is_complete = True
+                    break
+
+                self._ProcessMessage(message, Send)
+
+                try:
+                    message = messages.get_nowait()
+                except queue.Empty:
+                    break
+
+            # Modify the documents that changed now that the pending messages have been processed
+            if not self._is_shutdown:
+                for uri, document in self._documents.items():
+                    if document.is_dirty:
+                        Send(self._CreateDiagnosticsNotification(uri, document))
+                        document.is_dirty = False
+
+            if is_complete:
+                return 0 if self._is_shutdown else 1
+
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    def _ProcessMessage(
+        self,
+        message: dict[str, Any],
+        send_func: Callable[[dict[str, Any]], None],
+    ) -> None:
+        method = message.get("method")
+        params = message.get("params") or {}
+        message_id = message.get("id")
+
+        if method is None:
+            # A response to a request that we didn't make
+            return
+
+        try:
+            result: Any = None
+
+            if method == "initialize":
+                self._Initialize(params)
+
+                result = {
+                    "capabilities": {
+                        "textDocumentSync": {
+                            "openClose": True,
+                            "change": 2,            # Incremental
+                        },
+                        "codeActionProvider": True,
+                    },
+                    "serverInfo": {
+                        "name": self.__class__.SOURCE,
+                    },
+                }
+
+            elif method == "shutdown":
+                self._is_shutdown = True
+
+            elif method == "textDocument/didOpen":
+                text_document = params["textDocument"]
+                self._documents[text_document["uri"]] = _Document(text_document["text"])
+
+            elif method == "textDocument/didChange":
+                document = self._documents[params["textDocument"]["uri"]]
+
+                for change in params["contentChanges"]:
+                    document.ApplyChange(change)
+
+            elif method == "textDocument/didClose":
+                uri = params["textDocument"]["uri"]
+
+                del self._documents[uri]
+                send_func(_CreateNotification("textDocument/publishDiagnostics", {"uri": uri, "diagnostics": []}))
+
+            elif method == "textDocument/codeAction":
+                result = self._GetCodeActions(params["textDocument"]["uri"])
+
+            elif message_id is not None:
+                send_func(
+                    {
+                        "jsonrpc": "2.0",
+                        "id": message_id,
+                        "error": {"code": -32601, "message": "'{}' is not supported.".format(method)},
+                    },
+                )
+
+                return
+
+        except Exception as ex:  # pylint: disable=broad-exception-caught
+            if message_id is None:
+                send_func(_CreateNotification("window/logMessage", {"type": 1, "message": str(ex)}))
+            else:
+                send_func({"jsonrpc": "2.0", "id": message_id, "error": {"code": -32603, "message": str(ex)}})
+
+            return
+
+        if message_id is not None:
+            send_func({"jsonrpc": "2.0", "id": message_id, "result": result})
+
+    # ----------------------------------------------------------------------
+    def _Initialize(
+        self,
+        params: dict[str, Any],
+    ) -> None:
+        # Modify the prerequisites in the workspace (for example, glossaries that export definitions)
+        # so that their content is available to the documents that are opened.
+        root_uri = params.get("rootUri")
+
+        if root_uri:
+            root = _UriToPath(root_uri)
+        elif params.get("rootPath"):
+            root = Path(params["rootPath"])
+        else:
+            return
+
+        plugins = list(self.session.plugins.values())
+
+        for filename in sorted(root.rglob("*.md")):
+            if any(part.startswith(".") for part in filename.relative_to(root).parts):
+                continue
+
+            try:
+                content = filename.read_text(encoding="UTF-8")
+
+                if any(plugin.IsPrerequisite(filename, content) for plugin in plugins):
+                    self.session.Modify(filename, content)
+
+            except Exception:  # pylint: disable=broad-exception-caught
+                # Errors are reported when the file is opened
+                pass
+
+    # ----------------------------------------------------------------------
+    def _Modify(
+        self,
+        uri: str,
+        document: "_Document",
+    ) -> "_Result":
+        if document.result is None or document.result.text != document.text:
+            try:
+                modified_text: Optional[str] = self.session.Modify(_UriToPath(uri), document.text)
+                error: Optional[Exception] = None
+            except Exception as ex:  # pylint: disable=broad-exception-caught
+                modified_text = None
+                error = ex
+
+            document.result = _Result(document.text, modified_text, error)
+
+        return document.result
+
+    # ----------------------------------------------------------------------
+    def _CreateDiagnosticsNotification(
+        self,
+        uri: str,
+        document: "_Document",
+    ) -> dict[str, Any]:
+        result = self._Modify(uri, document)
+
+        diagnostics: list[dict[str, Any]] = []
+
+        if result.error is not None:
+            error_lines = str(result.error).rstrip().split("\n")
+
+            # cog reports the line that begins the block as '<cog :LINE>'
+            match = _COG_LINE_REGEX.search(str(result.error))
+            line = 0 if match is None else int(match.group("line")) - 1
+
+            diagnostics.append(
+                {
+                    "range": _CreateLineRange(line, line + 1),
+                    "severity": 1,          # Error
+                    "source": self.__class__.SOURCE,
+                    "message": error_lines[-1].strip(),
+                },
+            )
+
+        elif result.edit is not None:
+            first_line, last_line, _ = result.edit
+
+            diagnostics.append(
+                {
+                    "range": _CreateLineRange(first_line, max(last_line, first_line + 1)),
+                    "severity": 3,          # Information
+                    "source": self.__class__.SOURCE,
+                    "message": "The generated content is out of date.",
+                },
+            )
+
+        return _CreateNotification("textDocument/publishDiagnostics", {"uri": uri, "diagnostics": diagnostics})
+
+    # ----------------------------------------------------------------------
+    def _GetCodeActions(
+        self,
+        uri: str,
+    ) -> list[dict[str, Any]]:
+        document = self._documents.get(uri)
+        if document is None:
+            return []
+
+        result = self._Modify(uri, document)
+
+        if result.edit is None:
+            return []
+
+        first_line, last_line, new_text = result.edit
+
+        return [
+            {
+                "title": self.__class__.CODE_ACTION_TITLE,
+                "kind": "source.fixAll",
+                "edit": {
+                    "changes": {
+                        uri: [
+                            {
+                                "range": _CreateLineRange(first_line, last_line),
+                                "newText": new_text,
+                            },
+                        ],
+                    },
+                },
+            },
+        ]
+
+
+# ----------------------------------------------------------------------
+# |
+# |  Private Types
+# |
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class _Result(object):
+    text: str
+    modified_text: Optional[str]
+    error: Optional[Exception]
+
+    # The lines that were modified: (first line, last line (exclusive), new text)
+    edit: Optional[tuple[int, int, str]]    = field(init=False)
+
+    # ----------------------------------------------------------------------
+    def __post_init__(self):
+        edit: Optional[tuple[int, int, str]] = None
+
+        if self.modified_text is not None and self.modified_text != self.text:
+            lines = self.text.splitlines(keepends=True)
+            modified_lines = self.modified_text.splitlines(keepends=True)
+
+            prefix = 0
+            while (
+                prefix < len(lines)
+                and prefix < len(modified_lines)
+                and lines[prefix] == modified_lines[prefix]
+            ):
+                prefix += 1
+
+            suffix = 0
+            while (
+                suffix < len(lines) - prefix
+                and suffix < len(modified_lines) - prefix
+                and lines[-suffix - 1] == modified_lines[-suffix - 1]
+            ):
+                suffix += 1
+
+            edit = (
+                prefix,
+                len(lines) - suffix,
+                "".join(modified_lines[prefix:len(modified_lines) - suffix]),
+            )
+
+        object.__setattr__(self, "edit", edit)
+
+
+# ----------------------------------------------------------------------
+class _Document(object):
+    # ----------------------------------------------------------------------
+    def __init__(
+        self,
+        text: str,
+    ):
+        self.text                           = text
+        self.is_dirty                       = True          # True if diagnostics haven't been published for the text
+        self.result: Optional[_Result]      = None
+
+    # ----------------------------------------------------------------------
+    def ApplyChange(
+        self,
+        change: dict[str, Any],
+    ) -> None:
+        range_info = change.get("range")
+
+        if range_info is None:
+            self.text = change["text"]
+        else:
+            start = _GetOffset(self.text, range_info["start"])
+            end = _GetOffset(self.text, range_info["end"])
+
+            self.text = self.text[:start] + change["text"] + self.text[end:]
+
+        self.is_dirty = True
+
+
+# ----------------------------------------------------------------------
+# |
+# |  Private Data
+# |
+# ----------------------------------------------------------------------
+_COG_LINE_REGEX                             = re.compile(r"<cog :(?P<line>\d+)>")
+
+
+# ----------------------------------------------------------------------
+# |
+# |  Private Functions
+# |
+# ----------------------------------------------------------------------
+def _ReadMessage(
+    input_stream: BinaryIO,
+) -> Optional[dict[str, Any]]:
+    content_length: Optional[int] = None
+
+    while True:
+        line = input_stream.readline()
+        if not line:
+            return None
+
+        line = line.strip()
+        if not line:
+            break
+
+        name, _, value = line.decode("ASCII").partition(":")
+
+        if name.strip().lower() == "content-length":
+            content_length = int(value.strip())
+
+    if content_length is None:
+        raise Exception("The 'Content-Length' header is missing.")
+
+    return json.loads(input_stream.read(content_length).decode("UTF-8"))
+
+
+# ----------------------------------------------------------------------
+def _WriteMessage(
+    output_stream: BinaryIO,
+    message: dict[str, Any],
+) -> None:
+    content = json.dumps(message).encode("UTF-8")
+
+    output_stream.write("Content-Length: {}\r\n\r\n".format(len(content)).encode("ASCII"))
+    output_stream.write(content)
+    output_stream.flush()
+
+
+# ----------------------------------------------------------------------
+def _CreateNotification(
+    method: str,
+    params: dict[str, Any],
+) -> dict[str, Any]:
+    return {"jsonrpc": "2.0", "method": method, "params": params}
+
+
+# ----------------------------------------------------------------------
+def _CreateLineRange(
+    first_line: int,
+    last_line: int,
+) -> dict[str, Any]:
+    return {
+        "start": {"line": first_line, "character": 0},
+        "end": {"line": last_line, "character": 0},
+    }
+
+
+# ----------------------------------------------------------------------
+def _UriToPath(
+    uri: str,
+) -> Path:
+    return Path(url2pathname(urlparse(uri).path))
+
+
+# ----------------------------------------------------------------------
+def _GetOffset(
+    text: str,
+    position: dict[str, int],
+) -> int:
+    """Converts an LSP position (whose character is in UTF-16 code units) to an offset in the text."""
+
+    offset = 0
+
+    for _ in range(position["line"]):
+        index = text.find("\n", offset)
+        if index == -1:
+            return len(text)
+
+        offset = index + 1
+
+    remaining = position["character"]
+
+    while remaining > 0 and offset < len(text) and text[offset] != "\n":
+        remaining -= 2 if ord(text[offset]) > 0xFFFF else 1
+        offset += 1
+
+    return offset
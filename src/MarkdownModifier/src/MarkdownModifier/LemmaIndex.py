@@ -0,0 +1,160 @@
+# ----------------------------------------------------------------------
+# |
+# |  LemmaIndex.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-19 14:52:40
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2023
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Contains the LemmaIndex object"""
+
+import mmap
+import threading
+
+from pathlib import Path
+from typing import Optional
+
+
+# ----------------------------------------------------------------------
+class LemmaIndex(object):
+    """\
+    Maps words to their lemmas (e.g. 'mice' -> 'mouse') using a lemma file that is memory-mapped
+    rather than loaded.
+
+    The lemma file contains lines in the form `<word>\\t<lemma>[/<lemma>...]`, sorted by the UTF-8
+    encoding of <word>; words not in the file are their own lemma. Lines that begin with '#' are
+    comments; they must be sorted as well (they are treated as words without lemmas).
+
+    Lookups are binary searches over the mapped file, so the file is never parsed in its entirety
+    and only the pages that are searched are read from disk. Results are memoized.
+
+    Reverse lookups (lemma to words) are less common; the reverse index is created by parsing the
+    entire file the first time that one is requested.
+    """
+
+    # ----------------------------------------------------------------------
+    def __init__(
+        self,
+        filename: Path,
+    ):
+        self.filename                       = filename
+
+        with filename.open("rb") as f:
+            # mmap can't map empty files
+            if filename.stat().st_size == 0:
+                self._data: Optional[mmap.mmap] = None
+            else:
+                self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self._lock                          = threading.Lock()
+        self._lemmas: dict[str, tuple[str, ...]]    = {}
+        self._words: Optional[dict[str, tuple[str, ...]]]   = None
+
+    # ----------------------------------------------------------------------
+    def __del__(self):
+        self.Close()
+
+    # ----------------------------------------------------------------------
+    def Close(self) -> None:
+        data = getattr(self, "_data", None)
+        if data is not None:
+            data.close()
+            self._data = None
+
+    # ----------------------------------------------------------------------
+    def Lemmatize(
+        self,
+        word: str,
+    ) -> tuple[str, ...]:
+        """Returns the lemmas of the (lowercase) word; the first lemma is the most common."""
+
+        lemmas = self._lemmas.get(word, None)
+        if lemmas is not None:
+            return lemmas
+
+        with self._lock:
+            value = self._Find(word.encode("UTF-8"))
+
+            if value is None:
+                lemmas = (word, )
+            else:
+                lemmas = tuple(value.decode("UTF-8").split("/"))
+
+            self._lemmas[word] = lemmas
+
+        return lemmas
+
+    # ----------------------------------------------------------------------
+    def GetWords(
+        self,
+        lemma: str,
+    ) -> tuple[str, ...]:
+        """Returns the (lowercase) words whose lemmas include the lemma, not including the lemma itself."""
+
+        with self._lock:
+            if self._words is None:
+                self._words = self._CreateReverseIndex()
+
+        return self._words.get(lemma, ())
+
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    def _Find(
+        self,
+        key: bytes,
+    ) -> Optional[bytes]:
+        data = self._data
+        if data is None:
+            return None
+
+        # `low` is always the start of a line
+        low = 0
+        high = len(data)
+
+        while low < high:
+            mid = (low + high) // 2
+
+            line_start = data.rfind(b"\n", low, mid) + 1
+            if line_start == 0:
+                line_start = low
+
+            line_end = data.find(b"\n", line_start)
+            if line_end == -1:
+                line_end = len(data)
+
+            word, _, value = data[line_start:line_end].partition(b"\t")
+
+            if word == key:
+                return value.rstrip(b"\r")
+
+            if word < key:
+                low = line_end + 1
+            else:
+                high = line_start
+
+        return None
+
+    # ----------------------------------------------------------------------
+    def _CreateReverseIndex(self) -> dict[str, tuple[str, ...]]:
+        words: dict[str, list[str]] = {}
+
+        if self._data is not None:
+            for line in self._data[:].decode("UTF-8").splitlines():
+                word, sep, value = line.partition("\t")
+                if not sep:
+                    # Comment
+                    continue
+
+                for lemma in value.split("/"):
+                    if lemma != word:
+                        words.setdefault(lemma, []).append(word)
+
+        return {lemma: tuple(these_words) for lemma, these_words in words.items()}
@@ -17,6 +17,7 @@
 
 import re
 
+from dataclasses import dataclass
 from enum import auto, Enum
 from io import StringIO
 from pathlib import Path
@@ -24,6 +25,9 @@ from typing import Any, Callable, Match, Optional
 
 from cogapp.cogapp import Cog
 
+from .BlockCache import BlockCache
+from .BlockWorker import BlockWorker
+from .MarkdownSpans import EnumerateSpans, SpanType, VisitedSpan
 from .Plugin import Plugin
 
 
@@ -46,10 +50,19 @@ def Modify(
     *,
     include_plugin_names: Optional[set[str]]=None,
     exclude_plugin_names: Optional[set[str]]=None,
+    active_plugin_names: Optional[set[str]]=None,   # Populated with the names of plugins that executed blocks or modified the content
+    dependencies: Optional[set[Path]]=None,         # Populated with the other files whose content was used when modifying the content
+    block_worker: Optional[BlockWorker]=None,       # Executes blocks in a supervised worker process (to enforce block limits) if provided
+    block_cache: Optional[BlockCache]=None,         # Output of blocks that only invoke pure plugins is cached and reused if provided
 ) -> str:
     include_plugin_names = include_plugin_names or set()
     exclude_plugin_names = exclude_plugin_names or set()
 
+    if active_plugin_names is None:
+        active_plugin_names = set()
+    if dependencies is None:
+        dependencies = set()
+
     # ----------------------------------------------------------------------
     def IsExcludedPlugin(
         plugin: Plugin,
@@ -69,10 +82,15 @@ def Modify(
             continue
 
         try:
-            content = plugin.Preprocess(filename, content)
+            new_content = plugin.Preprocess(filename, content)
         except Exception as ex:
             raise Exception("{}: {}".format(plugin.name, ex)) from ex
 
+        if new_content != content:
+            active_plugin_names.add(plugin.name)
+
+        content = new_content
+
     # Transform
     on_status_update(Status.Transforming, "Transforming...")
 
@@ -81,40 +99,195 @@ def Modify(
     cog.options.sBeginSpec = "[[["
     cog.options.sEndSpec = "]]]"
 
+    # The names of the plugins invoked by each block, keyed by the line that begins the block
+    block_plugin_names: dict[int, set[str]] = {}
+
+    # The output of the plugins invoked by each block and the state of the pure plugins invoked by
+    # the file after each block, keyed by the line that begins the block
+    block_plugin_outputs: dict[int, list[str]] = {}
+    block_states: dict[int, dict[str, Any]] = {}
+    states: dict[str, Any] = {}
+
     # ----------------------------------------------------------------------
-    def CogWrapper(
+    def ExecutePlugin(
+        block_line: int,
         plugin: Plugin,
         *args,
         **kwargs,
-    ) -> None:
+    ) -> str:
+        block_plugin_names.setdefault(block_line, set()).add(plugin.name)
+
         if IsExcludedPlugin(plugin):
-            result = ""
-        else:
-            try:
-                result = plugin.Execute(filename, *args, **kwargs)
-            except Exception as ex:
-                raise Exception("{}: {}".format(plugin.name, ex)) from ex
+            return ""
+
+        try:
+            result = plugin.Execute(filename, *args, **kwargs)
+        except Exception as ex:
+            raise Exception("{}: {}".format(plugin.name, ex)) from ex
+
+        active_plugin_names.add(plugin.name)
+
+        if plugin.name in pure_plugin_versions:
+            block_plugin_outputs.setdefault(block_line, []).append(result.rstrip() + "\n")
+
+            state = plugin.GetExecuteState(filename)
+            if state is not None:
+                states[plugin.name] = state
+
+            block_states[block_line] = dict(states)
 
-        cog.cogmodule.outl(result.rstrip())  # type: ignore  # pylint: disable=no-member
+        return result
 
     # ----------------------------------------------------------------------
 
-    # Create the globals made available to the plugin
-    globals: dict[str, Any] = {}
+    # Blocks at the end of the content whose output is cached are not executed (blocks that precede
+    # them are executed, as they may establish state used by blocks that follow them).
+    blocks: Optional[list[_Block]] = None
+    block_keys: list[str] = []
+    pure_plugin_versions: dict[str, str] = {}
+    cached_entries: list[BlockCache.Entry] = []
+    content_lines: list[str] = []
+    split_index = 0
 
-    for plugin in all_plugins:
-        globals[plugin.name] = lambda *args, plugin=plugin, **kwargs: CogWrapper(plugin, *args, **kwargs)
-        globals["{}Type".format(plugin.name)] = plugin.__class__
+    if block_cache is not None:
+        # Lines are split in the same way that cog splits them
+        content_lines = StringIO(content).readlines()
 
-    output = StringIO()
+        blocks = _GetBlocks(cog, content_lines)
 
-    cog.processFile(
-        StringIO(content),
-        output,
-        globals=globals,
-    )
+        if blocks is not None:
+            block_keys = BlockCache.CreateKeys(
+                "".join(content_lines[block.begin_index:block.output_begin_index])
+                for block in blocks
+            )
+
+            for plugin in all_plugins:
+                if IsExcludedPlugin(plugin):
+                    continue
+
+                version = plugin.GetPureExecuteVersion()
+                if version is not None:
+                    pure_plugin_versions[plugin.name] = version
+
+            # Output is only cached for blocks that invoke pure plugins, so there is nothing to look
+            # up (and no misses to record) when there aren't any.
+            while pure_plugin_versions and len(cached_entries) < len(blocks):
+                entry = block_cache.Get(block_keys[len(blocks) - len(cached_entries) - 1], pure_plugin_versions)
+                if entry is None:
+                    break
+
+                cached_entries.insert(0, entry)
+
+            num_executed_blocks = len(blocks) - len(cached_entries)
+
+            split_index = blocks[num_executed_blocks - 1].end_index + 1 if num_executed_blocks else 0
+
+            content = "".join(content_lines[:split_index])
+
+    if block_worker is not None:
+        plugins_by_name = {plugin.name: plugin for plugin in all_plugins}
+
+        content = block_worker.Transform(
+            filename,
+            content,
+            lambda block_line, plugin_name, *args, **kwargs: ExecutePlugin(
+                block_line,
+                plugins_by_name[plugin_name],
+                *args,
+                **kwargs,
+            ),
+        )
+    else:
+        # ----------------------------------------------------------------------
+        def CogWrapper(
+            plugin: Plugin,
+            *args,
+            **kwargs,
+        ) -> None:
+            cog.cogmodule.outl(  # type: ignore  # pylint: disable=no-member
+                ExecutePlugin(
+                    cog.cogmodule.firstLineNum,  # type: ignore  # pylint: disable=no-member
+                    plugin,
+                    *args,
+                    **kwargs,
+                ).rstrip(),
+            )
+
+        # ----------------------------------------------------------------------
+
+        # Create the globals made available to the plugin
+        globals: dict[str, Any] = {}
+
+        for plugin in all_plugins:
+            globals[plugin.name] = lambda *args, plugin=plugin, **kwargs: CogWrapper(plugin, *args, **kwargs)
+            globals["{}Type".format(plugin.name)] = plugin.__class__
+
+        output = StringIO()
+
+        cog.processFile(
+            StringIO(content),
+            output,
+            globals=globals,
+        )
+
+        content = output.getvalue()
+
+    if block_cache is not None and blocks is not None:
+        output_lines = StringIO(content).readlines()
+        output_blocks = _GetBlocks(cog, output_lines)
+
+        assert output_blocks is not None
+        assert len(output_blocks) + len(cached_entries) == len(blocks)
+
+        # Cache the output of the executed blocks that (along with all of the blocks that precede
+        # them) only invoked pure plugins and whose output consists entirely of the output of those
+        # plugins (rather than output written by the block itself).
+        for block_index, output_block in enumerate(output_blocks):
+            block_line = blocks[block_index].begin_index + 1
+
+            invoked_plugin_names = block_plugin_names.get(block_line)
+            if not invoked_plugin_names or any(plugin_name not in pure_plugin_versions for plugin_name in invoked_plugin_names):
+                break
+
+            output = "".join(output_lines[output_block.output_begin_index:output_block.end_index])
+            if output != "".join(block_plugin_outputs[block_line]):
+                break
+
+            # The state restored when the output is reused may have been recorded by plugins invoked
+            # by preceding blocks, so those plugins must be unchanged as well.
+            block_state = block_states[block_line]
+
+            block_cache.Set(
+                block_keys[block_index],
+                output,
+                {
+                    plugin_name: pure_plugin_versions[plugin_name]
+                    for plugin_name in invoked_plugin_names.union(block_state)
+                },
+                block_state,
+            )
+
+        # Restore the blocks that weren't executed, using their cached output
+        line_index = split_index
+
+        for block, entry in zip(blocks[len(output_blocks):], cached_entries):
+            output_lines += content_lines[line_index:block.output_begin_index]
+            output_lines.append(entry.output)
+
+            line_index = block.end_index
+
+            active_plugin_names.update(entry.plugin_versions)
+
+        output_lines += content_lines[line_index:]
+
+        content = "".join(output_lines)
+
+        # Restore the state that the plugins would have recorded had the cached blocks been executed
+        if cached_entries:
+            plugins_by_name = {plugin.name: plugin for plugin in all_plugins}
 
-    content = output.getvalue()
+            for plugin_name, state in cached_entries[-1].states.items():
+                plugins_by_name[plugin_name].SetExecuteState(filename, state)
 
     # Postprocess
     on_status_update(Status.Postprocessing, "Postprocessing...")
@@ -125,15 +298,71 @@ def Modify(
     content = _ScrubCogSpecs(cog, content, scrubbed_placeholders)
     content = _ScrubUrls(content, scrubbed_placeholders)
 
+    # Visit spans
+    visiting_plugins: list[tuple[Plugin, set[SpanType]]] = []
+
+    for plugin in all_plugins:
+        if IsExcludedPlugin(plugin):
+            continue
+
+        try:
+            span_types = plugin.BeginVisit(filename, content)
+        except Exception as ex:
+            raise Exception("{}: {}".format(plugin.name, ex)) from ex
+
+        if span_types:
+            visiting_plugins.append((plugin, span_types))
+
+    if visiting_plugins:
+        # The content is split into spans once, rather than by each plugin, and edited spans are
+        # joined once, rather than creating a copy of the content for each plugin.
+        spans = list(EnumerateSpans(content))
+        span_texts = [content[span.start:span.end] for span in spans]
+
+        is_modified = False
+
+        for plugin, span_types in visiting_plugins:
+            visited_indexes: set[int] = set()
+            visited_spans: list[VisitedSpan] = []
+
+            for index, span in enumerate(spans):
+                if span.type in span_types:
+                    visited_indexes.add(index)
+                    visited_spans.append(VisitedSpan(index, span.type, span_texts[index]))
+
+            try:
+                edits = plugin.VisitSpans(filename, visited_spans)
+
+                for index, text in edits.items():
+                    if index not in visited_indexes:
+                        raise Exception("The span '{}' was not visited.".format(index))
+
+                    if text != span_texts[index]:
+                        span_texts[index] = text
+
+                        active_plugin_names.add(plugin.name)
+                        is_modified = True
+
+            except Exception as ex:
+                raise Exception("{}: {}".format(plugin.name, ex)) from ex
+
+        if is_modified:
+            content = "".join(span_texts)
+
     for plugin in all_plugins:
         if IsExcludedPlugin(plugin):
             continue
 
         try:
-            content = plugin.Postprocess(filename, content)
+            new_content = plugin.Postprocess(filename, content)
         except Exception as ex:
             raise Exception("{}: {}".format(plugin.name, ex)) from ex
 
+        if new_content != content:
+            active_plugin_names.add(plugin.name)
+
+        content = new_content
+
     if scrubbed_placeholders:
         content = re.sub(
             "|".join(re.escape(key) for key in scrubbed_placeholders.keys()),
@@ -153,11 +382,62 @@ def Modify(
         except Exception as ex:
             raise Exception("{}: {}".format(plugin.name, ex)) from ex
 
+        dependencies.update(plugin.GetDependencies(filename))
+
     return content
 
 
 # ----------------------------------------------------------------------
 # ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class _Block(object):
+    """Line indexes of a `[[[ ]]]` block"""
+
+    begin_index: int                        # The line that begins the block
+    output_begin_index: int                 # The first line of output (the line after the end of the source)
+    end_index: int                          # The line that ends the output
+
+
+# ----------------------------------------------------------------------
+def _GetBlocks(
+    cog: Cog,
+    lines: list[str],
+) -> Optional[list[_Block]]:
+    """Returns None if the blocks are malformed (cog will report the error when the content is transformed)."""
+
+    blocks: list[_Block] = []
+
+    line_index = 0
+
+    while line_index < len(lines):
+        if not cog.isBeginSpecLine(lines[line_index]):
+            line_index += 1
+            continue
+
+        begin_index = line_index
+
+        while line_index < len(lines) and not cog.isEndSpecLine(lines[line_index]):
+            line_index += 1
+
+        line_index += 1
+        output_begin_index = line_index
+
+        while line_index < len(lines) and not cog.isEndOutputLine(lines[line_index]):
+            if cog.isBeginSpecLine(lines[line_index]):
+                return None
+
+            line_index += 1
+
+        if line_index == len(lines):
+            return None
+
+        blocks.append(_Block(begin_index, output_begin_index, line_index))
+        line_index += 1
+
+    return blocks
+
+
 # ----------------------------------------------------------------------
 def _ScrubCogSpecs(
     cog: Cog,
@@ -0,0 +1,135 @@
+# ----------------------------------------------------------------------
+# |
+# |  MarkdownSpans.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-19 15:58:44
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2023
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Splits Markdown content into prose and the constructs that plugins should not modify"""
+
+import re
+
+from dataclasses import dataclass
+from enum import auto, Enum
+from typing import Iterator
+
+
+# ----------------------------------------------------------------------
+# |
+# |  Public Types
+# |
+# ----------------------------------------------------------------------
+class SpanType(Enum):
+    """The type of content within a span."""
+
+    Prose                                   = auto()    # Text that may be modified
+    Code                                    = auto()    # Fenced and indented code blocks, code spans, and <pre>/<code>/<script>/<style> elements
+    Heading                                 = auto()    # ATX ('# Heading') and setext ('Heading\n===') headings
+    Link                                    = auto()    # Markdown links, images, and <a> elements (including their text)
+    Markup                                  = auto()    # HTML tags (including their attributes), comments, entities, and link reference definitions
+
+
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class Span(object):
+    """A range of content; spans are contiguous and cover all of the content."""
+
+    type: SpanType
+    start: int
+    end: int
+
+
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class VisitedSpan(object):
+    """A span provided to a plugin that visits spans (see `Plugin.VisitSpans`)."""
+
+    index: int                              # Identifies the span when returning edits
+    type: SpanType
+    text: str                               # The text of the span, including edits made by plugins that visited it earlier
+
+
+# ----------------------------------------------------------------------
+# |
+# |  Public Functions
+# |
+# ----------------------------------------------------------------------
+def EnumerateSpans(
+    content: str,
+) -> Iterator[Span]:
+    """\
+    Yields the spans in the content.
+
+    This is a tokenizer rather than a Markdown parser: it recognizes the constructs that contain text
+    that should not be modified in a single pass over the content, which is much less expensive than
+    searching for terms (or anything else) within those constructs and then rejecting the matches.
+    """
+
+    prev_end = 0
+
+    for match in _SPAN_REGEX.finditer(content):
+        start = match.start()
+
+        if start != prev_end:
+            yield Span(SpanType.Prose, prev_end, start)
+
+        assert match.lastgroup is not None
+        yield Span(_SPAN_TYPES[match.lastgroup], start, match.end())
+
+        prev_end = match.end()
+
+    if prev_end != len(content):
+        yield Span(SpanType.Prose, prev_end, len(content))
+
+
+# ----------------------------------------------------------------------
+# |
+# |  Private Data
+# |
+# ----------------------------------------------------------------------
+# The order of the alternatives is significant, as the first alternative that matches at a position
+# wins. The name of the outermost group in each alternative maps to its SpanType.
+#
+# As in CommonMark, an indented code block can't interrupt a paragraph (so it must begin the content
+# or follow a blank line), a code span can't contain a blank line, and a run of backticks that isn't
+# closed by a run of the same length is text.
+_SPAN_REGEX                                 = re.compile(
+    r"""(?#
+    HTML comment                            )(?P<comment><!--.*?-->)|(?#
+    Indented code block                     )(?P<indented_code>(?:\A|(?<=\n\n))(?:[ ]{4}|[ ]{0,3}\t)[ \t]*\S[^\n]*(?:\n(?:[ \t]*\n)*(?:[ ]{4}|[ ]{0,3}\t)[ \t]*\S[^\n]*)*)|(?#
+    Fenced code block                       )(?P<fence>^[ \t]*(?P<fence_chars>(?P<fence_char>[`~])(?P=fence_char){2,})[^\n]*(?:\n(?:[^\n]*\n)*?[ \t]*(?P=fence_chars)(?P=fence_char)*[ \t]*$|.*))|(?#
+    HTML element with code                  )(?P<html_code><(?P<html_code_tag>pre|code|script|style)\b[^>]*>.*?</(?P=html_code_tag)\s*>)|(?#
+    ATX heading                             )(?P<atx_heading>^[ ]{0,3}\#{1,6}(?:[ \t][^\n]*)?$)|(?#
+    Setext heading                          )(?P<setext_heading>^[ ]{0,3}[^\s<>|\-=*+#][^\n]*\n[ ]{0,3}(?:=+|-+)[ \t]*$)|(?#
+    Link reference definition               )(?P<link_reference>^[ ]{0,3}\[[^\]\n]+\]:[^\n]*$)|(?#
+    Code span                               )(?P<code_span>(?<!`)(?P<backticks>`+)(?!`)(?:[^\n]|\n(?![ \t]*$))*?(?<!`)(?P=backticks)(?!`))|(?#
+    Markdown link or image                  )(?P<markdown_link>!?\[(?:[^\[\]\n]|\[[^\[\]\n]*\])*\](?:\((?:[^()\n]|\([^()\n]*\))*\)|\[[^\]\n]*\]))|(?#
+    HTML anchor                             )(?P<html_anchor><a\b[^>]*>.*?</a\s*>)|(?#
+    HTML tag                                )(?P<html_tag></?[A-Za-z][^<>]*>|<![^<>]*>|<\?.*?\?>)|(?#
+    HTML entity                             )(?P<html_entity>&(?:[A-Za-z][A-Za-z0-9]*|\#[0-9]+|\#[xX][0-9A-Fa-f]+);)(?#
+    )""",
+    re.DOTALL | re.MULTILINE | re.IGNORECASE,
+)
+
+_SPAN_TYPES: dict[str, SpanType]            = {
+    "comment": SpanType.Markup,
+    "indented_code": SpanType.Code,
+    "fence": SpanType.Code,
+    "html_code": SpanType.Code,
+    "atx_heading": SpanType.Heading,
+    "setext_heading": SpanType.Heading,
+    "link_reference": SpanType.Markup,
+    "code_span": SpanType.Code,
+    "markdown_link": SpanType.Link,
+    "html_anchor": SpanType.Link,
+    "html_tag": SpanType.Markup,
+    "html_entity": SpanType.Markup,
+}
@@ -0,0 +1,117 @@
+# ----------------------------------------------------------------------
+# |
+# |  Plugin_PerformanceTest.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-19 09:30:12
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2023
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Performance tests for Plugin.py."""
+
+import sys
+import time
+
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+from Common_Foundation.ContextlibEx import ExitStack
+from Common_Foundation import PathEx
+
+
+# ----------------------------------------------------------------------
+sys.path.insert(0, str(PathEx.EnsureDir(Path(__file__).parent.parent.parent)))
+with ExitStack(lambda: sys.path.pop(0)):
+    from MarkdownModifier.Plugin import Plugin
+
+
+# ----------------------------------------------------------------------
+_NUM_HEADINGS                               = 100000
+
+
+# ----------------------------------------------------------------------
+def test_CreateAnchorName(_headings):
+    # ----------------------------------------------------------------------
+    def Legacy(
+        text: str,
+    ) -> str:
+        text = text.lower()
+
+        for source, dest in [
+            (" ", "-"),
+            (".", ""),
+        ]:
+            text = text.replace(source, dest)
+
+        return text
+
+    # ----------------------------------------------------------------------
+
+    legacy_results, legacy_seconds = _Time(Legacy, _headings)
+    default_results, default_seconds = _Time(Plugin.CreateAnchorName, _headings)
+
+    assert default_results == legacy_results
+
+    github_cold_results, github_cold_seconds = _Time(
+        lambda text: Plugin.CreateAnchorName(text, Plugin.AnchorStyle.GitHub),
+        _headings,
+    )
+
+    github_warm_results, github_warm_seconds = _Time(
+        lambda text: Plugin.CreateAnchorName(text, Plugin.AnchorStyle.GitHub),
+        _headings,
+    )
+
+    assert github_warm_results == github_cold_results
+
+    sys.stdout.write(
+        "\n{} headings:\n    Legacy:         {:.3f}s\n    Default:        {:.3f}s\n    GitHub (cold):  {:.3f}s\n    GitHub (warm):  {:.3f}s\n".format(
+            len(_headings),
+            legacy_seconds,
+            default_seconds,
+            github_cold_seconds,
+            github_warm_seconds,
+        ),
+    )
+
+
+# ----------------------------------------------------------------------
+def test_AnchorNames(_headings):
+    anchor_names = Plugin.AnchorNames(Plugin.AnchorStyle.GitHub)
+
+    results, seconds = _Time(anchor_names.Create, _headings)
+
+    assert len(set(results)) == len(results)
+
+    sys.stdout.write("\n{} unique GitHub anchors: {:.3f}s\n".format(len(results), seconds))
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _Time(
+    func: Callable[[str], str],
+    headings: list[str],
+) -> tuple[list[str], float]:
+    start = time.perf_counter()
+    results = [func(heading) for heading in headings]
+
+    return results, time.perf_counter() - start
+
+
+# ----------------------------------------------------------------------
+@pytest.fixture
+def _headings() -> list[str]:
+    # Mimic a corpus where headings are repeated across documents ("Overview", "Example", etc.)
+    return [
+        "Section {}.{}: Overview of Item {}".format(index % 50, index % 7, index % 5000)
+        for index in range(_NUM_HEADINGS)
+    ]
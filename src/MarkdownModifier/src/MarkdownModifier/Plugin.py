@@ -15,20 +15,72 @@
 # ----------------------------------------------------------------------
 """Contains the Plugin object"""
 
+import unicodedata
 import uuid
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from enum import auto, Enum
+from functools import lru_cache
 from pathlib import Path
+from typing import Any, Optional
 
 from Common_Foundation.Types import extensionmethod
 
+from .MarkdownSpans import SpanType, VisitedSpan
+
 
 # ----------------------------------------------------------------------
 @dataclass(frozen=True)
 class Plugin(ABC):
     """Abstract base class for functionality implemented by a dynamically loaded plugin."""
 
+    # ----------------------------------------------------------------------
+    # |
+    # |  Public Types
+    # |
+    # ----------------------------------------------------------------------
+    class AnchorStyle(Enum):
+        """Algorithms used to convert text into anchor names."""
+
+        Default                             = auto()    # Lowercase, spaces converted to '-', '.' removed
+        GitHub                              = auto()    # Matches the anchors that GitHub generates for headings
+
+    # ----------------------------------------------------------------------
+    class AnchorNames(object):
+        """Creates anchor names that are unique within a document (when using AnchorStyle.GitHub)."""
+
+        # ----------------------------------------------------------------------
+        def __init__(
+            self,
+            style: "Plugin.AnchorStyle",
+        ):
+            self.style                      = style
+
+            self._occurrences: dict[str, int]           = {}
+
+        # ----------------------------------------------------------------------
+        def Create(
+            self,
+            text: str,
+        ) -> str:
+            anchor = Plugin.CreateAnchorName(text, self.style)
+
+            if self.style is not _GITHUB_ANCHOR_STYLE:
+                return anchor
+
+            # This is the algorithm used by github-slugger: the first occurrence is unchanged and
+            # subsequent occurrences are suffixed with '-1', '-2', etc.
+            result = anchor
+
+            while result in self._occurrences:
+                self._occurrences[anchor] += 1
+                result = "{}-{}".format(anchor, self._occurrences[anchor])
+
+            self._occurrences[result] = 0
+
+            return result
+
     # ----------------------------------------------------------------------
     # |
     # |  Data
@@ -52,18 +104,36 @@ class Plugin(ABC):
     @staticmethod
     def CreateAnchorName(
         text: str,
+        style: "Plugin.AnchorStyle"=AnchorStyle.Default,
     ) -> str:
         """Creates a valid anchor name given the provided text."""
 
-        text = text.lower()
+        # Note that the comparisons are against module-level values, as attribute lookups on the
+        # Enum class are measurably slow when invoked for every heading in large documents.
+        if style is _DEFAULT_ANCHOR_STYLE:
+            # Chained calls to `str.replace` are faster than both `str.translate` and a memoized
+            # lookup for this small set of substitutions.
+            return text.lower().replace(" ", "-").replace(".", "")
 
-        for source, dest in [
-            (" ", "-"),
-            (".", ""),
-        ]:
-            text = text.replace(source, dest)
+        if style is _GITHUB_ANCHOR_STYLE:
+            return _CreateGitHubAnchorName(text)
 
-        return text
+        assert False, style  # pragma: no cover
+
+    # ----------------------------------------------------------------------
+    @extensionmethod
+    def IsPrerequisite(
+        self,
+        filename: Path,                     # pylint: disable=unused-argument
+        content: str,                       # pylint: disable=unused-argument
+    ) -> bool:
+        """\
+        Returns True if the file must be processed before other files (for example, because it defines
+        content used when processing other files)
+        """
+
+        # A plugin does not require files to be processed in a specific order by default
+        return False
 
     # ----------------------------------------------------------------------
     @extensionmethod
@@ -88,6 +158,83 @@ class Plugin(ABC):
         """Transforms the content; this functionality is invoked via cog"""
         raise Exception("Abstract method")  # pragma: no cover
 
+    # ----------------------------------------------------------------------
+    @extensionmethod
+    def GetPureExecuteVersion(self) -> Optional[str]:
+        """\
+        Returns a value that identifies the implementation of `Execute` if it is pure (its output
+        depends only on its arguments, and any state that it records is available via
+        `GetExecuteState`); the output of blocks that only invoke pure plugins is cached and reused
+        for identical blocks.
+
+        A block is only cached when its output consists entirely of the output of the plugins that
+        it invoked, and its source is assumed to produce the same arguments each time that it is
+        executed; blocks whose arguments depend on anything other than their source (for example,
+        the current date or the content of other files) must not invoke pure plugins.
+        """
+
+        # Execute is not pure by default
+        return None
+
+    # ----------------------------------------------------------------------
+    @extensionmethod
+    def GetExecuteState(
+        self,
+        filename: Path,                     # pylint: disable=unused-argument
+    ) -> Optional[Any]:
+        """\
+        Returns JSON-serializable data that describes the state recorded by `Execute` for the file
+        (for example, data used during postprocessing); this state is cached along with the output
+        of blocks that invoke pure plugins and restored via `SetExecuteState` when that output is
+        reused
+        """
+
+        # A plugin does not record state by default
+        return None
+
+    # ----------------------------------------------------------------------
+    @extensionmethod
+    def SetExecuteState(
+        self,
+        filename: Path,                     # pylint: disable=unused-argument
+        state: Any,                         # pylint: disable=unused-argument
+    ) -> None:
+        """Restores the state returned by `GetExecuteState` when cached output is used rather than invoking `Execute`"""
+
+        # A plugin does not record state by default
+        return None
+
+    # ----------------------------------------------------------------------
+    @extensionmethod
+    def BeginVisit(
+        self,
+        filename: Path,                     # pylint: disable=unused-argument
+        content: str,                       # pylint: disable=unused-argument
+    ) -> set[SpanType]:
+        """\
+        Returns the types of spans that the plugin will visit (via `VisitSpans`) after cog has run;
+        the content is split into spans once and the edits of all visiting plugins are applied in a
+        single pass, before `Postprocess` is invoked
+        """
+
+        # A plugin does not visit spans by default
+        return set()
+
+    # ----------------------------------------------------------------------
+    @extensionmethod
+    def VisitSpans(
+        self,
+        filename: Path,                     # pylint: disable=unused-argument
+        spans: list[VisitedSpan],           # pylint: disable=unused-argument
+    ) -> dict[int, str]:
+        """\
+        Returns the new text of spans (keyed by `VisitedSpan.index`) for the spans of the types
+        returned by `BeginVisit`
+        """
+
+        # A plugin does not visit spans by default
+        return {}
+
     # ----------------------------------------------------------------------
     @extensionmethod
     def Postprocess(
@@ -111,3 +258,103 @@ class Plugin(ABC):
 
         # A plugin does not do anything during finalization by default
         return None
+
+    # ----------------------------------------------------------------------
+    @extensionmethod
+    def GetDependencies(
+        self,
+        filename: Path,                     # pylint: disable=unused-argument
+    ) -> set[Path]:
+        """\
+        Returns the other files whose content was used when modifying the file; invoked after the
+        file has been finalized
+        """
+
+        # A plugin does not use the content of other files by default
+        return set()
+
+    # ----------------------------------------------------------------------
+    @extensionmethod
+    def LoadCache(
+        self,
+        cache_dir: Path,                    # pylint: disable=unused-argument
+    ) -> None:
+        """Loads data persisted by a previous run (via `SaveCache`) from the cache directory"""
+
+        # A plugin does not cache data across runs by default
+        return None
+
+    # ----------------------------------------------------------------------
+    @extensionmethod
+    def SaveCache(
+        self,
+        cache_dir: Path,                    # pylint: disable=unused-argument
+    ) -> None:
+        """Persists data to the cache directory so that it can be used by subsequent runs"""
+
+        # A plugin does not cache data across runs by default
+        return None
+
+    # ----------------------------------------------------------------------
+    @extensionmethod
+    def GetStatistics(self) -> dict[str, Any]:
+        """Returns information about the work performed by the plugin during this run"""
+
+        # A plugin does not collect statistics by default
+        return {}
+
+
+# ----------------------------------------------------------------------
+# |
+# |  Private Types
+# |
+# ----------------------------------------------------------------------
+class _GitHubTranslationTable(dict):
+    """\
+    Translation table (populated on demand) that removes punctuation and symbols, keeping '-' and '_',
+    and converts spaces to '-'.
+    """
+
+    # ----------------------------------------------------------------------
+    def __missing__(
+        self,
+        key: int,
+    ) -> Optional[str]:
+        char = chr(key)
+
+        if char == " ":
+            value = "-"
+        elif char in "-_":
+            value = char
+        elif unicodedata.category(char)[0] in "PSC":
+            value = None
+        else:
+            value = char
+
+        self[key] = value
+        return value
+
+
+# ----------------------------------------------------------------------
+# |
+# |  Private Data
+# |
+# ----------------------------------------------------------------------
+_DEFAULT_ANCHOR_STYLE                       = Plugin.AnchorStyle.Default
+_GITHUB_ANCHOR_STYLE                        = Plugin.AnchorStyle.GitHub
+
+_GITHUB_ANCHOR_NAME_CACHE_SIZE              = 65536
+
+_GITHUB_TRANSLATION_TABLE                   = _GitHubTranslationTable()
+
+
+# ----------------------------------------------------------------------
+# |
+# |  Private Functions
+# |
+# ----------------------------------------------------------------------
+@lru_cache(maxsize=_GITHUB_ANCHOR_NAME_CACHE_SIZE)
+def _CreateGitHubAnchorName(
+    text: str,
+) -> str:
+    return text.lower().translate(_GITHUB_TRANSLATION_TABLE)
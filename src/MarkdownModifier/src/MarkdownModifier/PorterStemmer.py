@@ -0,0 +1,368 @@
+# ----------------------------------------------------------------------
+# |
+# |  PorterStemmer.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-19 13:12:07
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2023
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Contains the PorterStemmer object"""
+
+from typing import Callable, Optional
+
+
+# ----------------------------------------------------------------------
+class PorterStemmer(object):
+    """\
+    Self-contained implementation of the Porter stemming algorithm that produces the same output as
+    `nltk.stem.porter.PorterStemmer` (in its default `NLTK_EXTENSIONS` mode) without the cost of
+    importing nltk.
+
+    Reference: Porter, M. "An algorithm for suffix stripping." Program 14.3 (1980): 130-137.
+    """
+
+    # Persisted stems are only valid when generated by the same algorithm; increment this value
+    # when making changes that alter the output of `Stem`.
+    VERSION                                 = "MarkdownModifier.PorterStemmer-1"
+
+    # ----------------------------------------------------------------------
+    def Stem(
+        self,
+        word: str,
+    ) -> str:
+        stem = word.lower()
+
+        # Note that (like nltk) the original word is used for these checks
+        if word in _IRREGULAR_FORMS:
+            return _IRREGULAR_FORMS[word]
+
+        if len(word) <= 2:
+            return stem
+
+        stem = _Step1a(stem)
+        stem = _Step1b(stem)
+        stem = _Step1c(stem)
+        stem = _Step2(stem)
+        stem = _Step3(stem)
+        stem = _Step4(stem)
+        stem = _Step5a(stem)
+        stem = _Step5b(stem)
+
+        return stem
+
+
+# ----------------------------------------------------------------------
+# |
+# |  Private Types
+# |
+# ----------------------------------------------------------------------
+# (suffix, replacement, condition applied to the word without the suffix)
+_Rule                                       = tuple[str, str, Optional[Callable[[str], bool]]]
+
+
+# ----------------------------------------------------------------------
+# |
+# |  Private Data
+# |
+# ----------------------------------------------------------------------
+_VOWELS                                     = frozenset("aeiou")
+
+_IRREGULAR_FORMS: dict[str, str]            = {
+    "sky": "sky",
+    "skies": "sky",
+    "dying": "die",
+    "lying": "lie",
+    "tying": "tie",
+    "news": "news",
+    "innings": "inning",
+    "inning": "inning",
+    "outings": "outing",
+    "outing": "outing",
+    "cannings": "canning",
+    "canning": "canning",
+    "howe": "howe",
+    "proceed": "proceed",
+    "exceed": "exceed",
+    "succeed": "succeed",
+}
+
+
+# ----------------------------------------------------------------------
+# |
+# |  Private Functions
+# |
+# ----------------------------------------------------------------------
+def _IsConsonant(
+    word: str,
+    index: int,
+) -> bool:
+    char = word[index]
+
+    if char in _VOWELS:
+        return False
+
+    # 'y' is a consonant when it is the first letter or is preceded by a vowel
+    if char == "y" and index != 0:
+        return not _IsConsonant(word, index - 1)
+
+    return True
+
+
+# ----------------------------------------------------------------------
+def _Measure(
+    stem: str,
+) -> int:
+    """Returns the number of vowel-consonant sequences in the stem ('m' in the paper)."""
+
+    measure = 0
+    prev_is_vowel = False
+
+    for index in range(len(stem)):
+        is_consonant = _IsConsonant(stem, index)
+
+        if is_consonant and prev_is_vowel:
+            measure += 1
+
+        prev_is_vowel = not is_consonant
+
+    return measure
+
+
+# ----------------------------------------------------------------------
+def _HasPositiveMeasure(
+    stem: str,
+) -> bool:
+    return _Measure(stem) > 0
+
+
+# ----------------------------------------------------------------------
+def _HasMeasureGreaterThanOne(
+    stem: str,
+) -> bool:
+    return _Measure(stem) > 1
+
+
+# ----------------------------------------------------------------------
+def _ContainsVowel(
+    stem: str,
+) -> bool:
+    return any(not _IsConsonant(stem, index) for index in range(len(stem)))
+
+
+# ----------------------------------------------------------------------
+def _EndsWithDoubleConsonant(
+    word: str,
+) -> bool:
+    return len(word) >= 2 and word[-1] == word[-2] and _IsConsonant(word, len(word) - 1)
+
+
+# ----------------------------------------------------------------------
+def _EndsWithCvc(
+    word: str,
+) -> bool:
+    """Condition '*o' in the paper (with the nltk extension for two letter words)."""
+
+    word_len = len(word)
+
+    if word_len >= 3:
+        return (
+            _IsConsonant(word, word_len - 3)
+            and not _IsConsonant(word, word_len - 2)
+            and _IsConsonant(word, word_len - 1)
+            and word[-1] not in "wxy"
+        )
+
+    return word_len == 2 and not _IsConsonant(word, 0) and _IsConsonant(word, 1)
+
+
+# ----------------------------------------------------------------------
+def _ApplyRules(
+    word: str,
+    rules: tuple[_Rule, ...],
+) -> str:
+    """Applies the first rule whose suffix matches; the word is unchanged if its condition fails."""
+
+    for suffix, replacement, condition in rules:
+        if word.endswith(suffix):
+            stem = word[:len(word) - len(suffix)]
+
+            if condition is None or condition(stem):
+                return stem + replacement
+
+            return word
+
+    return word
+
+
+# ----------------------------------------------------------------------
+def _Step1a(
+    word: str,
+) -> str:
+    if len(word) == 4 and word.endswith("ies"):
+        return word[:-3] + "ie"
+
+    return _ApplyRules(word, _STEP_1A_RULES)
+
+
+# ----------------------------------------------------------------------
+def _Step1b(
+    word: str,
+) -> str:
+    if word.endswith("ied"):
+        return word[:-3] + ("ie" if len(word) == 4 else "i")
+
+    if word.endswith("eed"):
+        stem = word[:-3]
+        return stem + "ee" if _HasPositiveMeasure(stem) else word
+
+    for suffix in ["ed", "ing"]:
+        if word.endswith(suffix):
+            stem = word[:-len(suffix)]
+            if _ContainsVowel(stem):
+                break
+    else:
+        return word
+
+    if stem.endswith("at") or stem.endswith("bl") or stem.endswith("iz"):
+        return stem + "e"
+
+    if _EndsWithDoubleConsonant(stem):
+        return stem if stem[-1] in "lsz" else stem[:-1]
+
+    if _Measure(stem) == 1 and _EndsWithCvc(stem):
+        return stem + "e"
+
+    return stem
+
+
+# ----------------------------------------------------------------------
+def _Step1c(
+    word: str,
+) -> str:
+    # nltk extension: 'y' is only replaced when preceded by a consonant that isn't the entire stem
+    if word.endswith("y") and len(word) > 2 and _IsConsonant(word, len(word) - 2):
+        return word[:-1] + "i"
+
+    return word
+
+
+# ----------------------------------------------------------------------
+def _Step2(
+    word: str,
+) -> str:
+    if word.endswith("alli") and _HasPositiveMeasure(word[:-4]):
+        return _Step2(word[:-4] + "al")
+
+    return _ApplyRules(word, _STEP_2_RULES)
+
+
+# ----------------------------------------------------------------------
+def _Step3(
+    word: str,
+) -> str:
+    return _ApplyRules(word, _STEP_3_RULES)
+
+
+# ----------------------------------------------------------------------
+def _Step4(
+    word: str,
+) -> str:
+    return _ApplyRules(word, _STEP_4_RULES)
+
+
+# ----------------------------------------------------------------------
+def _Step5a(
+    word: str,
+) -> str:
+    if word.endswith("e"):
+        stem = word[:-1]
+        measure = _Measure(stem)
+
+        if measure > 1 or (measure == 1 and not _EndsWithCvc(stem)):
+            return stem
+
+    return word
+
+
+# ----------------------------------------------------------------------
+def _Step5b(
+    word: str,
+) -> str:
+    if word.endswith("ll") and _Measure(word[:-1]) > 1:
+        return word[:-1]
+
+    return word
+
+
+# ----------------------------------------------------------------------
+_STEP_1A_RULES: tuple[_Rule, ...]           = (
+    ("sses", "ss", None),
+    ("ies", "i", None),
+    ("ss", "ss", None),
+    ("s", "", None),
+)
+
+_STEP_2_RULES: tuple[_Rule, ...]            = (
+    ("ational", "ate", _HasPositiveMeasure),
+    ("tional", "tion", _HasPositiveMeasure),
+    ("enci", "ence", _HasPositiveMeasure),
+    ("anci", "ance", _HasPositiveMeasure),
+    ("izer", "ize", _HasPositiveMeasure),
+    ("bli", "ble", _HasPositiveMeasure),
+    ("alli", "al", _HasPositiveMeasure),
+    ("entli", "ent", _HasPositiveMeasure),
+    ("eli", "e", _HasPositiveMeasure),
+    ("ousli", "ous", _HasPositiveMeasure),
+    ("ization", "ize", _HasPositiveMeasure),
+    ("ation", "ate", _HasPositiveMeasure),
+    ("ator", "ate", _HasPositiveMeasure),
+    ("alism", "al", _HasPositiveMeasure),
+    ("iveness", "ive", _HasPositiveMeasure),
+    ("fulness", "ful", _HasPositiveMeasure),
+    ("ousness", "ous", _HasPositiveMeasure),
+    ("aliti", "al", _HasPositiveMeasure),
+    ("iviti", "ive", _HasPositiveMeasure),
+    ("biliti", "ble", _HasPositiveMeasure),
+    ("fulli", "ful", _HasPositiveMeasure),
+    # nltk extension: the condition is applied to the word without 'ogi' (rather than 'logi')
+    ("logi", "log", lambda stem: _HasPositiveMeasure(stem + "l")),
+)
+
+_STEP_3_RULES: tuple[_Rule, ...]            = (
+    ("icate", "ic", _HasPositiveMeasure),
+    ("ative", "", _HasPositiveMeasure),
+    ("alize", "al", _HasPositiveMeasure),
+    ("iciti", "ic", _HasPositiveMeasure),
+    ("ical", "ic", _HasPositiveMeasure),
+    ("ful", "", _HasPositiveMeasure),
+    ("ness", "", _HasPositiveMeasure),
+)
+
+_STEP_4_RULES: tuple[_Rule, ...]            = (
+    ("al", "", _HasMeasureGreaterThanOne),
+    ("ance", "", _HasMeasureGreaterThanOne),
+    ("ence", "", _HasMeasureGreaterThanOne),
+    ("er", "", _HasMeasureGreaterThanOne),
+    ("ic", "", _HasMeasureGreaterThanOne),
+    ("able", "", _HasMeasureGreaterThanOne),
+    ("ible", "", _HasMeasureGreaterThanOne),
+    ("ant", "", _HasMeasureGreaterThanOne),
+    ("ement", "", _HasMeasureGreaterThanOne),
+    ("ment", "", _HasMeasureGreaterThanOne),
+    ("ent", "", _HasMeasureGreaterThanOne),
+    ("ion", "", lambda stem: _HasMeasureGreaterThanOne(stem) and stem[-1:] in ("s", "t")),
+    ("ou", "", _HasMeasureGreaterThanOne),
+    ("ism", "", _HasMeasureGreaterThanOne),
+    ("ate", "", _HasMeasureGreaterThanOne),
+    ("iti", "", _HasMeasureGreaterThanOne),
+    ("ous", "", _HasMeasureGreaterThanOne),
+    ("ive", "", _HasMeasureGreaterThanOne),
+    ("ize", "", _HasMeasureGreaterThanOne),
+)
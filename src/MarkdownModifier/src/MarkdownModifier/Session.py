@@ -0,0 +1,416 @@
+# ----------------------------------------------------------------------
+# |
+# |  Session.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-19 18:12:37
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2023
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Contains the Session object and functionality to load plugins"""
+
+import asyncio
+import importlib
+import sys
+import threading
+
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, cast, Iterable, Iterator, Optional, Union
+
+from Common_Foundation.ContextlibEx import ExitStack
+
+from .BlockCache import BlockCache
+from .BlockWorker import BlockLimits, BlockWorker
+from .MarkdownModifier import Modify, Status
+from .Plugin import Plugin
+
+
+# ----------------------------------------------------------------------
+# |
+# |  Public Data
+# |
+# ----------------------------------------------------------------------
+DEFAULT_PLUGIN_DIR                          = Path(__file__).parent.parent / "Plugins"
+
+
+# ----------------------------------------------------------------------
+# |
+# |  Public Types
+# |
+# ----------------------------------------------------------------------
+class Session(object):
+    """\
+    Modifies markdown content with plugins that are loaded once.
+
+    Plugin state (exported definitions, stem and glossary caches, etc.) is preserved across calls, so
+    content that is a prerequisite for other content (for example, a glossary that exports
+    definitions) should be modified first.
+    """
+
+    # ----------------------------------------------------------------------
+    def __init__(
+        self,
+        plugin_dir: Optional[Path]=None,
+        *,
+        include_plugin_names: Optional[set[str]]=None,
+        exclude_plugin_names: Optional[set[str]]=None,
+        cache_dir: Optional[Path]=None,     # Plugin and block caches are loaded from and saved to this directory (see `Close`)
+        max_async_concurrency: Optional[int]=None,      # Maximum number of `ModifyAsync` calls that are modified at once
+        block_limits: Optional[BlockLimits]=None,       # Blocks are executed in a supervised worker process (stopped by `Close`) if provided
+    ):
+        plugin_dir = plugin_dir or DEFAULT_PLUGIN_DIR
+
+        plugins = LoadPlugins(plugin_dir)
+
+        for name in (include_plugin_names or set()) | (exclude_plugin_names or set()):
+            if name not in plugins:
+                raise Exception("'{}' is not a valid plugin name.".format(name))
+
+        if cache_dir is not None:
+            for plugin in plugins.values():
+                plugin.LoadCache(cache_dir)
+
+        self.plugin_dir                     = plugin_dir
+        self.plugins                        = plugins
+        self.include_plugin_names           = include_plugin_names or set()
+        self.exclude_plugin_names           = exclude_plugin_names or set()
+        self.cache_dir                      = cache_dir
+
+        # cog is not thread safe, as it overwrites sys.stdout and sys.stderr
+        self._lock                          = threading.Lock()
+
+        # The latest content modified by this session that is a prerequisite for other content, in
+        # the order that the files were first modified; this content is replayed in worker processes
+        # created by `CreateProcessExecutor`.
+        self._prerequisites: dict[Path, str]            = {}
+
+        # The output of blocks that only invoke pure plugins, shared by all content modified by this session
+        self.block_cache                    = BlockCache() if cache_dir is None else BlockCache.Load(cache_dir)
+
+        self._block_worker: Optional[BlockWorker]   = (
+            None if block_limits is None else BlockWorker(list(plugins.values()), block_limits)
+        )
+
+        self._async_semaphore: Optional[asyncio.Semaphore] = (
+            None if max_async_concurrency is None else asyncio.Semaphore(max_async_concurrency)
+        )
+
+    # ----------------------------------------------------------------------
+    def __enter__(self) -> "Session":
+        return self
+
+    # ----------------------------------------------------------------------
+    def __exit__(self, *args) -> None:
+        self.Close()
+
+    # ----------------------------------------------------------------------
+    def Close(self) -> None:
+        """Stops the block worker (if any) and saves the plugin and block caches (if a cache directory was provided)."""
+
+        with self._lock:
+            if self._block_worker is not None:
+                self._block_worker.Close()
+
+            if self.cache_dir is not None:
+                for plugin in self.plugins.values():
+                    plugin.SaveCache(self.cache_dir)
+
+                self.block_cache.Save(self.cache_dir)
+
+    # ----------------------------------------------------------------------
+    def Modify(
+        self,
+        filename: Path,
+        content: str,
+        on_status_update: Optional[Callable[[Status, str], None]]=None,
+        *,
+        active_plugin_names: Optional[set[str]]=None,   # Populated with the names of plugins that executed blocks or modified the content
+        dependencies: Optional[set[Path]]=None,         # Populated with the other files whose content was used when modifying the content
+    ) -> str:
+        """Returns the modified content; calls made from multiple threads are serialized."""
+
+        all_plugins = list(self.plugins.values())
+
+        with self._lock:
+            if any(plugin.IsPrerequisite(filename, content) for plugin in all_plugins):
+                self._prerequisites[filename] = content
+            else:
+                self._prerequisites.pop(filename, None)
+
+            return Modify(
+                filename,
+                content,
+                all_plugins,
+                on_status_update or (lambda status_id, text: None),
+                include_plugin_names=self.include_plugin_names,
+                exclude_plugin_names=self.exclude_plugin_names,
+                active_plugin_names=active_plugin_names,
+                dependencies=dependencies,
+                block_worker=self._block_worker,
+                block_cache=self.block_cache,
+            )
+
+    # ----------------------------------------------------------------------
+    async def ModifyAsync(
+        self,
+        filename: Path,
+        content: str,
+        on_status_update: Optional[Callable[[Status, str], None]]=None,
+        *,
+        executor: Optional[Executor]=None,
+    ) -> str:
+        """\
+        Returns the modified content without blocking the event loop.
+
+        Content is modified in `executor` (or the event loop's default executor); content modified
+        in a thread is serialized with all other calls to `Modify`, while content modified in an
+        executor created by `CreateProcessExecutor` is modified in parallel. Status updates are
+        delivered on the event loop (they are not available when content is modified in another
+        process).
+
+        Calls wait for a slot when `max_async_concurrency` calls are already in flight. Cancelling a
+        call that is waiting (for a slot or for the executor) prevents the content from being
+        modified; content that is already being modified can't be interrupted, but its result is
+        discarded.
+        """
+
+        loop = asyncio.get_running_loop()
+
+        on_status_func: Optional[Callable[[Status, str], None]] = None
+
+        if on_status_update is not None:
+            # ----------------------------------------------------------------------
+            def OnStatusUpdate(
+                status_id: Status,
+                text: str,
+            ) -> None:
+                assert on_status_update is not None
+                loop.call_soon_threadsafe(on_status_update, status_id, text)
+
+            # ----------------------------------------------------------------------
+
+            on_status_func = OnStatusUpdate
+
+        # ----------------------------------------------------------------------
+        async def Impl() -> str:
+            if isinstance(executor, ProcessPoolExecutor):
+                return await asyncio.wrap_future(executor.submit(_ModifyInWorker, filename, content))
+
+            return await loop.run_in_executor(executor, self.Modify, filename, content, on_status_func)
+
+        # ----------------------------------------------------------------------
+
+        if self._async_semaphore is None:
+            return await Impl()
+
+        async with self._async_semaphore:
+            return await Impl()
+
+    # ----------------------------------------------------------------------
+    def CreateProcessExecutor(
+        self,
+        max_num_processes: Optional[int]=None,
+    ) -> ProcessPoolExecutor:
+        """\
+        Returns an executor whose worker processes each have their own session (with the same
+        configuration) that first modifies the prerequisites that have been modified by this session.
+        Plugin state is not shared across processes, so prerequisites should be modified by this
+        session before the executor is created.
+        """
+
+        with self._lock:
+            prerequisites = list(self._prerequisites.items())
+
+        return ProcessPoolExecutor(
+            max_workers=max_num_processes,
+            initializer=_InitializeWorker,
+            initargs=(
+                _WorkerConfiguration(
+                    self.plugin_dir,
+                    self.include_plugin_names,
+                    self.exclude_plugin_names,
+                    prerequisites,
+                ),
+            ),
+        )
+
+    # ----------------------------------------------------------------------
+    def ModifyMany(
+        self,
+        items: Iterable[tuple[Path, str]],
+        *,
+        max_num_processes: Optional[int]=None,
+    ) -> Iterator[tuple[Path, Union[str, Exception]]]:
+        """\
+        Lazily yields the filename and modified content (or exception) for each item, in order.
+
+        Content is modified by this session unless `max_num_processes` is greater than 1, in which
+        case content is modified in parallel by worker processes (cog can't be run in parallel within
+        a process) created by `CreateProcessExecutor`.
+        """
+
+        if max_num_processes is None or max_num_processes <= 1:
+            for filename, content in items:
+                try:
+                    yield filename, self.Modify(filename, content)
+                except Exception as ex:  # pylint: disable=broad-exception-caught
+                    yield filename, ex
+
+            return
+
+        with self.CreateProcessExecutor(max_num_processes) as executor:
+            # Items are submitted as results are consumed so that the items aren't consumed (and
+            # results aren't accumulated) faster than the caller can process them.
+            pending: deque[tuple[Path, Future]] = deque()
+
+            for filename, content in items:
+                pending.append((filename, executor.submit(_ModifyInWorker, filename, content)))
+
+                if len(pending) >= max_num_processes * 2:
+                    yield _GetFutureResult(*pending.popleft())
+
+            while pending:
+                yield _GetFutureResult(*pending.popleft())
+
+
+# ----------------------------------------------------------------------
+# |
+# |  Public Functions
+# |
+# ----------------------------------------------------------------------
+def LoadPlugins(
+    plugin_dir: Path,
+) -> dict[str, Plugin]:
+    """Loads the plugins defined in '*Plugin.py' files within the plugin directory."""
+
+    # Ensure that the MarkdownModifier directory is accessible on the path
+    lib_dir = Path(__file__).parent
+
+    sys.path.insert(0, str(lib_dir))
+    with ExitStack(lambda: sys.path.pop(0)):
+        if not plugin_dir.is_dir():
+            raise Exception("The plugin directory '{}' does not exist.".format(plugin_dir))
+
+        sys.path.insert(0, str(plugin_dir))
+        with ExitStack(lambda: sys.path.pop(0)):
+            # ----------------------------------------------------------------------
+            @dataclass(frozen=True)
+            class PluginData(object):
+                filename: Path
+                plugin: Plugin
+
+            # ----------------------------------------------------------------------
+
+            potential_plugin_names: list[str] = ["Plugin", ]
+
+            all_plugins: dict[str, PluginData] = {}
+
+            for filename in sorted(plugin_dir.iterdir()):
+                if filename.suffix != ".py":
+                    continue
+
+                if not filename.stem.endswith("Plugin"):
+                    continue
+
+                mod = importlib.import_module(filename.stem)
+
+                plugin: Optional[Plugin] = None
+
+                for potential_plugin_name in potential_plugin_names:
+                    potential_plugin = getattr(mod, potential_plugin_name, None)
+                    if potential_plugin is None:
+                        continue
+
+                    plugin = cast(Plugin, potential_plugin())
+                    break
+
+                if plugin is None:
+                    raise Exception("A plugin was not found in '{}'.".format(filename))
+
+                prev_plugin = all_plugins.get(plugin.name, None)
+                if prev_plugin is not None:
+                    raise Exception(
+                        "The plugin '{}', defined in '{}', was already defined in '{}'.".format(
+                            plugin.name,
+                            filename,
+                            prev_plugin.filename,
+                        ),
+                    )
+
+                all_plugins[plugin.name] = PluginData(filename, plugin)
+
+            if not all_plugins:
+                raise Exception("No plugins were found in '{}'.".format(plugin_dir))
+
+            # If here, all plugins are valid and there weren't any conflicts
+            return {k: v.plugin for k, v in all_plugins.items()}
+
+
+# ----------------------------------------------------------------------
+# |
+# |  Private Types
+# |
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class _WorkerConfiguration(object):
+    plugin_dir: Path
+    include_plugin_names: set[str]
+    exclude_plugin_names: set[str]
+    prerequisites: list[tuple[Path, str]]
+
+
+# ----------------------------------------------------------------------
+# |
+# |  Private Data
+# |
+# ----------------------------------------------------------------------
+_worker_session: Optional[Session]          = None
+
+
+# ----------------------------------------------------------------------
+# |
+# |  Private Functions
+# |
+# ----------------------------------------------------------------------
+def _InitializeWorker(
+    configuration: _WorkerConfiguration,
+) -> None:
+    global _worker_session  # pylint: disable=global-statement
+
+    _worker_session = Session(
+        configuration.plugin_dir,
+        include_plugin_names=configuration.include_plugin_names,
+        exclude_plugin_names=configuration.exclude_plugin_names,
+    )
+
+    for filename, content in configuration.prerequisites:
+        _worker_session.Modify(filename, content)
+
+
+# ----------------------------------------------------------------------
+def _ModifyInWorker(
+    filename: Path,
+    content: str,
+) -> str:
+    assert _worker_session is not None
+    return _worker_session.Modify(filename, content)
+
+
+# ----------------------------------------------------------------------
+def _GetFutureResult(
+    filename: Path,
+    future: Future,
+) -> tuple[Path, Union[str, Exception]]:
+    try:
+        return filename, future.result()
+    except Exception as ex:  # pylint: disable=broad-exception-caught
+        return filename, ex
@@ -0,0 +1,74 @@
+# ----------------------------------------------------------------------
+# |
+# |  Templates.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-19 10:02:41
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2023
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Contains the Template object"""
+
+import textwrap
+
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class Template(object):
+    """\
+    Template that is dedented and compiled once (typically at import time) and then rendered
+    directly into an output buffer.
+
+    Rendering many items into a single buffer and joining once avoids the per-item dedenting
+    and intermediate string creation that happens when `textwrap.dedent(...).format(...)` is
+    invoked for each item.
+    """
+
+    # ----------------------------------------------------------------------
+    # |
+    # |  Data
+    # |
+    # ----------------------------------------------------------------------
+    content: str
+
+    dedent: bool                            = field(kw_only=True, default=True)
+
+    _format_func: Callable[..., str]        = field(init=False)
+
+    # ----------------------------------------------------------------------
+    # |
+    # |  Methods
+    # |
+    # ----------------------------------------------------------------------
+    def __post_init__(self):
+        content = self.content
+
+        if self.dedent:
+            content = textwrap.dedent(content)
+            object.__setattr__(self, "content", content)
+
+        object.__setattr__(self, "_format_func", content.format)
+
+    # ----------------------------------------------------------------------
+    def Render(
+        self,
+        **values: Any,
+    ) -> str:
+        return self._format_func(**values)
+
+    # ----------------------------------------------------------------------
+    def RenderTo(
+        self,
+        buffer: list[str],
+        **values: Any,
+    ) -> None:
+        buffer.append(self._format_func(**values))
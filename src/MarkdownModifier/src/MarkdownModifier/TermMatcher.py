@@ -0,0 +1,231 @@
+# ----------------------------------------------------------------------
+# |
+# |  TermMatcher.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-19 11:05:38
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2023
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Contains the TermMatcher object"""
+
+import re
+
+from dataclasses import dataclass
+from typing import Any, Callable, Generic, Iterator, Optional, TypeVar
+
+
+# ----------------------------------------------------------------------
+ValueT                                      = TypeVar("ValueT")
+
+
+# ----------------------------------------------------------------------
+class TermMatcher(Generic[ValueT]):
+    """\
+    Matches many terms at once by walking a character trie from each word boundary.
+
+    The matching semantics are equivalent to those of a regular expression in the form:
+
+        (?<!<excluded_prefix>)...\\b(?:<term1>|<term2>|...)\\b(?!<excluded_suffix>)...
+
+    where case insensitive terms are wrapped in `(?i:...)`. Like a regular expression alternation,
+    the term that was added first wins when multiple terms match at the same position (this is not
+    necessarily the longest term). Unlike a regular expression alternation, the cost of matching
+    does not grow with the number of terms.
+    """
+
+    # ----------------------------------------------------------------------
+    def __init__(
+        self,
+        *,
+        excluded_prefixes: tuple[str, ...]=(),
+        excluded_suffixes: tuple[str, ...]=(),
+    ):
+        self.excluded_prefixes              = excluded_prefixes
+        self.excluded_suffixes              = excluded_suffixes
+
+        self._root: _Node                   = {}
+        self._num_terms                     = 0
+
+    # ----------------------------------------------------------------------
+    def __len__(self) -> int:
+        return self._num_terms
+
+    # ----------------------------------------------------------------------
+    def Add(
+        self,
+        term: str,
+        value: ValueT,
+        *,
+        case_insensitive: bool,
+    ) -> None:
+        """Adds a term; terms added earlier take precedence over terms added later."""
+
+        if not term:
+            raise ValueError("Terms must not be empty.")
+
+        node = self._root
+
+        # Characters are lowercased individually (rather than lowercasing the term as a whole) so
+        # that offsets in the trie always correspond to offsets in the original content.
+        for char in term:
+            char = char.lower()
+
+            child = node.get(char, None)
+            if child is None:
+                child = {}
+                node[char] = child
+
+            node = child
+
+        terminals = node.get(_TERMINALS_KEY, None)
+        if terminals is None:
+            terminals = []
+            node[_TERMINALS_KEY] = terminals
+
+        terminals.append(_Terminal(self._num_terms, term, case_insensitive, value))
+        self._num_terms += 1
+
+    # ----------------------------------------------------------------------
+    def Finditer(
+        self,
+        content: str,
+    ) -> Iterator[tuple[int, int, ValueT]]:
+        """Yields (start, end, value) for each non-overlapping match within the content."""
+
+        root = self._root
+        content_len = len(content)
+
+        next_available_index = 0
+
+        for boundary_match in _WORD_BOUNDARY_REGEX.finditer(content):
+            start = boundary_match.start()
+
+            if start < next_available_index or start == content_len:
+                continue
+
+            node = root.get(content[start].lower(), None)
+            if node is None:
+                continue
+
+            if any(content.endswith(prefix, 0, start) for prefix in self.excluded_prefixes):
+                continue
+
+            best: Optional[_Terminal] = None
+            best_end = 0
+
+            end = start
+
+            while True:
+                end += 1
+
+                terminals = node.get(_TERMINALS_KEY, None)
+
+                if terminals is not None and _IsWordBoundary(content, end) and not any(
+                    content.startswith(suffix, end) for suffix in self.excluded_suffixes
+                ):
+                    for terminal in terminals:
+                        if best is not None and terminal.priority > best.priority:
+                            break
+
+                        if terminal.case_insensitive or content.startswith(terminal.term, start):
+                            best = terminal
+                            best_end = end
+
+                            break
+
+                if end == content_len:
+                    break
+
+                node = node.get(content[end].lower(), None)
+                if node is None:
+                    break
+
+            if best is None:
+                continue
+
+            yield start, best_end, best.value
+
+            next_available_index = best_end
+
+    # ----------------------------------------------------------------------
+    def Sub(
+        self,
+        content: str,
+        func: Callable[[str, ValueT], str],
+    ) -> str:
+        """Replaces each match with the result of `func(matching_text, value)`."""
+
+        output: list[str] = []
+        prev_end = 0
+
+        for start, end, value in self.Finditer(content):
+            output.append(content[prev_end:start])
+            output.append(func(content[start:end], value))
+
+            prev_end = end
+
+        if not output:
+            return content
+
+        output.append(content[prev_end:])
+
+        return "".join(output)
+
+
+# ----------------------------------------------------------------------
+# |
+# |  Private Types
+# |
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class _Terminal(Generic[ValueT]):
+    priority: int
+    term: str
+    case_insensitive: bool
+    value: ValueT
+
+
+# ----------------------------------------------------------------------
+# Trie nodes are dictionaries (rather than objects) to minimize the overhead of creating tries for
+# glossaries with many terms. Children are keyed by (lowercase) character and terminals are stored
+# under `_TERMINALS_KEY`, which can never collide with a character.
+_Node                                       = dict[str, Any]
+
+
+# ----------------------------------------------------------------------
+# |
+# |  Private Data
+# |
+# ----------------------------------------------------------------------
+_TERMINALS_KEY                              = ""
+
+_WORD_BOUNDARY_REGEX                        = re.compile(r"\b")
+
+
+# ----------------------------------------------------------------------
+# |
+# |  Private Functions
+# |
+# ----------------------------------------------------------------------
+def _IsWordChar(
+    char: str,
+) -> bool:
+    return char.isalnum() or char == "_"
+
+
+# ----------------------------------------------------------------------
+def _IsWordBoundary(
+    content: str,
+    index: int,
+) -> bool:
+    return (
+        (index > 0 and _IsWordChar(content[index - 1]))
+        != (index < len(content) and _IsWordChar(content[index]))
+    )
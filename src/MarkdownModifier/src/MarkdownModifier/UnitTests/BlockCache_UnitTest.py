@@ -0,0 +1,299 @@
+# ----------------------------------------------------------------------
+# |
+# |  BlockCache_UnitTest.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-19 21:58:03
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2023
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Unit tests for BlockCache.py."""
+
+import sys
+import textwrap
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from Common_Foundation.ContextlibEx import ExitStack
+from Common_Foundation import PathEx
+
+
+# ----------------------------------------------------------------------
+sys.path.insert(0, str(PathEx.EnsureDir(Path(__file__).parent.parent.parent)))
+with ExitStack(lambda: sys.path.pop(0)):
+    from MarkdownModifier.BlockCache import BlockCache
+    from MarkdownModifier.MarkdownModifier import Modify
+    from MarkdownModifier.Plugin import Plugin
+    from MarkdownModifier.Session import DEFAULT_PLUGIN_DIR, LoadPlugins
+
+
+# ----------------------------------------------------------------------
+def test_IdenticalBlocks():
+    plugin = _UpperPlugin("Upper")
+    block_cache = BlockCache()
+
+    content = "Text\n\n<!-- [[[ Upper('one') ]]] -->\n<!-- [[[end]]] -->\n"
+
+    assert _Modify(content, [plugin], block_cache) == "Text\n\n<!-- [[[ Upper('one') ]]] -->\nONE\n<!-- [[[end]]] -->\n"
+    assert _Modify("Other text\n" + content, [plugin], block_cache) == "Other text\nText\n\n<!-- [[[ Upper('one') ]]] -->\nONE\n<!-- [[[end]]] -->\n"
+
+    assert plugin.inputs == ["one"]
+    assert (block_cache.hits, block_cache.misses) == (1, 1)
+
+
+# ----------------------------------------------------------------------
+def test_PrecedingBlocks():
+    plugin = _UpperPlugin("Upper")
+    block_cache = BlockCache()
+
+    content = textwrap.dedent(
+        """\
+        <!-- [[[ Upper('one') ]]] -->
+        <!-- [[[end]]] -->
+        <!-- [[[
+            value = 'two'
+            Upper(value)
+        ]]] -->
+        <!-- [[[end]]] -->
+        """,
+    )
+
+    expected = textwrap.dedent(
+        """\
+        <!-- [[[ Upper('one') ]]] -->
+        ONE
+        <!-- [[[end]]] -->
+        <!-- [[[
+            value = 'two'
+            Upper(value)
+        ]]] -->
+        TWO
+        <!-- [[[end]]] -->
+        """,
+    )
+
+    assert _Modify(content, [plugin], block_cache) == expected
+    assert _Modify(content, [plugin], block_cache) == expected
+    assert plugin.inputs == ["one", "two"]
+
+    # The key of a block is based on the blocks that precede it, as they may establish state
+    assert _Modify(content.replace("'one'", "'three'"), [plugin], block_cache) == expected.replace("'one'", "'three'").replace("ONE", "THREE")
+    assert plugin.inputs == ["one", "two", "three", "two"]
+
+
+# ----------------------------------------------------------------------
+def test_TrailingBlocksOnly():
+    plugin = _UpperPlugin("Upper")
+    block_cache = BlockCache()
+
+    # Blocks that precede a block that is executed are executed (even when they are cached)
+    content = textwrap.dedent(
+        """\
+        <!-- [[[ Upper('one') ]]] -->
+        <!-- [[[end]]] -->
+        <!-- [[[ import cog; cog.outl('Not pure') ]]] -->
+        <!-- [[[end]]] -->
+        """,
+    )
+
+    _Modify(content, [plugin], block_cache)
+    _Modify(content, [plugin], block_cache)
+
+    assert plugin.inputs == ["one", "one"]
+
+
+# ----------------------------------------------------------------------
+def test_ImpurePlugins():
+    plugin = _UpperPlugin("Upper")
+    block_cache = BlockCache()
+
+    plugins = list(LoadPlugins(DEFAULT_PLUGIN_DIR).values()) + [plugin]
+
+    content = textwrap.dedent(
+        """\
+        <!-- [[[ TableOfContents() ]]] -->
+        <!-- [[[end]]] -->
+
+        # Heading
+
+        <!-- [[[ Upper('one') ]]] -->
+        <!-- [[[end]]] -->
+        """,
+    )
+
+    expected = _Modify(content, plugins, None)
+
+    assert _Modify(content, plugins, block_cache) == expected
+    assert _Modify(content, plugins, block_cache) == expected
+
+    # Blocks that follow a block that invokes an impure plugin are not cached
+    assert plugin.inputs == ["one", "one", "one"]
+
+
+# ----------------------------------------------------------------------
+def test_BlockOutput():
+    plugin = _UpperPlugin("Upper")
+    block_cache = BlockCache()
+
+    content = textwrap.dedent(
+        """\
+        <!-- [[[
+            import cog
+            Upper('one')
+            cog.outl('Not from a plugin')
+        ]]] -->
+        <!-- [[[end]]] -->
+        """,
+    )
+
+    _Modify(content, [plugin], block_cache)
+    _Modify(content, [plugin], block_cache)
+
+    # Blocks whose output isn't entirely generated by plugins are not cached
+    assert plugin.inputs == ["one", "one"]
+
+
+# ----------------------------------------------------------------------
+def test_DefinitionList():
+    plugins = list(LoadPlugins(DEFAULT_PLUGIN_DIR).values())
+    block_cache = BlockCache()
+
+    content = textwrap.dedent(
+        """\
+        <!-- [[[ DefinitionList({"Widget": "A thing"}) ]]] -->
+        <!-- [[[end]]] -->
+
+        Some widgets.
+        """,
+    )
+
+    expected = _Modify(content, plugins, None)
+
+    assert 'href="#widget"' in expected
+
+    assert _Modify(content, plugins, block_cache) == expected
+    assert (block_cache.hits, block_cache.misses) == (0, 1)
+
+    # The definitions recorded when the block was executed are restored when its output is reused
+    assert _Modify(content, plugins, block_cache) == expected
+    assert (block_cache.hits, block_cache.misses) == (1, 1)
+
+
+# ----------------------------------------------------------------------
+def test_MaxSize():
+    plugin = _UpperPlugin("Upper")
+    block_cache = BlockCache(max_size=2)
+
+    for text in ["one", "two", "one", "three", "one", "two"]:
+        _Modify("<!-- [[[ Upper('{}') ]]] -->\n<!-- [[[end]]] -->\n".format(text), [plugin], block_cache)
+
+    # The least recently used entries are evicted
+    assert plugin.inputs == ["one", "two", "three", "two"]
+
+
+# ----------------------------------------------------------------------
+def test_Invalidation():
+    block_cache = BlockCache()
+
+    content = "<!-- [[[ Upper('one') ]]] -->\n<!-- [[[end]]] -->\n"
+
+    plugin = _UpperPlugin("Upper")
+    _Modify(content, [plugin], block_cache)
+
+    # Different version
+    plugin = _UpperPlugin("Upper", version="2")
+    _Modify(content, [plugin], block_cache)
+    _Modify(content, [plugin], block_cache)
+
+    assert plugin.inputs == ["one"]
+
+    # Excluded plugin
+    assert Modify(
+        Path("Test.md"),
+        content,
+        [plugin],
+        lambda *args: None,
+        exclude_plugin_names={"Upper"},
+        block_cache=block_cache,
+    ) == "<!-- [[[ Upper('one') ]]] -->\n\n<!-- [[[end]]] -->\n"
+
+    assert plugin.inputs == ["one"]
+
+
+# ----------------------------------------------------------------------
+def test_SaveAndLoad(tmp_path):
+    block_cache = BlockCache()
+
+    # Nothing is saved if nothing has been cached
+    block_cache.Save(tmp_path)
+    assert not (tmp_path / BlockCache.FILENAME).exists()
+
+    content = "<!-- [[[ Upper('one') ]]] -->\n<!-- [[[end]]] -->\n"
+
+    _Modify(content, [_UpperPlugin("Upper")], block_cache)
+    block_cache.Save(tmp_path)
+
+    plugin = _UpperPlugin("Upper")
+
+    assert _Modify(content, [plugin], BlockCache.Load(tmp_path)) == "<!-- [[[ Upper('one') ]]] -->\nONE\n<!-- [[[end]]] -->\n"
+    assert plugin.inputs == []
+
+    (tmp_path / BlockCache.FILENAME).write_text("Not JSON")
+
+    _Modify(content, [plugin], BlockCache.Load(tmp_path))
+    assert plugin.inputs == ["one"]
+
+
+# ----------------------------------------------------------------------
+def test_CreateKeys():
+    keys = BlockCache.CreateKeys(["a", "b"])
+
+    assert len(set(keys)) == 2
+    assert BlockCache.CreateKeys(["a"]) == keys[:1]
+    assert BlockCache.CreateKeys(["b"])[0] not in keys
+    assert BlockCache.CreateKeys(["ab"])[0] not in keys
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class _UpperPlugin(Plugin):
+    version: str                            = "1"
+    inputs: list[str]                       = field(default_factory=list)
+
+    # ----------------------------------------------------------------------
+    def GetPureExecuteVersion(self) -> Optional[str]:
+        return self.version
+
+    # ----------------------------------------------------------------------
+    def Execute(
+        self,
+        filename: Path,
+        text: str,
+    ) -> str:
+        self.inputs.append(text)
+        return text.upper()
+
+
+# ----------------------------------------------------------------------
+def _Modify(
+    content: str,
+    plugins: list[Plugin],
+    block_cache: Optional[BlockCache],
+) -> str:
+    return Modify(
+        Path("Test.md"),
+        content,
+        plugins,
+        lambda *args: None,
+        block_cache=block_cache,
+    )
@@ -0,0 +1,198 @@
+# ----------------------------------------------------------------------
+# |
+# |  BlockWorker_UnitTest.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-19 21:24:39
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2023
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Unit tests for BlockWorker.py."""
+
+import re
+import sys
+import textwrap
+
+from pathlib import Path
+from typing import Iterator, Optional
+
+import pytest
+
+from Common_Foundation.ContextlibEx import ExitStack
+from Common_Foundation import PathEx
+
+
+# ----------------------------------------------------------------------
+sys.path.insert(0, str(PathEx.EnsureDir(Path(__file__).parent.parent.parent)))
+with ExitStack(lambda: sys.path.pop(0)):
+    from MarkdownModifier.BlockWorker import BlockLimits, BlockWorker
+    from MarkdownModifier.MarkdownModifier import Modify
+    from MarkdownModifier.Session import DEFAULT_PLUGIN_DIR, LoadPlugins
+
+
+# ----------------------------------------------------------------------
+@pytest.mark.parametrize(
+    "content",
+    [
+        "Nothing to change.\n",
+        textwrap.dedent(
+            """\
+            <!-- [[[ TableOfContents() ]]] -->
+            <!-- [[[end]]] -->
+
+            # Heading 1
+            ## Heading 2
+            """,
+        ),
+        textwrap.dedent(
+            """\
+            Some foos.
+
+            <!-- [[[
+                import cog
+
+                cog.outl("Before")
+                DefinitionList({"foo": "The definition."})
+                cog.outl("After")
+            ]]] -->
+            <!-- [[[end]]] -->
+            """,
+        ),
+        textwrap.dedent(
+            """\
+            - Item
+                <!-- [[[ TableOfContents() ]]] -->
+                <!-- [[[end]]] -->
+
+            # Heading 1
+            """,
+        ),
+    ],
+)
+def test_SameAsInProcess(content, _block_worker):
+    assert _Modify(content, _block_worker) == _Modify(content, None)
+
+
+# ----------------------------------------------------------------------
+def test_Error(_block_worker):
+    content = "Text\n<!-- [[[ DoesNotExist() ]]] -->\n<!-- [[[end]]] -->\n"
+
+    with pytest.raises(Exception) as ex:
+        _Modify(content, _block_worker)
+
+    assert str(ex.value).endswith("NameError: name 'DoesNotExist' is not defined")
+    assert "<cog :2>" in str(ex.value)
+
+    with pytest.raises(Exception, match=re.escape("TableOfContents: Plugin.Execute() got an unexpected keyword argument 'bad'")):
+        _Modify("<!-- [[[ TableOfContents(bad=1) ]]] -->\n<!-- [[[end]]] -->\n", _block_worker)
+
+
+# ----------------------------------------------------------------------
+def test_UnpicklableArguments(_block_worker):
+    content = textwrap.dedent(
+        """\
+        Text
+
+        <!-- [[[
+            DefinitionList(
+                {"foo": "The definition."},
+                generate_content_func=lambda *args, **kwargs: "Generated",
+            )
+        ]]] -->
+        <!-- [[[end]]] -->
+        """,
+    )
+
+    # Arguments that can't be pickled work in process...
+    assert "Generated" in _Modify(content, None)
+
+    # ...but can't be sent from the worker
+    with pytest.raises(Exception) as ex:
+        _Modify(content, _block_worker)
+
+    assert str(ex.value).startswith("Test.md(3): The arguments passed to 'DefinitionList' can't be sent from the block worker")
+    assert "must be picklable" in str(ex.value)
+
+    # The worker continues to be used
+    assert _Modify("Nothing to change.\n", _block_worker) == "Nothing to change.\n"
+
+
+# ----------------------------------------------------------------------
+def test_TimeLimit():
+    with BlockWorker(list(_PLUGINS.values()), BlockLimits(max_seconds=0.5)) as block_worker:
+        content = textwrap.dedent(
+            """\
+            <!-- [[[ TableOfContents() ]]] -->
+            <!-- [[[end]]] -->
+
+            <!-- [[[
+                while True:
+                    pass
+            ]]] -->
+            <!-- [[[end]]] -->
+            """,
+        )
+
+        with pytest.raises(Exception, match=re.escape("Test.md(4): The block exceeded the 0.5 second time limit.")):
+            _Modify(content, block_worker)
+
+        # The worker is restarted
+        assert _Modify("Nothing to change.\n", block_worker) == "Nothing to change.\n"
+
+
+# ----------------------------------------------------------------------
+@pytest.mark.skipif(sys.platform != "linux", reason="Block memory limits are only supported on Linux")
+def test_MemoryLimit():
+    with BlockWorker(list(_PLUGINS.values()), BlockLimits(max_memory_mb=64)) as block_worker:
+        content = "<!-- [[[ x = bytearray(512 * 1024 * 1024) ]]] -->\n<!-- [[[end]]] -->\n"
+
+        with pytest.raises(Exception, match=re.escape("Test.md(1): The block exceeded the 64 MB memory limit.")):
+            _Modify(content, block_worker)
+
+        # The limit only applies to the block
+        assert _Modify(
+            "<!-- [[[ x = bytearray(32 * 1024 * 1024) ]]] -->\n<!-- [[[end]]] -->\n",
+            block_worker,
+        ) == "<!-- [[[ x = bytearray(32 * 1024 * 1024) ]]] -->\n<!-- [[[end]]] -->\n"
+
+
+# ----------------------------------------------------------------------
+def test_InvalidLimits():
+    with pytest.raises(ValueError, match=re.escape("'max_seconds' must be greater than 0.")):
+        BlockLimits(max_seconds=0)
+
+    with pytest.raises(ValueError, match=re.escape("'max_memory_mb' must be greater than 0.")):
+        BlockLimits(max_memory_mb=-1)
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+_PLUGINS                                    = LoadPlugins(DEFAULT_PLUGIN_DIR)
+
+
+# ----------------------------------------------------------------------
+@pytest.fixture(scope="module")
+def _block_worker() -> Iterator[BlockWorker]:
+    with BlockWorker(list(_PLUGINS.values()), BlockLimits(max_seconds=30)) as block_worker:
+        yield block_worker
+
+
+# ----------------------------------------------------------------------
+def _Modify(
+    content: str,
+    block_worker: Optional[BlockWorker],
+) -> str:
+    return Modify(
+        Path("Test.md"),
+        content,
+        list(_PLUGINS.values()),
+        lambda *args: None,
+        block_worker=block_worker,
+    )
@@ -0,0 +1,127 @@
+# ----------------------------------------------------------------------
+# |
+# |  DependencyGraph_UnitTest.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-19 19:41:12
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2023
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Unit tests for DependencyGraph.py."""
+
+import sys
+
+from pathlib import Path
+
+from Common_Foundation.ContextlibEx import ExitStack
+from Common_Foundation import PathEx
+
+
+# ----------------------------------------------------------------------
+sys.path.insert(0, str(PathEx.EnsureDir(Path(__file__).parent.parent.parent)))
+with ExitStack(lambda: sys.path.pop(0)):
+    from MarkdownModifier.DependencyGraph import DependencyGraph
+
+
+# ----------------------------------------------------------------------
+def test_Traverse():
+    graph = DependencyGraph()
+
+    graph.Update(Path("Page1.md"), {Path("Glossary1.md")})
+    graph.Update(Path("Page2.md"), {Path("Glossary2.md")})
+    graph.Update(Path("Glossary1.md"), {Path("Glossary2.md")})
+
+    assert graph.GetDependents([Path("Glossary2.md")]) == {Path("Page1.md"), Path("Page2.md"), Path("Glossary1.md")}
+    assert graph.GetDependents([Path("Glossary1.md")]) == {Path("Page1.md")}
+    assert graph.GetDependents([Path("Page1.md")]) == set()
+
+    assert graph.GetDependencies([Path("Page1.md")]) == {Path("Glossary1.md"), Path("Glossary2.md")}
+    assert graph.GetDependencies([Path("Page1.md"), Path("Glossary1.md")]) == {Path("Glossary2.md")}
+    assert graph.GetDependencies([Path("Glossary2.md")]) == set()
+
+
+# ----------------------------------------------------------------------
+def test_Update():
+    graph = DependencyGraph()
+
+    graph.Update(Path("Page.md"), {Path("Glossary1.md")})
+    graph.Update(Path("Page.md"), {Path("Glossary2.md")})
+
+    assert graph.GetDependencies([Path("Page.md")]) == {Path("Glossary2.md")}
+    assert graph.GetDependents([Path("Glossary1.md")]) == set()
+
+    graph.Update(Path("Page.md"), set())
+
+    assert graph.GetDependencies([Path("Page.md")]) == set()
+
+
+# ----------------------------------------------------------------------
+def test_Cycle():
+    graph = DependencyGraph()
+
+    graph.Update(Path("One.md"), {Path("Two.md")})
+    graph.Update(Path("Two.md"), {Path("One.md")})
+
+    assert graph.GetDependents([Path("One.md")]) == {Path("Two.md")}
+    assert graph.GetDependencies([Path("Two.md")]) == {Path("One.md")}
+
+
+# ----------------------------------------------------------------------
+def test_SaveAndLoad(tmp_path):
+    page = tmp_path / "Page.md"
+    glossary = tmp_path / "Glossary.md"
+    removed = tmp_path / "Removed.md"
+
+    page.write_text("")
+    glossary.write_text("")
+
+    graph = DependencyGraph()
+
+    graph.Update(page, {glossary})
+    graph.Update(removed, {glossary})
+
+    graph.Save(tmp_path)
+    assert (tmp_path / DependencyGraph.FILENAME).is_file()
+
+    graph = DependencyGraph.Load(tmp_path)
+    assert graph is not None
+
+    assert graph.GetDependents([glossary]) == {page}
+    assert graph.GetDependencies([page]) == {glossary}
+
+
+# ----------------------------------------------------------------------
+def test_LoadMissing(tmp_path):
+    assert DependencyGraph.Load(tmp_path) is None
+
+
+# ----------------------------------------------------------------------
+def test_LoadInvalid(tmp_path):
+    filename = tmp_path / DependencyGraph.FILENAME
+
+    for content in [
+        "",
+        "This is not JSON",
+        "[]",
+        '{"version": 0, "dependencies": {}}',
+        '{"version": 1, "dependencies": []}',
+    ]:
+        filename.write_text(content)
+        assert DependencyGraph.Load(tmp_path) is None, content
+
+
+# ----------------------------------------------------------------------
+def test_LoadEmpty(tmp_path):
+    # A graph without dependencies is different from a graph that hasn't been saved
+    DependencyGraph().Save(tmp_path)
+
+    graph = DependencyGraph.Load(tmp_path)
+    assert graph is not None
+
+    assert graph.GetDependents([Path("Glossary.md")]) == set()
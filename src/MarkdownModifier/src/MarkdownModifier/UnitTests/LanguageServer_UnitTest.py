@@ -0,0 +1,344 @@
+# ----------------------------------------------------------------------
+# |
+# |  LanguageServer_UnitTest.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-19 20:31:54
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2023
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Unit tests for LanguageServer.py."""
+
+import io
+import json
+import statistics
+import sys
+import textwrap
+import time
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+import pytest
+
+from Common_Foundation.ContextlibEx import ExitStack
+from Common_Foundation import PathEx
+
+
+# ----------------------------------------------------------------------
+sys.path.insert(0, str(PathEx.EnsureDir(Path(__file__).parent.parent.parent)))
+with ExitStack(lambda: sys.path.pop(0)):
+    from MarkdownModifier.LanguageServer import LanguageServer, _GetOffset
+    from MarkdownModifier.Session import Session
+
+
+# ----------------------------------------------------------------------
+def test_Lifecycle():
+    output = _Run(
+        [
+            {"id": 1, "method": "initialize", "params": {}},
+            {"method": "initialized", "params": {}},
+            {"id": 2, "method": "shutdown"},
+            {"method": "exit"},
+        ],
+    )
+
+    assert output.result == 0
+
+    assert output.responses[1]["result"]["capabilities"]["textDocumentSync"]["change"] == 2
+    assert output.responses[2] == {"jsonrpc": "2.0", "id": 2, "result": None}
+
+
+# ----------------------------------------------------------------------
+def test_ExitWithoutShutdown():
+    assert _Run([{"method": "exit"}]).result == 1
+    assert _Run([]).result == 1
+
+
+# ----------------------------------------------------------------------
+def test_UnsupportedRequest():
+    output = _Run([{"id": 1, "method": "textDocument/hover", "params": {}}])
+
+    assert output.responses[1]["error"] == {"code": -32601, "message": "'textDocument/hover' is not supported."}
+
+
+# ----------------------------------------------------------------------
+def test_CodeAction():
+    output = _Run([_CreateOpen(_TABLE_OF_CONTENTS), _CreateCodeActionRequest(1)])
+
+    (action, ) = output.responses[1]["result"]
+    assert action["title"] == LanguageServer.CODE_ACTION_TITLE
+
+    (edit, ) = action["edit"]["changes"][_URI]
+
+    # Only the generated lines are replaced
+    assert edit == {
+        "range": {"start": {"line": 1, "character": 0}, "end": {"line": 1, "character": 0}},
+        "newText": '<div>1 <a href="#heading-1">Heading 1</a></div>\n',
+    }
+
+    (diagnostic, ) = output.diagnostics[_URI]
+    assert diagnostic["severity"] == 3
+    assert diagnostic["range"]["start"]["line"] == 1
+
+
+# ----------------------------------------------------------------------
+def test_UpToDate():
+    output = _Run([_CreateOpen("Nothing to change.\n"), _CreateCodeActionRequest(1)])
+
+    assert output.responses[1]["result"] == []
+    assert output.diagnostics[_URI] == []
+
+
+# ----------------------------------------------------------------------
+def test_IncrementalChanges():
+    output = _Run(
+        [
+            _CreateOpen("Text\n\n# Heading 1\n"),
+            _CreateChange({"line": 0, "character": 0}, {"line": 0, "character": 4}, "<!-- [[[ TableOfContents() ]]] -->"),
+            _CreateChange({"line": 1, "character": 0}, {"line": 1, "character": 0}, "<!-- [[[end]]] -->\n"),
+            _CreateCodeActionRequest(1),
+        ],
+    )
+
+    (action, ) = output.responses[1]["result"]
+    (edit, ) = action["edit"]["changes"][_URI]
+
+    assert edit["range"]["start"]["line"] == 1
+    assert edit["newText"] == '<div>1 <a href="#heading-1">Heading 1</a></div>\n'
+
+
+# ----------------------------------------------------------------------
+def test_ManyChanges():
+    durations: list[float] = []
+
+    # ----------------------------------------------------------------------
+    class TimedSession(Session):
+        # ----------------------------------------------------------------------
+        def Modify(self, *args, **kwargs) -> str:
+            start = time.perf_counter()
+
+            try:
+                return super().Modify(*args, **kwargs)
+            finally:
+                durations.append(time.perf_counter() - start)
+
+    # ----------------------------------------------------------------------
+
+    num_changes = 200
+
+    messages: list[dict[str, Any]] = [_CreateOpen(_TABLE_OF_CONTENTS)]
+
+    # Add and remove a heading, requesting code actions after each change so that the document is
+    # modified after each change.
+    for index in range(num_changes):
+        if index % 2 == 0:
+            messages.append(_CreateChange({"line": 4, "character": 0}, {"line": 4, "character": 0}, "## Heading 2\n"))
+        else:
+            messages.append(_CreateChange({"line": 4, "character": 0}, {"line": 5, "character": 0}, ""))
+
+        messages.append(_CreateCodeActionRequest(index + 1))
+
+    output = _Run(messages, TimedSession())
+
+    new_texts = [
+        output.responses[index + 1]["result"][0]["edit"]["changes"][_URI][0]["newText"]
+        for index in range(num_changes)
+    ]
+
+    # The output doesn't change as the document is edited repeatedly
+    assert new_texts[0::2] == [new_texts[0]] * (num_changes // 2)
+    assert new_texts[1::2] == [new_texts[1]] * (num_changes // 2)
+
+    assert new_texts[0] == (
+        '<div>1 <a href="#heading-1">Heading 1</a></div>\n'
+        '<div>&nbsp;&nbsp;1.1 <a href="#heading-2">Heading 2</a></div>\n'
+    )
+    assert new_texts[1] == '<div>1 <a href="#heading-1">Heading 1</a></div>\n'
+
+    # The latency doesn't grow as the document is edited repeatedly (state isn't accumulated)
+    assert len(durations) >= num_changes
+
+    initial_latency = statistics.median(durations[:num_changes // 4])
+    final_latency = statistics.median(durations[-num_changes // 4:])
+
+    assert final_latency < initial_latency * 3 + 0.005, (initial_latency, final_latency)
+
+
+# ----------------------------------------------------------------------
+def test_ErrorDiagnostic():
+    output = _Run([_CreateOpen("Text\n\n<!-- [[[ DoesNotExist() ]]] -->\n<!-- [[[end]]] -->\n")])
+
+    (diagnostic, ) = output.diagnostics[_URI]
+
+    assert diagnostic["severity"] == 1
+    assert diagnostic["range"]["start"]["line"] == 2
+    assert diagnostic["message"] == "NameError: name 'DoesNotExist' is not defined"
+
+
+# ----------------------------------------------------------------------
+def test_Close():
+    output = _Run(
+        [
+            _CreateOpen(_TABLE_OF_CONTENTS),
+            {"method": "textDocument/didClose", "params": {"textDocument": {"uri": _URI}}},
+        ],
+    )
+
+    assert output.diagnostics[_URI] == []
+
+
+# ----------------------------------------------------------------------
+def test_WorkspacePrerequisites(tmp_path):
+    (tmp_path / "Glossary.md").write_text(
+        textwrap.dedent(
+            """\
+            <!-- [[[
+                DefinitionList(
+                    {
+                        "widget": "The definition for widget.",
+                    },
+                    export=True,
+                )
+            ]]] -->
+            <!-- [[[end]]] -->
+            """,
+        ),
+    )
+
+    page_uri = (tmp_path / "Page.md").as_uri()
+
+    output = _Run(
+        [
+            {"id": 1, "method": "initialize", "params": {"rootUri": tmp_path.as_uri()}},
+            _CreateOpen("Some widgets.\n", page_uri),
+            _CreateCodeActionRequest(2, page_uri),
+        ],
+    )
+
+    (action, ) = output.responses[2]["result"]
+    (edit, ) = action["edit"]["changes"][page_uri]
+
+    assert edit["newText"] == 'Some <a href="Glossary.md#widget" data-definition-list-link=1>widgets</a>.\n'
+
+
+# ----------------------------------------------------------------------
+@pytest.mark.parametrize(
+    "line, character, expected",
+    [
+        (0, 0, 0),
+        (0, 3, 3),
+        (0, 100, 5),
+        (1, 0, 6),
+        (1, 2, 7),          # '😀' is 2 UTF-16 code units
+        (1, 3, 8),
+        (2, 0, 10),
+        (10, 0, 10),
+    ],
+)
+def test_GetOffset(line, character, expected):
+    assert _GetOffset("abcde\n😀xy\n", {"line": line, "character": character}) == expected
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+_URI                                        = Path("Test.md").resolve().as_uri()
+
+_TABLE_OF_CONTENTS                          = textwrap.dedent(
+    """\
+    <!-- [[[ TableOfContents() ]]] -->
+    <!-- [[[end]]] -->
+
+    # Heading 1
+    """,
+)
+
+
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class _Output(object):
+    result: int
+    responses: dict[int, dict[str, Any]]
+    diagnostics: dict[str, list[dict[str, Any]]]        # The last diagnostics published for each uri
+
+
+# ----------------------------------------------------------------------
+def _CreateOpen(
+    text: str,
+    uri: str=_URI,
+) -> dict[str, Any]:
+    return {
+        "method": "textDocument/didOpen",
+        "params": {"textDocument": {"uri": uri, "languageId": "markdown", "version": 1, "text": text}},
+    }
+
+
+# ----------------------------------------------------------------------
+def _CreateChange(
+    start: dict[str, int],
+    end: dict[str, int],
+    text: str,
+) -> dict[str, Any]:
+    return {
+        "method": "textDocument/didChange",
+        "params": {
+            "textDocument": {"uri": _URI, "version": 2},
+            "contentChanges": [{"range": {"start": start, "end": end}, "text": text}],
+        },
+    }
+
+
+# ----------------------------------------------------------------------
+def _CreateCodeActionRequest(
+    message_id: int,
+    uri: str=_URI,
+) -> dict[str, Any]:
+    return {"id": message_id, "method": "textDocument/codeAction", "params": {"textDocument": {"uri": uri}}}
+
+
+# ----------------------------------------------------------------------
+def _Run(
+    messages: list[dict[str, Any]],
+    session: Optional[Session]=None,
+) -> _Output:
+    input_stream = io.BytesIO()
+
+    for message in messages:
+        content = json.dumps({"jsonrpc": "2.0", **message}).encode("UTF-8")
+        input_stream.write("Content-Length: {}\r\n\r\n".format(len(content)).encode("ASCII") + content)
+
+    input_stream.seek(0)
+
+    output_stream = io.BytesIO()
+
+    result = LanguageServer(session or Session()).Run(input_stream, output_stream)
+
+    output_stream.seek(0)
+
+    responses: dict[int, dict[str, Any]] = {}
+    diagnostics: dict[str, list[dict[str, Any]]] = {}
+
+    while True:
+        line = output_stream.readline()
+        if not line:
+            break
+
+        content_length = int(line.decode("ASCII").partition(":")[2])
+
+        output_stream.readline()
+        message = json.loads(output_stream.read(content_length))
+
+        if "id" in message:
+            responses[message["id"]] = message
+        elif message["method"] == "textDocument/publishDiagnostics":
+            diagnostics[message["params"]["uri"]] = message["params"]["diagnostics"]
+
+    return _Output(result, responses, diagnostics)
@@ -0,0 +1,131 @@
+# ----------------------------------------------------------------------
+# |
+# |  LemmaIndex_UnitTest.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-19 15:21:09
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2023
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Unit tests for LemmaIndex.py."""
+
+import sys
+
+from pathlib import Path
+
+import pytest
+
+from Common_Foundation.ContextlibEx import ExitStack
+from Common_Foundation import PathEx
+
+
+# ----------------------------------------------------------------------
+sys.path.insert(0, str(PathEx.EnsureDir(Path(__file__).parent.parent.parent)))
+with ExitStack(lambda: sys.path.pop(0)):
+    from MarkdownModifier.LemmaIndex import LemmaIndex
+
+
+# ----------------------------------------------------------------------
+@pytest.mark.parametrize("newline", ["\n", "\r\n"])
+def test_Standard(newline, tmp_path):
+    lemma_index = _CreateLemmaIndex(tmp_path, newline)
+
+    for word, expected in _LEMMAS.items():
+        assert lemma_index.Lemmatize(word) == tuple(expected.split("/")), word
+
+    lemma_index.Close()
+
+
+# ----------------------------------------------------------------------
+def test_NotFound(tmp_path):
+    lemma_index = _CreateLemmaIndex(tmp_path, "\n")
+
+    # Words before, between, and after the words in the file
+    for word in ["#", "a", "bar", "mouse", "rat", "zzz", "über"]:
+        assert lemma_index.Lemmatize(word) == (word, )
+
+    lemma_index.Close()
+
+
+# ----------------------------------------------------------------------
+def test_Memoized(tmp_path):
+    lemma_index = _CreateLemmaIndex(tmp_path, "\n")
+
+    first = lemma_index.Lemmatize("running")
+    second = lemma_index.Lemmatize("running")
+
+    assert first == ("running", "run")
+    assert first is second
+
+    lemma_index.Close()
+
+
+# ----------------------------------------------------------------------
+def test_GetWords(tmp_path):
+    lemma_index = _CreateLemmaIndex(tmp_path, "\r\n")
+
+    assert lemma_index.GetWords("run") == ("ran", "running", "runs")
+    assert lemma_index.GetWords("mouse") == ("mice", )
+    assert lemma_index.GetWords("running") == ()
+    assert lemma_index.GetWords("rat") == ()
+
+    lemma_index.Close()
+
+
+# ----------------------------------------------------------------------
+def test_EmptyFile(tmp_path):
+    filename = tmp_path / "Lemmas.txt"
+    filename.write_bytes(b"")
+
+    assert LemmaIndex(filename).Lemmatize("mice") == ("mice", )
+    assert LemmaIndex(filename).GetWords("mouse") == ()
+
+
+# ----------------------------------------------------------------------
+def test_BundledFile():
+    lemma_index = LemmaIndex(Path(__file__).parent.parent.parent / "Plugins" / "Data" / "Lemmas.txt")
+
+    assert lemma_index.Lemmatize("mice") == ("mouse", )
+    assert lemma_index.Lemmatize("geese") == ("goose", )
+    assert lemma_index.Lemmatize("ran") == ("run", )
+    assert lemma_index.Lemmatize("bared") == ("bare", )
+    assert lemma_index.Lemmatize("bar") == ("bar", )
+
+    lemma_index.Close()
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+_LEMMAS: dict[str, str]                     = {
+    "bars": "bar",
+    "geese": "goose",
+    "mice": "mouse",
+    "ran": "run",
+    "running": "running/run",
+    "runs": "run",
+    "était": "être",
+}
+
+
+# ----------------------------------------------------------------------
+def _CreateLemmaIndex(
+    tmp_path: Path,
+    newline: str,
+) -> LemmaIndex:
+    filename = tmp_path / "Lemmas.txt"
+
+    lines = ["# Comment"] + [
+        "{}\t{}".format(word, lemmas)
+        for word, lemmas in sorted(_LEMMAS.items(), key=lambda item: item[0].encode("UTF-8"))
+    ]
+
+    filename.write_bytes("".join(line + newline for line in lines).encode("UTF-8"))
+
+    return LemmaIndex(filename)
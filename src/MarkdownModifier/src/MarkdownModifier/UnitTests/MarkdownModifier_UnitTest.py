@@ -25,7 +25,7 @@ import textwrap
 
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import ClassVar
+from typing import Callable, ClassVar, Optional
 from unittest.mock import MagicMock as Mock
 
 import pytest
@@ -39,7 +39,9 @@ from Common_Foundation.Types import overridemethod
 # ----------------------------------------------------------------------
 sys.path.insert(0, str(PathEx.EnsureDir(Path(__file__).parent.parent.parent)))
 with ExitStack(lambda: sys.path.pop(0)):
+    from MarkdownModifier import MarkdownModifier
     from MarkdownModifier.MarkdownModifier import Modify
+    from MarkdownModifier.MarkdownSpans import SpanType, VisitedSpan
     from MarkdownModifier.Plugin import Plugin
 
 
@@ -278,6 +280,42 @@ def test_Exclude(_content):
     )
 
 
+# ----------------------------------------------------------------------
+@pytest.mark.parametrize(
+    "include_plugin_names, expected",
+    [
+        (None, {"Plugin1", "Plugin2"}),
+        ({"Plugin2"}, {"Plugin2"}),
+    ],
+)
+def test_ActivePluginNames(include_plugin_names, expected, _content):
+    active_plugin_names: set[str] = set()
+
+    Modify(
+        Path("the_filename"),
+        _content,
+        [Plugin1(), Plugin2()],
+        Mock(),
+        include_plugin_names=include_plugin_names,
+        active_plugin_names=active_plugin_names,
+    )
+
+    assert active_plugin_names == expected
+
+    # Plugins that don't execute blocks or modify content are not active
+    active_plugin_names.clear()
+
+    Modify(
+        Path("the_filename"),
+        "No blocks.\n",
+        [Plugin2()],
+        Mock(),
+        active_plugin_names=active_plugin_names,
+    )
+
+    assert active_plugin_names == set()
+
+
 # ----------------------------------------------------------------------
 def test_PersistUrls():
     # ----------------------------------------------------------------------
@@ -348,6 +386,156 @@ def test_PersistUrls():
     )
 
 
+# ----------------------------------------------------------------------
+class TestVisitSpans(object):
+    # ----------------------------------------------------------------------
+    @dataclass(frozen=True)
+    class VisitorPlugin(Plugin):
+        # ----------------------------------------------------------------------
+        span_types: set[SpanType]
+        edit_func: Callable[[VisitedSpan], Optional[str]]
+
+        visited: list[list[tuple[SpanType, str]]]                           = field(default_factory=list)
+
+        # ----------------------------------------------------------------------
+        @overridemethod
+        def BeginVisit(
+            self,
+            filename: Path,
+            content: str,
+        ) -> set[SpanType]:
+            return self.span_types
+
+        # ----------------------------------------------------------------------
+        @overridemethod
+        def VisitSpans(
+            self,
+            filename: Path,
+            spans: list[VisitedSpan],
+        ) -> dict[int, str]:
+            self.visited.append([(span.type, span.text) for span in spans])
+
+            edits: dict[int, str] = {}
+
+            for span in spans:
+                text = self.edit_func(span)
+                if text is not None:
+                    edits[span.index] = text
+
+            return edits
+
+        # ----------------------------------------------------------------------
+        @overridemethod
+        def Execute(
+            self,
+            filename: Path,
+            *args,
+            **kwargs,
+        ) -> str:
+            return ""
+
+    # ----------------------------------------------------------------------
+    def test_Standard(self, monkeypatch):
+        num_enumerations = 0
+
+        # ----------------------------------------------------------------------
+        def EnumerateSpans(
+            content: str,
+        ):
+            nonlocal num_enumerations
+
+            num_enumerations += 1
+            return original_enumerate_spans(content)
+
+        # ----------------------------------------------------------------------
+
+        original_enumerate_spans = MarkdownModifier.EnumerateSpans
+        monkeypatch.setattr(MarkdownModifier, "EnumerateSpans", EnumerateSpans)
+
+        upper_plugin = self.__class__.VisitorPlugin("Upper", {SpanType.Prose}, lambda span: span.text.upper())
+        heading_plugin = self.__class__.VisitorPlugin(
+            "Heading",
+            {SpanType.Prose, SpanType.Heading},
+            lambda span: "{} (edited)".format(span.text) if span.type == SpanType.Heading else None,
+        )
+        unused_plugin = self.__class__.VisitorPlugin("Unused", set(), lambda span: "Unused")
+
+        active_plugin_names: set[str] = set()
+
+        assert Modify(
+            Path("filename"),
+            "# Heading\n\nSome `code` text.\n",
+            [upper_plugin, heading_plugin, unused_plugin],
+            Mock(),
+            active_plugin_names=active_plugin_names,
+        ) == "# Heading (edited)\n\nSOME `code` TEXT.\n"
+
+        # The content is split into spans once
+        assert num_enumerations == 1
+
+        # Plugins see the edits made by plugins that visited spans before them
+        assert upper_plugin.visited == [[(SpanType.Prose, "\n\nSome "), (SpanType.Prose, " text.\n")]]
+        assert heading_plugin.visited == [
+            [(SpanType.Heading, "# Heading"), (SpanType.Prose, "\n\nSOME "), (SpanType.Prose, " TEXT.\n")],
+        ]
+        assert unused_plugin.visited == []
+
+        assert active_plugin_names == {"Upper", "Heading"}
+
+    # ----------------------------------------------------------------------
+    def test_BeforePostprocess(self):
+        assert Modify(
+            Path("filename"),
+            "text\n",
+            [Plugin1(), self.__class__.VisitorPlugin("Upper", {SpanType.Prose}, lambda span: span.text.upper())],
+            Mock(),
+        ).startswith("Postprocess (Plugin1)\nfilename: filename\ncontent:\n    ----\n    PREPROCESS (PLUGIN1)\n")
+
+    # ----------------------------------------------------------------------
+    def test_NoEdits(self):
+        content = "# Heading\n\nText.\n"
+
+        active_plugin_names: set[str] = set()
+
+        assert Modify(
+            Path("filename"),
+            content,
+            [self.__class__.VisitorPlugin("Visitor", {SpanType.Prose, SpanType.Heading}, lambda span: span.text)],
+            Mock(),
+            active_plugin_names=active_plugin_names,
+        ) == content
+
+        assert active_plugin_names == set()
+
+    # ----------------------------------------------------------------------
+    def test_InvalidEdit(self):
+        # ----------------------------------------------------------------------
+        @dataclass(frozen=True)
+        class HeadingPlugin(self.__class__.VisitorPlugin):
+            # ----------------------------------------------------------------------
+            @overridemethod
+            def VisitSpans(
+                self,
+                filename: Path,
+                spans: list[VisitedSpan],
+            ) -> dict[int, str]:
+                # The heading is the first span, but only prose spans were visited
+                return {0: "# Edited"}
+
+        # ----------------------------------------------------------------------
+
+        with pytest.raises(
+            Exception,
+            match=re.escape("Visitor: The span '0' was not visited."),
+        ):
+            Modify(
+                Path("filename"),
+                "# Heading\n\nText.\n",
+                [HeadingPlugin("Visitor", {SpanType.Prose}, lambda span: None)],
+                Mock(),
+            )
+
+
 # ----------------------------------------------------------------------
 class TestExceptions(object):
     # ----------------------------------------------------------------------
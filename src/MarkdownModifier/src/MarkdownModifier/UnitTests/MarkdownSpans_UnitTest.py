@@ -0,0 +1,195 @@
+# ----------------------------------------------------------------------
+# |
+# |  MarkdownSpans_UnitTest.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-19 16:31:52
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2023
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Unit tests for MarkdownSpans.py."""
+
+import sys
+import textwrap
+
+from pathlib import Path
+
+import pytest
+
+from Common_Foundation.ContextlibEx import ExitStack
+from Common_Foundation import PathEx
+
+
+# ----------------------------------------------------------------------
+sys.path.insert(0, str(PathEx.EnsureDir(Path(__file__).parent.parent.parent)))
+with ExitStack(lambda: sys.path.pop(0)):
+    from MarkdownModifier.MarkdownSpans import EnumerateSpans, Span, SpanType
+
+
+# ----------------------------------------------------------------------
+def test_Empty():
+    assert list(EnumerateSpans("")) == []
+
+
+# ----------------------------------------------------------------------
+def test_Prose():
+    assert list(EnumerateSpans("Just text.")) == [Span(SpanType.Prose, 0, 10)]
+
+
+# ----------------------------------------------------------------------
+def test_Standard():
+    content = textwrap.dedent(
+        """\
+        # Heading
+        Text `code` and [a link](https://example.com/(one)) and <a href="#two">two</a>.
+
+        ```python
+        code = 1
+        ```
+
+        Setext Heading
+        --------------
+        <div class="three">four&nbsp;five</div> <!-- six
+        seven -->
+
+        [eight]: https://example.com
+        <pre>nine</pre> ten
+        """,
+    )
+
+    assert _Spans(content) == [
+        (SpanType.Heading, "# Heading"),
+        (SpanType.Prose, "\nText "),
+        (SpanType.Code, "`code`"),
+        (SpanType.Prose, " and "),
+        (SpanType.Link, "[a link](https://example.com/(one))"),
+        (SpanType.Prose, " and "),
+        (SpanType.Link, '<a href="#two">two</a>'),
+        (SpanType.Prose, ".\n\n"),
+        (SpanType.Code, "```python\ncode = 1\n```"),
+        (SpanType.Prose, "\n\n"),
+        (SpanType.Heading, "Setext Heading\n--------------"),
+        (SpanType.Prose, "\n"),
+        (SpanType.Markup, '<div class="three">'),
+        (SpanType.Prose, "four"),
+        (SpanType.Markup, "&nbsp;"),
+        (SpanType.Prose, "five"),
+        (SpanType.Markup, "</div>"),
+        (SpanType.Prose, " "),
+        (SpanType.Markup, "<!-- six\nseven -->"),
+        (SpanType.Prose, "\n\n"),
+        (SpanType.Markup, "[eight]: https://example.com"),
+        (SpanType.Prose, "\n"),
+        (SpanType.Code, "<pre>nine</pre>"),
+        (SpanType.Prose, " ten\n"),
+    ]
+
+
+# ----------------------------------------------------------------------
+@pytest.mark.parametrize(
+    "content, expected",
+    [
+        ("```\n```", "```\n```"),
+        ("~~~~\n~~~\n~~~~~", "~~~~\n~~~\n~~~~~"),
+        ("```\n~~~\n```", "```\n~~~\n```"),
+        ("  ```\n  code\n  ```", "  ```\n  code\n  ```"),
+        ("```\nNot closed\n", "```\nNot closed\n"),
+    ],
+)
+def test_Fences(content, expected):
+    assert _Spans(content)[0] == (SpanType.Code, expected)
+
+
+# ----------------------------------------------------------------------
+def test_IndentedCode():
+    content = textwrap.dedent(
+        """\
+            code = 1
+
+            code = 2
+        Text
+            not code
+
+        \tcode = 3
+        """,
+    )
+
+    assert _Spans(content) == [
+        (SpanType.Code, "    code = 1\n\n    code = 2"),
+        (SpanType.Prose, "\nText\n    not code\n\n"),
+        (SpanType.Code, "\tcode = 3"),
+        (SpanType.Prose, "\n"),
+    ]
+
+
+# ----------------------------------------------------------------------
+@pytest.mark.parametrize(
+    "content, expected",
+    [
+        ("`one` and `two`", [(SpanType.Code, "`one`"), (SpanType.Prose, " and "), (SpanType.Code, "`two`")]),
+        ("``one ` two``", [(SpanType.Code, "``one ` two``")]),
+        ("`one\ntwo`", [(SpanType.Code, "`one\ntwo`")]),
+    ],
+)
+def test_CodeSpans(content, expected):
+    assert _Spans(content) == expected
+
+
+# ----------------------------------------------------------------------
+@pytest.mark.parametrize(
+    "content",
+    [
+        "An unmatched ` backtick.\n\nText with a `",
+        "An unmatched `` run of backticks`.",
+        "An unmatched ` backtick.\n  \nText with a `",
+    ],
+)
+def test_UnmatchedBackticks(content):
+    # Code spans can't contain a blank line, and runs of backticks must be closed by a run of the same
+    # length.
+    assert _Spans(content) == [(SpanType.Prose, content)]
+
+
+# ----------------------------------------------------------------------
+@pytest.mark.parametrize(
+    "content",
+    [
+        "#Not a heading",
+        "Text # not a heading",
+        "- List item\n---",
+        "| Table |\n|-------|",
+    ],
+)
+def test_NotHeadings(content):
+    assert all(span_type != SpanType.Heading for span_type, _ in _Spans(content))
+
+
+# ----------------------------------------------------------------------
+def test_ReferenceLinks():
+    assert _Spans("See [one][1] and ![two][].") == [
+        (SpanType.Prose, "See "),
+        (SpanType.Link, "[one][1]"),
+        (SpanType.Prose, " and "),
+        (SpanType.Link, "![two][]"),
+        (SpanType.Prose, "."),
+    ]
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _Spans(
+    content: str,
+) -> list[tuple[SpanType, str]]:
+    spans = list(EnumerateSpans(content))
+
+    # Spans are contiguous and cover all of the content
+    assert "".join(content[span.start:span.end] for span in spans) == content
+
+    return [(span.type, content[span.start:span.end]) for span in spans]
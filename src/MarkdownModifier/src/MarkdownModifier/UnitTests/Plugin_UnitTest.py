@@ -63,6 +63,42 @@ class TestCreateAnchorName(object):
     def test_WithDots(self):
         assert Plugin.CreateAnchorName("Foo.Bar") == "foobar"
 
+    # ----------------------------------------------------------------------
+    def test_GitHub(self):
+        assert Plugin.CreateAnchorName("Foo Bar", Plugin.AnchorStyle.GitHub) == "foo-bar"
+        assert Plugin.CreateAnchorName("Foo.Bar", Plugin.AnchorStyle.GitHub) == "foobar"
+        assert Plugin.CreateAnchorName("What's New? (v1.2)", Plugin.AnchorStyle.GitHub) == "whats-new-v12"
+        assert Plugin.CreateAnchorName("snake_case -- dashes", Plugin.AnchorStyle.GitHub) == "snake_case----dashes"
+        assert Plugin.CreateAnchorName("Überblick: Ärger", Plugin.AnchorStyle.GitHub) == "überblick-ärger"
+
+    # ----------------------------------------------------------------------
+    def test_Memoized(self):
+        first = Plugin.CreateAnchorName("Memoized Value", Plugin.AnchorStyle.GitHub)
+        second = Plugin.CreateAnchorName("Memoized Value", Plugin.AnchorStyle.GitHub)
+
+        assert first == "memoized-value"
+        assert first is second
+
+
+# ----------------------------------------------------------------------
+class TestAnchorNames(object):
+    # ----------------------------------------------------------------------
+    def test_Default(self):
+        anchor_names = Plugin.AnchorNames(Plugin.AnchorStyle.Default)
+
+        assert anchor_names.Create("Foo") == "foo"
+        assert anchor_names.Create("Foo") == "foo"
+
+    # ----------------------------------------------------------------------
+    def test_GitHub(self):
+        anchor_names = Plugin.AnchorNames(Plugin.AnchorStyle.GitHub)
+
+        assert anchor_names.Create("Foo") == "foo"
+        assert anchor_names.Create("Foo") == "foo-1"
+        assert anchor_names.Create("Foo") == "foo-2"
+        assert anchor_names.Create("Foo 1") == "foo-1-1"
+        assert anchor_names.Create("Bar") == "bar"
+
 
 # ----------------------------------------------------------------------
 class TestCreatePlaceholderId(object):
@@ -76,9 +112,13 @@ class TestCreatePlaceholderId(object):
 def test_DefaultMethods():
     p = MyPlugin()
 
+    assert p.IsPrerequisite(Path("filename"), "foo") is False
     assert p.Preprocess(Path("filename"), "foo") == "foo"
     assert p.Postprocess(Path("filename"), "foo") == "foo"
     p.Finalize(Path("filename"), "foo")
+    p.LoadCache(Path("cache_dir"))
+    p.SaveCache(Path("cache_dir"))
+    assert p.GetStatistics() == {}
 
 
 # ----------------------------------------------------------------------
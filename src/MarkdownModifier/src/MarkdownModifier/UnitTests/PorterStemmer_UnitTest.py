@@ -0,0 +1,171 @@
+# ----------------------------------------------------------------------
+# |
+# |  PorterStemmer_UnitTest.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-19 13:48:26
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2023
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Unit tests for PorterStemmer.py."""
+
+import sys
+
+from pathlib import Path
+
+import pytest
+
+from Common_Foundation.ContextlibEx import ExitStack
+from Common_Foundation import PathEx
+
+
+# ----------------------------------------------------------------------
+sys.path.insert(0, str(PathEx.EnsureDir(Path(__file__).parent.parent.parent)))
+with ExitStack(lambda: sys.path.pop(0)):
+    from MarkdownModifier.PorterStemmer import PorterStemmer
+
+
+# ----------------------------------------------------------------------
+@pytest.mark.parametrize(
+    "word, expected",
+    [
+        # Examples from the paper
+        ("caresses", "caress"),
+        ("ponies", "poni"),
+        ("caress", "caress"),
+        ("cats", "cat"),
+        ("feed", "feed"),
+        ("agreed", "agre"),
+        ("plastered", "plaster"),
+        ("bled", "bled"),
+        ("motoring", "motor"),
+        ("sing", "sing"),
+        ("conflated", "conflat"),
+        ("troubled", "troubl"),
+        ("sized", "size"),
+        ("hopping", "hop"),
+        ("falling", "fall"),
+        ("hissing", "hiss"),
+        ("failing", "fail"),
+        ("filing", "file"),
+        ("happy", "happi"),
+        ("relational", "relat"),
+        ("conditional", "condit"),
+        ("digitizer", "digit"),
+        ("hopefulness", "hope"),
+        ("formalize", "formal"),
+        ("electrical", "electr"),
+        ("allowance", "allow"),
+        ("adjustment", "adjust"),
+        ("adoption", "adopt"),
+        ("effective", "effect"),
+        ("probate", "probat"),
+        ("rate", "rate"),
+        ("cease", "ceas"),
+        ("controlling", "control"),
+        ("roll", "roll"),
+
+        # nltk extensions
+        ("ties", "tie"),
+        ("tied", "tie"),
+        ("cried", "cri"),
+        ("enjoy", "enjoy"),
+        ("spy", "spi"),
+        ("radically", "radic"),
+        ("archaeology", "archaeolog"),
+        ("skies", "sky"),
+        ("dying", "die"),
+        ("news", "news"),
+        ("succeed", "succeed"),
+
+        # Case
+        ("Fooing", "foo"),
+        ("ON", "on"),
+    ],
+)
+def test_Stem(word, expected):
+    assert PorterStemmer().Stem(word) == expected
+
+
+# ----------------------------------------------------------------------
+def test_MatchesNltk():
+    nltk_porter = pytest.importorskip("nltk.stem.porter")
+
+    nltk_stemmer = nltk_porter.PorterStemmer()
+    stemmer = PorterStemmer()
+
+    for word in _REFERENCE_WORDS:
+        for variation in [word, word.capitalize(), word.upper()]:
+            assert stemmer.Stem(variation) == nltk_stemmer.stem(variation), variation
+
+
+# ----------------------------------------------------------------------
+# |
+# |  Private Data
+# |
+# ----------------------------------------------------------------------
+_REFERENCE_WORDS                            = """
+    a abandoned abilities ability able abnormally aboard abundance academies accelerating
+    acceptable accessibility accompanied according accumulations achievement acidity
+    activated actively actual adaptation adhesive adjustable administrators admiringly
+    adoptive adverbially aerodynamically agencies agreed airliner alertness alleged
+    allowance alternatively amazingly analogies analogous analysis anger angularity
+    announcing antagonism anxiously apologising appeasement applications archaeology
+    arguably arrangements artificially assignment astonishing attractiveness audibly
+    authorities availability awesome bakery barbecued battled beautifully beginnings
+    believable benefited bicycling biologically bitterness blessing bowdlerize boyish
+    breezy brotherhood bubbling buses butterflies by calculating callousness capabilities
+    carefully carelessness categorization ceased centralization certainty changeable
+    characterizing cheerfully chemically childishness chivalry circumstantial civilization
+    classifications cleverness clumsily coincidentally collectively comfortably commercially
+    communism competitiveness complications computational conceivable conditional
+    conditioning conferencing confidentially conflated conformably considerable
+    constitutionality consumerism controllable controlling conventionally cooperatively
+    corrosive countries criticizing cruelly cultivating curiously customizable daily
+    dangerously deactivated decisiveness defensible definitely deliberately democratically
+    dependent descriptive destabilizing determinations devotional differentially
+    digitizer disagreement discourteously disenfranchised dispensable distinctiveness
+    diversification documentation dominantly downloading dramatically dying eagerly
+    eccentricities economically editorializing educational effectiveness efficiently
+    electrical electricity elegantly emotionally emphasizing employability encouragement
+    energetically engineering enjoyment enthusiastically environmentalism equally
+    essentially evaluations eventually exaggerating exceedingly exceptionally excitability
+    existentialism experimentally explanations expressively extensively fabulously
+    facilitating faithfully fallibility familiarize fascinating feasibility feudalism
+    financially flexibility flies fluently formalize formative fortunately fraternities
+    frustratingly fulfilling fully functionality fundamentally generalization generously
+    gloriously goodness gracefully gradually grammatically gyroscopic happily happiness
+    harmlessly heartily helplessness hesitancy historically homologous hopefulness
+    horizontally hospitality humorously hyperactivity hypothetically identifiable
+    illogically imaginatively immeasurably impartiality impossibility incidentally
+    inconceivably individuality industrialization inevitably inference informational
+    innings institutionalize intellectually interchangeably internationally intuitively
+    irresistibly irritant jealously journalistic judgmental knowledgeable laboriously
+    legitimately liberalization lying magically manageable marginally masterfully
+    mechanically meditative metaphorically methodically microscopically misunderstandings
+    modernization monotonously motivational multiplication mysteriously nationalistic
+    naturally necessarily neighbourhoods news nonetheless normalization noticeably
+    nutritionally obligatory observational occasionally officially operational
+    opportunistic organizational outings overwhelmingly painstakingly paradoxically
+    particularly perceptively periodically personalization philosophically plastered
+    politically ponies possibilities practically predication preferably presidential
+    probabilistically problematically productivity professionally programmatically
+    proportionally prosperously psychologically punctuality qualifications questionably
+    radically rationalization realistically receptiveness recognizable referencing
+    regionally relational relentlessly remarkably repetitively representational
+    responsibilities revival revolutionary ridiculously romantically sarcastically
+    satisfactorily scientifically seasonally sensibility sensitivity sentimentality
+    simplifications skies skillfully sociologically specifically spirituality
+    spontaneously standardization statistically strategically structurally
+    subconsciously substantially successfully sufficiently superficially systematically
+    technologically temperamental theoretically thoughtfulness tied ties traditionally
+    transformational tremendously triplicate troubled tying unavoidably uncomfortably
+    understandably unexpectedly universality unquestionably usefulness valency
+    vegetarianism vietnamization visualization vocationally wonderfully yearly zealously
+""".split()
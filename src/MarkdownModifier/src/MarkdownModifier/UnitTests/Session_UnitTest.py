@@ -0,0 +1,346 @@
+# ----------------------------------------------------------------------
+# |
+# |  Session_UnitTest.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-19 18:40:05
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2023
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Unit tests for Session.py."""
+
+import asyncio
+import os
+import sys
+import textwrap
+
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from Common_Foundation.ContextlibEx import ExitStack
+from Common_Foundation import PathEx
+
+
+# ----------------------------------------------------------------------
+sys.path.insert(0, str(PathEx.EnsureDir(Path(__file__).parent.parent.parent)))
+with ExitStack(lambda: sys.path.pop(0)):
+    from MarkdownModifier.BlockWorker import BlockLimits
+    from MarkdownModifier.Session import LoadPlugins, Session
+
+
+# ----------------------------------------------------------------------
+class TestLoadPlugins(object):
+    # ----------------------------------------------------------------------
+    def test_Standard(self):
+        plugins = LoadPlugins(Path(__file__).parent.parent.parent / "Plugins")
+
+        assert "DefinitionList" in plugins
+        assert "TableOfContents" in plugins
+
+    # ----------------------------------------------------------------------
+    def test_InvalidDir(self, tmp_path):
+        with pytest.raises(Exception, match="The plugin directory '.+' does not exist."):
+            LoadPlugins(tmp_path / "DoesNotExist")
+
+    # ----------------------------------------------------------------------
+    def test_NoPlugins(self, tmp_path):
+        with pytest.raises(Exception, match="No plugins were found in '.+'."):
+            LoadPlugins(tmp_path)
+
+    # ----------------------------------------------------------------------
+    def test_MissingPlugin(self, tmp_path):
+        (tmp_path / "SessionUnitTestMissingPlugin.py").write_text("Value = 1\n")
+
+        with pytest.raises(Exception, match="A plugin was not found in '.+'."):
+            LoadPlugins(tmp_path)
+
+
+# ----------------------------------------------------------------------
+class TestSession(object):
+    # ----------------------------------------------------------------------
+    def test_Modify(self):
+        session = Session()
+
+        assert session.Modify(Path("One.md"), _TABLE_OF_CONTENTS) == _TABLE_OF_CONTENTS_RESULT
+        assert session.Modify(Path("Two.md"), "Nothing to change.\n") == "Nothing to change.\n"
+
+    # ----------------------------------------------------------------------
+    def test_PluginNames(self):
+        session = Session(exclude_plugin_names={"TableOfContents"})
+
+        assert session.Modify(Path("One.md"), _TABLE_OF_CONTENTS) == _TABLE_OF_CONTENTS.replace(
+            "<!-- [[[end]]] -->",
+            "\n<!-- [[[end]]] -->",
+        )
+
+        with pytest.raises(Exception, match="'DoesNotExist' is not a valid plugin name."):
+            Session(include_plugin_names={"DoesNotExist"})
+
+    # ----------------------------------------------------------------------
+    def test_StatePreserved(self):
+        session = Session()
+
+        session.Modify(Path("Glossary.md").resolve(), _GLOSSARY)
+
+        assert session.Modify(Path("Page.md").resolve(), "Some widgets.\n") == (
+            'Some <a href="Glossary.md#widget" data-definition-list-link=1>widgets</a>.\n'
+        )
+
+    # ----------------------------------------------------------------------
+    def test_ModifySamePrerequisite(self):
+        session = Session()
+
+        glossary = Path("Glossary.md").resolve()
+
+        session.Modify(glossary, _GLOSSARY)
+        session.Modify(glossary, _GLOSSARY.replace("widget", "gadget"))
+
+        # Only the latest content is replayed in worker processes
+        assert session._prerequisites == {glossary: _GLOSSARY.replace("widget", "gadget")}  # pylint: disable=protected-access
+
+        # Content that is no longer a prerequisite isn't replayed
+        session.Modify(glossary, "No definitions.\n")
+        assert session._prerequisites == {}  # pylint: disable=protected-access
+
+    # ----------------------------------------------------------------------
+    def test_ModifySameFile(self):
+        session = Session()
+
+        content = _TABLE_OF_CONTENTS + "".join("## Heading {}\n".format(index) for index in range(50))
+
+        results = [session.Modify(Path("One.md"), content) for _ in range(20)]
+
+        assert '<a href="#heading-49">Heading 49</a>' in results[0]
+        assert all(result == results[0] for result in results)
+
+        # State associated with a file isn't retained once the file has been modified
+        assert session.plugins["TableOfContents"]._sections == {}  # pylint: disable=protected-access
+        assert session.plugins["DefinitionList"]._postprocess_infos == {}  # pylint: disable=protected-access
+
+    # ----------------------------------------------------------------------
+    def test_ModifySameFileAfterError(self):
+        session = Session()
+
+        with pytest.raises(Exception, match="DoesNotExist"):
+            session.Modify(
+                Path("Page.md"),
+                textwrap.dedent(
+                    """\
+                    <!-- [[[ TableOfContents() ]]] -->
+                    <!-- [[[end]]] -->
+                    <!-- [[[ DefinitionList({"widget": "The definition for widget."}) ]]] -->
+                    <!-- [[[end]]] -->
+                    <!-- [[[ DoesNotExist() ]]] -->
+                    <!-- [[[end]]] -->
+                    """,
+                ),
+            )
+
+        # State recorded by the modification that failed isn't used when the file is modified again
+        assert session.Modify(Path("Page.md"), "Some widgets.\n") == "Some widgets.\n"
+
+        assert session.plugins["TableOfContents"]._sections == {}  # pylint: disable=protected-access
+
+    # ----------------------------------------------------------------------
+    def test_CacheDir(self, tmp_path):
+        with Session(cache_dir=tmp_path) as session:
+            session.Modify(Path("Glossary.md").resolve(), _GLOSSARY)
+            session.Modify(Path("Page.md").resolve(), "Some widgets.\n")
+
+        assert (tmp_path / "DefinitionList.stems.json").is_file()
+
+    # ----------------------------------------------------------------------
+    def test_BlockLimits(self):
+        with Session(block_limits=BlockLimits(max_seconds=5)) as session:
+            assert session.Modify(Path("One.md"), _TABLE_OF_CONTENTS) == _TABLE_OF_CONTENTS_RESULT
+
+            # Blocks are executed in the worker process
+            assert session.Modify(
+                Path("Two.md"),
+                "<!-- [[[ import os; cog.outl(str(os.getpid() != {})) ]]] -->\n<!-- [[[end]]] -->\n".format(os.getpid()),
+            ) == "<!-- [[[ import os; cog.outl(str(os.getpid() != {})) ]]] -->\nTrue\n<!-- [[[end]]] -->\n".format(os.getpid())
+
+    # ----------------------------------------------------------------------
+    def test_ModifyMany(self):
+        session = Session()
+
+        consumed: list[Path] = []
+
+        # ----------------------------------------------------------------------
+        def Items() -> Iterator[tuple[Path, str]]:
+            for filename, content in [
+                (Path("One.md"), _TABLE_OF_CONTENTS),
+                (Path("Two.md"), "<!-- [[[ DoesNotExist() ]]] -->\n<!-- [[[end]]] -->\n"),
+                (Path("Three.md"), "Nothing to change.\n"),
+            ]:
+                consumed.append(filename)
+                yield filename, content
+
+        # ----------------------------------------------------------------------
+
+        results = session.ModifyMany(Items())
+
+        # Results are lazy
+        assert consumed == []
+
+        assert next(results) == (Path("One.md"), _TABLE_OF_CONTENTS_RESULT)
+        assert consumed == [Path("One.md")]
+
+        filename, result = next(results)
+        assert filename == Path("Two.md")
+        assert isinstance(result, Exception)
+        assert "DoesNotExist" in str(result)
+
+        assert list(results) == [(Path("Three.md"), "Nothing to change.\n")]
+
+    # ----------------------------------------------------------------------
+    def test_ModifyManyParallel(self):
+        session = Session()
+
+        # Prerequisites modified by the session are replayed in the worker processes
+        session.Modify(Path("Glossary.md").resolve(), _GLOSSARY)
+
+        items = [(Path("Page{}.md".format(index)).resolve(), "Some widgets.\n") for index in range(6)]
+        items.append((Path("One.md"), _TABLE_OF_CONTENTS))
+
+        assert list(session.ModifyMany(items, max_num_processes=2)) == [
+            (filename, 'Some <a href="Glossary.md#widget" data-definition-list-link=1>widgets</a>.\n')
+            for filename, _ in items[:-1]
+        ] + [(Path("One.md"), _TABLE_OF_CONTENTS_RESULT)]
+
+
+# ----------------------------------------------------------------------
+class TestModifyAsync(object):
+    # ----------------------------------------------------------------------
+    def test_Standard(self):
+        session = Session()
+
+        statuses: list[str] = []
+
+        # ----------------------------------------------------------------------
+        async def Impl() -> list[str]:
+            loop = asyncio.get_running_loop()
+
+            # ----------------------------------------------------------------------
+            def OnStatusUpdate(status_id, text) -> None:  # pylint: disable=unused-argument
+                # Status updates are delivered on the event loop
+                assert asyncio.get_running_loop() is loop
+                statuses.append(text)
+
+            # ----------------------------------------------------------------------
+
+            return list(
+                await asyncio.gather(
+                    session.ModifyAsync(Path("One.md"), _TABLE_OF_CONTENTS, OnStatusUpdate),
+                    session.ModifyAsync(Path("Two.md"), "Nothing to change.\n"),
+                ),
+            )
+
+        # ----------------------------------------------------------------------
+
+        assert asyncio.run(Impl()) == [_TABLE_OF_CONTENTS_RESULT, "Nothing to change.\n"]
+        assert statuses
+
+    # ----------------------------------------------------------------------
+    def test_Error(self):
+        session = Session()
+
+        with pytest.raises(Exception, match="DoesNotExist"):
+            asyncio.run(
+                session.ModifyAsync(Path("One.md"), "<!-- [[[ DoesNotExist() ]]] -->\n<!-- [[[end]]] -->\n"),
+            )
+
+    # ----------------------------------------------------------------------
+    def test_Concurrency(self):
+        session = Session(max_async_concurrency=1)
+
+        # ----------------------------------------------------------------------
+        async def Impl() -> bool:
+            assert session._async_semaphore is not None  # pylint: disable=protected-access
+
+            # Occupy the only slot so that other calls wait
+            async with session._async_semaphore:  # pylint: disable=protected-access
+                task = asyncio.create_task(session.ModifyAsync(Path("One.md"), _TABLE_OF_CONTENTS))
+
+                await asyncio.sleep(0.1)
+                assert not task.done()
+
+                task.cancel()
+
+                with pytest.raises(asyncio.CancelledError):
+                    await task
+
+            return await session.ModifyAsync(Path("One.md"), _TABLE_OF_CONTENTS) == _TABLE_OF_CONTENTS_RESULT
+
+        # ----------------------------------------------------------------------
+
+        assert asyncio.run(Impl())
+
+    # ----------------------------------------------------------------------
+    def test_ProcessExecutor(self):
+        session = Session()
+
+        session.Modify(Path("Glossary.md").resolve(), _GLOSSARY)
+
+        # ----------------------------------------------------------------------
+        async def Impl() -> list[str]:
+            with session.CreateProcessExecutor(2) as executor:
+                return list(
+                    await asyncio.gather(
+                        *(
+                            session.ModifyAsync(Path("Page{}.md".format(index)).resolve(), "Some widgets.\n", executor=executor)
+                            for index in range(4)
+                        ),
+                    ),
+                )
+
+        # ----------------------------------------------------------------------
+
+        assert asyncio.run(Impl()) == [
+            'Some <a href="Glossary.md#widget" data-definition-list-link=1>widgets</a>.\n',
+        ] * 4
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+_TABLE_OF_CONTENTS                          = textwrap.dedent(
+    """\
+    <!-- [[[ TableOfContents() ]]] -->
+    <!-- [[[end]]] -->
+
+    # Heading 1
+    """,
+)
+
+_TABLE_OF_CONTENTS_RESULT                   = textwrap.dedent(
+    """\
+    <!-- [[[ TableOfContents() ]]] -->
+    <div>1 <a href="#heading-1">Heading 1</a></div>
+    <!-- [[[end]]] -->
+
+    # Heading 1
+    """,
+)
+
+_GLOSSARY                                   = textwrap.dedent(
+    """\
+    <!-- [[[
+        DefinitionList(
+            {
+                "widget": "The definition for widget.",
+            },
+            export=True,
+        )
+    ]]] -->
+    <!-- [[[end]]] -->
+    """,
+)
@@ -0,0 +1,62 @@
+# ----------------------------------------------------------------------
+# |
+# |  Templates_UnitTest.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-19 10:21:07
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2023
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Unit tests for Templates.py."""
+
+import sys
+
+from pathlib import Path
+
+from Common_Foundation.ContextlibEx import ExitStack
+from Common_Foundation import PathEx
+
+
+# ----------------------------------------------------------------------
+sys.path.insert(0, str(PathEx.EnsureDir(Path(__file__).parent.parent.parent)))
+with ExitStack(lambda: sys.path.pop(0)):
+    from MarkdownModifier.Templates import Template
+
+
+# ----------------------------------------------------------------------
+def test_Dedent():
+    template = Template(
+        """\
+            <div>
+              {value}
+            </div>
+        """,
+    )
+
+    assert template.content == "<div>\n  {value}\n</div>\n"
+    assert template.Render(value="foo") == "<div>\n  foo\n</div>\n"
+
+
+# ----------------------------------------------------------------------
+def test_NoDedent():
+    template = Template("  {value}", dedent=False)
+
+    assert template.Render(value="foo") == "  foo"
+
+
+# ----------------------------------------------------------------------
+def test_RenderTo():
+    template = Template("<{value}>")
+
+    buffer: list[str] = []
+
+    template.RenderTo(buffer, value="one")
+    template.RenderTo(buffer, value="two")
+
+    assert buffer == ["<one>", "<two>"]
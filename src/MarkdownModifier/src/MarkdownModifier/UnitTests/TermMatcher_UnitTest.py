@@ -0,0 +1,178 @@
+# ----------------------------------------------------------------------
+# |
+# |  TermMatcher_UnitTest.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-19 11:41:52
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2023
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Unit tests for TermMatcher.py."""
+
+import re
+import sys
+
+from pathlib import Path
+
+import pytest
+
+from Common_Foundation.ContextlibEx import ExitStack
+from Common_Foundation import PathEx
+
+
+# ----------------------------------------------------------------------
+sys.path.insert(0, str(PathEx.EnsureDir(Path(__file__).parent.parent.parent)))
+with ExitStack(lambda: sys.path.pop(0)):
+    from MarkdownModifier.TermMatcher import TermMatcher
+
+
+# ----------------------------------------------------------------------
+def test_Empty():
+    matcher = TermMatcher()
+
+    assert len(matcher) == 0
+    assert list(matcher.Finditer("foo bar")) == []
+    assert matcher.Sub("foo bar", lambda text, value: "X") == "foo bar"
+
+
+# ----------------------------------------------------------------------
+def test_WordBoundaries():
+    matcher = _Create(("foo", False), ("foo bar", False))
+
+    assert matcher.Sub("foo foobar barfoo foo bar foo_bar (foo).", _Replace) == "[0:foo] foobar barfoo [0:foo] bar foo_bar ([0:foo])."
+
+
+# ----------------------------------------------------------------------
+def test_FirstTermWins():
+    # Like a regular expression alternation, the first term wins even if a longer term matches
+    assert _Create(("foo", False), ("foo bar", False)).Sub("foo bar", _Replace) == "[0:foo] bar"
+    assert _Create(("foo bar", False), ("foo", False)).Sub("foo bar", _Replace) == "[0:foo bar]"
+
+
+# ----------------------------------------------------------------------
+def test_CaseInsensitive():
+    matcher = _Create(("Foo", False), ("bar", True))
+
+    assert matcher.Sub("Foo foo FOO Bar bar BAR", _Replace) == "[0:Foo] foo FOO [1:Bar] [1:bar] [1:BAR]"
+
+
+# ----------------------------------------------------------------------
+def test_MixedCaseSensitivity():
+    matcher = _Create(("foo", False), ("FOO", True))
+
+    assert matcher.Sub("foo FOO Foo", _Replace) == "[0:foo] [1:FOO] [1:Foo]"
+
+
+# ----------------------------------------------------------------------
+def test_ExcludedPrefixesAndSuffixes():
+    matcher = _Create(
+        ("foo", True),
+        excluded_prefixes=(">", 'id="'),
+        excluded_suffixes=("<", ),
+    )
+
+    assert matcher.Sub('<a id="foo">foo</a> foo <b>foo bar</b> bar foo<', _Replace) == '<a id="foo">foo</a> [0:foo] <b>foo bar</b> bar foo<'
+
+
+# ----------------------------------------------------------------------
+def test_NonWordCharacters():
+    matcher = _Create((".NET", True), ("C++", False))
+
+    # These terms are subject to the same word boundary rules as an equivalent regular expression
+    assert matcher.Sub("a.NET .NET C++ C++a", _Replace) == "a[0:.NET] .NET C++ [1:C++]a"
+
+
+# ----------------------------------------------------------------------
+def test_Finditer():
+    matcher = _Create(("foo", False), ("bar", True))
+
+    assert list(matcher.Finditer("foo BAR baz")) == [(0, 3, 0), (4, 7, 1)]
+
+
+# ----------------------------------------------------------------------
+def test_MatchesRegularExpression():
+    terms = [
+        ("a", False),
+        ("Ab", True),
+        ("b a", True),
+        ("a-b", False),
+        ("-a", False),
+        ("ba", True),
+    ]
+
+    content = 'a ab AB b a B A a-b a-ba -a >a a< id="a" ba bA b_a ab-a'
+
+    regex = re.compile(
+        r'(?<!\>)(?<!id=")\b(?:{})\b(?!\<)'.format(
+            "|".join(
+                "(?i:{})".format(re.escape(term)) if case_insensitive else re.escape(term)
+                for term, case_insensitive in terms
+            ),
+        ),
+    )
+
+    # ----------------------------------------------------------------------
+    def RegexReplace(
+        match: re.Match,
+    ) -> str:
+        text = match.group(0)
+
+        for index, (term, case_insensitive) in enumerate(terms):
+            if text == term or (case_insensitive and text.lower() == term.lower()):
+                return _Replace(text, index)
+
+        assert False, text  # pragma: no cover
+
+    # ----------------------------------------------------------------------
+
+    matcher = _Create(
+        *terms,
+        excluded_prefixes=(">", 'id="'),
+        excluded_suffixes=("<", ),
+    )
+
+    assert matcher.Sub(content, _Replace) == regex.sub(RegexReplace, content)
+
+
+# ----------------------------------------------------------------------
+def test_ErrorEmptyTerm():
+    with pytest.raises(
+        ValueError,
+        match=re.escape("Terms must not be empty."),
+    ):
+        TermMatcher().Add("", 0, case_insensitive=False)
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _Create(
+    *terms: tuple[str, bool],
+    excluded_prefixes: tuple[str, ...]=(),
+    excluded_suffixes: tuple[str, ...]=(),
+) -> TermMatcher[int]:
+    matcher: TermMatcher[int] = TermMatcher(
+        excluded_prefixes=excluded_prefixes,
+        excluded_suffixes=excluded_suffixes,
+    )
+
+    for index, (term, case_insensitive) in enumerate(terms):
+        matcher.Add(term, index, case_insensitive=case_insensitive)
+
+    assert len(matcher) == len(terms)
+
+    return matcher
+
+
+# ----------------------------------------------------------------------
+def _Replace(
+    text: str,
+    value: int,
+) -> str:
+    return "[{}:{}]".format(value, text)
@@ -0,0 +1,92 @@
+# ----------------------------------------------------------------------
+# |
+# |  GenerateLemmas.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-19 14:36:12
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2023
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""\
+Generates Lemmas.txt from the lemma lookup table distributed with LemmInflect
+(https://github.com/bjascob/LemmInflect).
+
+This script only needs to be run when updating Lemmas.txt; LemmInflect is not required at runtime.
+To run:
+
+    pip install lemminflect
+    python GenerateLemmas.py
+"""
+
+import gzip
+import importlib.resources
+
+from pathlib import Path
+
+import typer
+
+
+# ----------------------------------------------------------------------
+app                                         = typer.Typer(
+    no_args_is_help=False,
+    pretty_exceptions_show_locals=False,
+)
+
+
+# ----------------------------------------------------------------------
+@app.command("Generate")
+def Generate(
+    output_filename: Path=typer.Argument(Path(__file__).parent / "Lemmas.txt", dir_okay=False, resolve_path=True, help="Name of the file to generate."),
+) -> None:
+    """Generates the sorted lemma file used by the DefinitionList plugin."""
+
+    lemmas: dict[str, list[str]] = {}
+
+    with importlib.resources.files("lemminflect.resources").joinpath("lemma_lu.csv.gz").open("rb") as raw_file:
+        with gzip.open(raw_file, "rt", encoding="UTF-8") as f:
+            for line in f:
+                # Format: <word>,<category>,<lemma>[/<lemma>...]
+                word, _, forms = line.strip().split(",")
+
+                word = word.lower()
+                these_lemmas = lemmas.setdefault(word, [])
+
+                for form in forms.split("/"):
+                    form = form.lower()
+
+                    if form not in these_lemmas:
+                        these_lemmas.append(form)
+
+    # Words that are only lemmas of themselves don't need to be stored
+    lemmas = {
+        word: these_lemmas
+        for word, these_lemmas in lemmas.items()
+        if these_lemmas != [word] and word > "#"
+    }
+
+    with output_filename.open("wb") as f:
+        # Comment lines are sorted and sort before all words, so they don't interfere with binary
+        # searches.
+        f.write(
+            (
+                "# Format: <word>\\t<lemma>[/<lemma>...], sorted by the UTF-8 encoding of <word>.\n"
+                "# Generated by GenerateLemmas.py; do not edit.\n"
+                "# Source: LemmInflect (MIT License, Copyright (c) 2019 Brad Jascob), derived from the NIH SPECIALIST Lexicon.\n"
+            ).encode("UTF-8"),
+        )
+
+        for word in sorted(lemmas, key=lambda word: word.encode("UTF-8")):
+            f.write("{}\t{}\n".format(word, "/".join(lemmas[word])).encode("UTF-8"))
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+if __name__ == "__main__":
+    app()
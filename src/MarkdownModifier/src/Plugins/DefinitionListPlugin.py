@@ -15,22 +15,31 @@
 # ----------------------------------------------------------------------
 """Contains the Plugin object"""
 
+import functools
+import json
+import os
 import re
 import string
-import textwrap
+import sys
+import threading
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from enum import auto, IntFlag
+from enum import auto, Enum, IntFlag
 from pathlib import Path
-from typing import ClassVar, Match, Optional, Protocol, Union
+from typing import Any, Callable, ClassVar, Iterable, Iterator, Match, Optional, Protocol, Union
 
 from Common_Foundation import RegularExpression
 from Common_Foundation.Types import overridemethod
 
 from Common_FoundationEx.InflectEx import inflect
 
+from MarkdownModifier.LemmaIndex import LemmaIndex  # type: ignore  # pylint: disable=import-error
+from MarkdownModifier.MarkdownSpans import SpanType, VisitedSpan  # type: ignore  # pylint: disable=import-error
 from MarkdownModifier.Plugin import Plugin as PluginBase  # type: ignore  # pylint: disable=import-error
+from MarkdownModifier.PorterStemmer import PorterStemmer  # type: ignore  # pylint: disable=import-error
+from MarkdownModifier.Templates import Template  # type: ignore  # pylint: disable=import-error
+from MarkdownModifier.TermMatcher import TermMatcher  # type: ignore  # pylint: disable=import-error
 
 
 # ----------------------------------------------------------------------
@@ -56,6 +65,13 @@ class Plugin(PluginBase):
         NoPostprocessing                    = 0
         Default                             = CaseInsensitive | Stemming
 
+    # ----------------------------------------------------------------------
+    class StemmerBackend(Enum):
+        """Implementation used to stem terms."""
+
+        BuiltIn                             = auto()    # Self-contained Porter stemmer; fast to load
+        Nltk                                = auto()    # nltk's Porter stemmer; produces the same stems
+
     # ----------------------------------------------------------------------
     @dataclass(frozen=True)
     class DefinitionInfo(object):
@@ -84,7 +100,27 @@ class Plugin(PluginBase):
     # ----------------------------------------------------------------------
     name: ClassVar[str]                     = "DefinitionList"
 
-    _postprocess_infos: list["Plugin._PostprocessInfo"]                     = field(init=False, default_factory=list)
+    # Links are inserted with a single regular expression when there are fewer matchers than this
+    # value; a TermMatcher is used otherwise. The cost of matching with a regular expression
+    # alternation grows with the number of terms, while the cost of matching with a TermMatcher
+    # does not (but has higher constant overhead).
+    TERM_MATCHER_THRESHOLD: ClassVar[int]   = 64
+
+    # The built-in stemmer avoids the (significant) time and memory required to import nltk
+    STEMMER_BACKEND: ClassVar[StemmerBackend]                               = StemmerBackend.BuiltIn
+
+    # Definitions are associated with the file that defined them until that file is postprocessed
+    _postprocess_infos: dict[Path, list["Plugin._PostprocessInfo"]]         = field(init=False, default_factory=dict)
+
+    # Exported definitions, organized by the file that defined them, and the glossary created from them
+    _exported_infos: dict[Path, list["Plugin._PostprocessInfo"]]            = field(init=False, default_factory=dict)
+    _glossary: Optional["_Glossary"]                                        = field(init=False, default=None)
+
+    # Data used to insert links into a file, from the time that the file begins to be visited until its spans are visited
+    _visit_infos: dict[Path, "Plugin._VisitInfo"]                          = field(init=False, default_factory=dict)
+
+    # Files that export definitions used when postprocessing a file, until the file is finalized
+    _dependencies: dict[Path, set[Path]]                                    = field(init=False, default_factory=dict)
 
     # ----------------------------------------------------------------------
     # |
@@ -98,25 +134,61 @@ class Plugin(PluginBase):
         *,
         indentation: int=2,
     ) -> str:
-        indentation_value = "".join(["&nbsp;", ] * indentation)
-
-        return "".join(
-            textwrap.dedent(
-                """\
-                <p>
-                  <div><i><a id="{anchor}">{key}</a></i></div>
-                  <div>{indentation}{definition}</div>
-                </p>
-                """,
-            ).format(
-                anchor=value.anchor,
-                key=key,
-                indentation=indentation_value,
-                definition=value.definition,
-            )
-            for key, value in definitions.items()
+        return _RenderDefinitions(
+            _DEFAULT_DEFINITION_TEMPLATE,
+            definitions,
+            "&nbsp;" * indentation,
+        )
+
+    # ----------------------------------------------------------------------
+    @staticmethod
+    def HtmlListGenerateContent(
+        filename: Path,  # pylint: disable=unused-argument
+        definitions: dict[str, "Plugin.DefinitionInfo"],
+        *,
+        indentation: int=2,
+    ) -> str:
+        """Generates the definitions as an HTML definition list (<dl>)."""
+
+        return "<dl>\n{}</dl>\n".format(
+            _RenderDefinitions(
+                _HTML_LIST_DEFINITION_TEMPLATE,
+                definitions,
+                " " * indentation,
+            ),
+        )
+
+    # ----------------------------------------------------------------------
+    @staticmethod
+    def MarkdownListGenerateContent(
+        filename: Path,  # pylint: disable=unused-argument
+        definitions: dict[str, "Plugin.DefinitionInfo"],
+        *,
+        indentation: int=2,  # pylint: disable=unused-argument
+    ) -> str:
+        """Generates the definitions as a Markdown list."""
+
+        return _RenderDefinitions(
+            _MARKDOWN_LIST_DEFINITION_TEMPLATE,
+            definitions,
+            "",
         )
 
+    # ----------------------------------------------------------------------
+    @overridemethod
+    def Preprocess(
+        self,
+        filename: Path,
+        content: str,
+    ) -> str:
+        # Discard the data of a previous modification of this file that failed before it was
+        # finalized, so that it isn't used when modifying the file again.
+        self._postprocess_infos.pop(filename, None)
+        self._visit_infos.pop(filename, None)
+        self._dependencies.pop(filename, None)
+
+        return content
+
     # ----------------------------------------------------------------------
     @overridemethod
     def Execute(
@@ -127,8 +199,20 @@ class Plugin(PluginBase):
         postprocess_type: PostprocessType=PostprocessType.Default,
         indentation: int=2,
         generate_content_func: GenerateContentFuncType=DefaultGenerateContent,
+        anchor_style: PluginBase.AnchorStyle=PluginBase.AnchorStyle.Default,
+        export: bool=False,
     ) -> str:
+        """\
+        Generates content for the definitions.
+
+        Exported definitions are linked in all of the files processed (rather than just this one).
+        Files that export definitions are processed before other files; see `IsPrerequisite`.
+        """
+
         resolved_definitions: dict[str, Plugin.DefinitionInfo] = {}
+        postprocess_infos = self._postprocess_infos.setdefault(filename, [])
+
+        anchor_names = self.__class__.AnchorNames(anchor_style)
 
         for key, value in definitions.items():
             if isinstance(value, str):
@@ -137,7 +221,7 @@ class Plugin(PluginBase):
             assert isinstance(value, Plugin.DefinitionInfo), value
 
             if value.anchor is None:
-                object.__setattr__(value, "anchor", self.__class__.CreateAnchorName(key))
+                object.__setattr__(value, "anchor", anchor_names.Create(key))
 
             assert value.anchor is not None
 
@@ -148,8 +232,8 @@ class Plugin(PluginBase):
             if this_postprocess_type == Plugin.PostprocessType.NoPostprocessing:
                 continue
 
-            self._postprocess_infos.append(
-                Plugin._PostprocessInfo(key, value.anchor, this_postprocess_type),
+            postprocess_infos.append(
+                Plugin._PostprocessInfo(key, value.anchor, this_postprocess_type, export),
             )
 
         return generate_content_func(
@@ -160,247 +244,283 @@ class Plugin(PluginBase):
 
     # ----------------------------------------------------------------------
     @overridemethod
-    def Postprocess(
+    def GetPureExecuteVersion(self) -> Optional[str]:
+        # The output of Execute depends only on its arguments, and the definitions that it records
+        # are restored via SetExecuteState; update this value when the generated content changes.
+        return "1"
+
+    # ----------------------------------------------------------------------
+    @overridemethod
+    def GetExecuteState(
+        self,
+        filename: Path,
+    ) -> Optional[Any]:
+        return [
+            [info.term, info.anchor, info.postprocess_type.value, info.export]
+            for info in self._postprocess_infos.get(filename, [])
+        ]
+
+    # ----------------------------------------------------------------------
+    @overridemethod
+    def SetExecuteState(
+        self,
+        filename: Path,
+        state: Any,
+    ) -> None:
+        self._postprocess_infos[filename] = [
+            Plugin._PostprocessInfo(term, anchor, Plugin.PostprocessType(postprocess_type), export)
+            for term, anchor, postprocess_type, export in state
+        ]
+
+    # ----------------------------------------------------------------------
+    @overridemethod
+    def IsPrerequisite(
         self,
         filename: Path,  # pylint: disable=unused-argument
         content: str,
-    ) -> str:
-        link_template = '<a href="#{anchor}" data-definition-list-link=1>{text}</a>'
-
-        # Remove previous content
-        content = RegularExpression.TemplateStringToRegex(
-            link_template,
-            match_whole_string=False,
-        ).sub(
-            lambda match: match.group("text"),
-            content,
-        )
+    ) -> bool:
+        # Files that export definitions must be processed before the files that link to them
+        return self.name in content and _EXPORT_REGEX.search(content) is not None
+
+    # ----------------------------------------------------------------------
+    @overridemethod
+    def LoadCache(
+        self,
+        cache_dir: Path,
+    ) -> None:
+        _stem_cache.SetBackend(self.__class__.STEMMER_BACKEND)
+        _stem_cache.Load(cache_dir / "{}.stems.json".format(self.name))
+
+    # ----------------------------------------------------------------------
+    @overridemethod
+    def SaveCache(
+        self,
+        cache_dir: Path,
+    ) -> None:
+        _stem_cache.SetBackend(self.__class__.STEMMER_BACKEND)
+        _stem_cache.Save(cache_dir / "{}.stems.json".format(self.name))
+
+    # ----------------------------------------------------------------------
+    @overridemethod
+    def GetDependencies(
+        self,
+        filename: Path,
+    ) -> set[Path]:
+        return self._dependencies.pop(filename, set())
+
+    # ----------------------------------------------------------------------
+    @overridemethod
+    def GetStatistics(self) -> dict[str, Any]:
+        return {
+            **_stem_cache.GetStatistics(),
+            **_ngram_trie_cache.GetStatistics(),
+        }
+
+    # ----------------------------------------------------------------------
+    @overridemethod
+    def BeginVisit(
+        self,
+        filename: Path,
+        content: str,
+    ) -> set[SpanType]:
+        postprocess_infos = self._postprocess_infos.pop(filename, [])
+
+        self._UpdateExports(filename, postprocess_infos)
+
+        # Links inserted during previous invocations are replaced in the same traversal that inserts
+        # new links; there is nothing to replace if the content doesn't contain any of them.
+        has_previous_links = _LINK_MARKER in content
 
         # Create the data used to populate the content
+        matchers, ngram_terms = _CreateMatchers(postprocess_infos, None)
 
-        # ----------------------------------------------------------------------
-        @dataclass(frozen=True)
-        class Matcher(ABC):
-            # ----------------------------------------------------------------------
-            term: str
-            anchor: str
-            postprocess_type: Plugin.PostprocessType
+        prefilters: list[Optional[_Prefilter]] = []
 
-            # ----------------------------------------------------------------------
-            def Clone(
-                self,
-                term: str,
-            ) -> "Matcher":
-                return self.__class__(term, self.anchor, self.postprocess_type)
+        if matchers:
+            prefilters.append(_Prefilter.Create(matchers))
 
-            # ----------------------------------------------------------------------
-            @abstractmethod
-            def CreateRegex(self) -> str:
-                raise Exception("Abstract method")  # pragma: no cover
+        # Resolve stemmed and lemmatised tokens with a single lookup rather than by scanning all of
+        # the matchers; definitions in this file take precedence over exported definitions.
+        stemming_lookups: list[_MatcherLookup] = []
+        lemmatisation_lookups: list[_MatcherLookup] = []
 
-            # ----------------------------------------------------------------------
-            @abstractmethod
-            def MatchTerm(
-                self,
-                matching_text: str,
-            ) -> bool:
-                raise Exception("Abstract method")  # pragma: no cover
+        stemming_lookup, lemmatisation_lookup = _CreateLookups(matchers)
 
-            # ----------------------------------------------------------------------
-            def CreateLink(
-                self,
-                matching_text: str,
-            ) -> str:
-                return link_template.format(
-                    anchor=self.anchor,
-                    text=matching_text,
-                )
+        if stemming_lookup is not None:
+            stemming_lookups.append(stemming_lookup)
+        if lemmatisation_lookup is not None:
+            lemmatisation_lookups.append(lemmatisation_lookup)
 
-        # ----------------------------------------------------------------------
-        @dataclass(frozen=True)
-        class CaseSensitiveMatcher(Matcher):
-            # ----------------------------------------------------------------------
-            @overridemethod
-            def CreateRegex(self) -> str:
-                return re.escape(self.term)
+        glossary = self._GetGlossary()
 
-            # ----------------------------------------------------------------------
-            @overridemethod
-            def MatchTerm(
-                self,
-                matching_text: str,
-            ) -> bool:
-                return matching_text == self.term
+        if glossary is not None:
+            # The file depends upon all of the exporting files (rather than just those whose
+            # definitions are linked), as changes to any of them may change the links in this file.
+            dependencies = set(self._exported_infos)
+            dependencies.discard(filename)
 
-        # ----------------------------------------------------------------------
-        @dataclass(frozen=True)
-        class CaseInsensitiveMatcher(Matcher):
-            # ----------------------------------------------------------------------
-            _lower_term: str                = field(init=False)
+            if dependencies:
+                self._dependencies[filename] = dependencies
 
-            # ----------------------------------------------------------------------
-            def __post_init__(self):
-                object.__setattr__(self, "_lower_term", self.term.lower())
+            matchers += [matcher for matcher in glossary.matchers if matcher.filename != filename]
+            ngram_terms += glossary.ngram_terms
+            prefilters.append(glossary.prefilter)
 
-            # ----------------------------------------------------------------------
-            @overridemethod
-            def CreateRegex(self) -> str:
-                return r"(?i:{})".format(re.escape(self.term))
+            if glossary.stemming_lookup is not None:
+                stemming_lookups.append(glossary.stemming_lookup)
+            if glossary.lemmatisation_lookup is not None:
+                lemmatisation_lookups.append(glossary.lemmatisation_lookup)
 
-            # ----------------------------------------------------------------------
-            @overridemethod
-            def MatchTerm(
-                self,
-                matching_text: str,
-            ) -> bool:
-                return matching_text.lower() == self._lower_term
+        # Avoid tokenizing, stemming, and searching content that doesn't contain any words that could
+        # be linked.
+        if matchers and all(prefilter is not None for prefilter in prefilters):
+            words = _Prefilter.GetWords(content)
 
-        # ----------------------------------------------------------------------
+            if not any(prefilter.IsMatch(words) for prefilter in prefilters if prefilter is not None):
+                matchers = []
 
-        matchers: list[Matcher] = []
-        ngram_terms: list[list[str]] = []
+        if not matchers and not has_previous_links:
+            return set()
 
-        stemming_items: list[Plugin._PostprocessInfo] = []
-        lemmatisation_items: list[Plugin._PostprocessInfo] = []
+        self._visit_infos[filename] = self.__class__._VisitInfo(
+            matchers,
+            ngram_terms,
+            stemming_lookups,
+            lemmatisation_lookups,
+            has_previous_links,
+        )
 
-        for pi in self._postprocess_infos:
-            prev_matchers_len = len(matchers)
+        # Links are only inserted in prose; code, headings, links, and markup are left as-is (other
+        # than removing links inserted during previous invocations).
+        return _PREVIOUS_LINKS_SPAN_TYPES if has_previous_links else _LINK_SPAN_TYPES
 
-            if pi.postprocess_type & Plugin.PostprocessType.CaseInsensitive:
-                matchers.append(CaseInsensitiveMatcher(pi.term, pi.anchor, pi.postprocess_type))
-            elif pi.postprocess_type & Plugin.PostprocessType.Exact:
-                matchers.append(CaseSensitiveMatcher(pi.term, pi.anchor, pi.postprocess_type))
+    # ----------------------------------------------------------------------
+    @overridemethod
+    def VisitSpans(
+        self,
+        filename: Path,
+        spans: list[VisitedSpan],
+    ) -> dict[int, str]:
+        visit_info = self._visit_infos.pop(filename)
 
-            if (
-                pi.postprocess_type & Plugin.PostprocessType.Stemming
-                or pi.postprocess_type & Plugin.PostprocessType.Lemmatisation
-            ):
-                added_matcher = len(matchers) != prev_matchers_len
+        matchers = visit_info.matchers
+        stemming_lookups = visit_info.stemming_lookups
+        lemmatisation_lookups = visit_info.lemmatisation_lookups
 
-                if not added_matcher:
-                    raise ValueError("Stemming/Lemmatisation must be used with a CaseInsensitive/Exact flag.")
+        segments = _CreateSegments(spans, visit_info.has_previous_links)
 
-                if pi.postprocess_type & Plugin.PostprocessType.Stemming:
-                    stemming_items.append(pi)
-                if pi.postprocess_type & Plugin.PostprocessType.Lemmatisation:
-                    # TODO lemmatisation_items.append(pi)
-                    pass # pragma: no cover
+        if matchers and (stemming_lookups or lemmatisation_lookups):
+            _stem_cache.SetBackend(self.__class__.STEMMER_BACKEND)
 
-                if " " in pi.term:
-                    ngram_terms.append(pi.term.split(" "))
+            # Tokens are generated lazily so that the full list of tokens is never materialized
+            tokens = _MergeNgrams(_TokenizeWords(segments), _ngram_trie_cache.Get(visit_info.ngram_terms))
 
-                    # As a convenience, attempt to create the plural version of this ngram.
-                    # I don't like this code, as what we really need is reverse stemming. Furthermore,
-                    # doing this is a slippery slope as what happens when we need to support other stem
-                    # suffixes. Unfortunately, it doesn't seem like nltk provides this functionality
-                    # so we are doing the most common cases here.
-                    trailing_token = inflect.plural(ngram_terms[-1][-1])
-                    if trailing_token != ngram_terms[-1][-1]:
-                        ngram_terms.append(ngram_terms[-1][:-1] + [trailing_token, ])
-
-        if stemming_items or lemmatisation_items:
-            original_matchers_len = len(matchers)
-
-            from nltk.tokenize import MWETokenizer
-
-            # Is this code necessary?
-            # for module in [
-            #     "punkt",
-            # ]:
-            #     nltk.download(
-            #         module,
-            #         download_dir=nltk.data.path[0],
-            #     )
-
-            # Remove the punctuation from the content
-            replacement_map: dict[str, str] = {
-                char: "" for char in string.punctuation if char not in ["<", ">", "-"]
-            }
-
-            replacement_map["&nbsp;"] = " "
-            replacement_map["<"] = " <"
-            replacement_map[">"] = "> "
-
-            tokenize_content = re.sub(
-                "|".join(re.escape(key) for key in replacement_map.keys()),
-                lambda match: replacement_map[match.group(0)],
-                content,
-            )
+            processed_tokens: set[str] = set(matcher.term for matcher in matchers)
 
-            tokens = MWETokenizer(
-                ngram_terms,
-                separator=" ",
-            ).tokenize(tokenize_content.split())
-
-            if stemming_items:
-                from nltk.stem.porter import PorterStemmer
-
-                stemmer = PorterStemmer()
-                processed_tokens: set[str] = set(matcher.term for matcher in matchers)
-
-                for token in tokens:
-                    if token in processed_tokens:
-                        continue
-
-                    processed_tokens.add(token)
-
-                    stemmed_token = stemmer.stem(token)
-
-                    # Stemmed tokens will always be lower case, but we want to maintain
-                    # the case of the original token whenever we can.
-                    if token[0].isupper():
-                        stemmed_upper = stemmed_token[0].upper()
-                        if stemmed_upper == token[0]:
-                            stemmed_token = "{}{}".format(stemmed_upper, stemmed_token[1:])
-
-                    matcher = next(
-                        (
-                            matcher
-                            for matcher in matchers[:original_matchers_len]
-                            if (
-                                matcher.postprocess_type & Plugin.PostprocessType.Stemming
-                                and matcher.MatchTerm(stemmed_token)
-                            )
-                        ),
-                        None,
-                    )
-                    if matcher is None:
-                        continue
+            for token in tokens:
+                if token in processed_tokens:
+                    continue
 
-                    matchers.append(matcher.Clone(token))
+                processed_tokens.add(token)
+
+                matcher: Optional[_Matcher] = None
+
+                if stemming_lookups:
+                    stemmed_token = _RestoreCase(token, _stem_cache.Stem(token))
+
+                    for stemming_lookup in stemming_lookups:
+                        matcher = stemming_lookup.Get(stemmed_token)
+                        if matcher is not None:
+                            break
 
-            if lemmatisation_items:
-                raise Exception("TODO: Not implemented yet")  # pragma: no cover
+                if matcher is None and lemmatisation_lookups:
+                    for lemma in _Lemmatize(token):
+                        for lemmatisation_lookup in lemmatisation_lookups:
+                            matcher = lemmatisation_lookup.Get(lemma)
+                            if matcher is not None:
+                                break
+
+                        if matcher is not None:
+                            break
+
+                if matcher is not None:
+                    matchers.append(matcher.Clone(token))
 
         # Populate the content
         if not matchers:
-            return content
+            return {index: text for index, text, _ in segments}
+
+        relative_paths: dict[Path, str] = {}
 
         # ----------------------------------------------------------------------
-        def Sub(
-            match: Match,
+        def CreateLink(
+            matching_text: str,
+            matcher: _Matcher,
         ) -> str:
-            matcher = next((matcher for matcher in matchers if matcher.MatchTerm(match.group(0))))
-            return matcher.CreateLink(content[match.start():match.end()])
+            if matcher.filename is None:
+                href = "#{}".format(matcher.anchor)
+            else:
+                relative_path = relative_paths.get(matcher.filename, None)
+
+                if relative_path is None:
+                    relative_path = Path(os.path.relpath(matcher.filename, filename.parent)).as_posix()
+                    relative_paths[matcher.filename] = relative_path
+
+                href = "{}#{}".format(relative_path, matcher.anchor)
+
+            return _LINK_TEMPLATE.Render(
+                href=href,
+                text=matching_text,
+            )
 
         # ----------------------------------------------------------------------
 
-        content = re.sub(
-            r"""(?#
-            Don't match when following a tag            )(?<!\>)(?#
-            Don't match an anchor                       )(?<!id=")(?#
-            Word boundary                               )\b(?#
-            Regex                                       )(?:{})(?#
-            Word boundary                               )\b(?#
-            Don't match if followed by a tag            )(?!\<)(?#
-            )""".format(
-                "|".join(matcher.CreateRegex() for matcher in matchers),
-            ),
-            Sub,
-            content,
-        )
+        substitute_func: Callable[[str], str]
 
-        return content
+        if len(matchers) >= self.__class__.TERM_MATCHER_THRESHOLD:
+            term_matcher: TermMatcher[_Matcher] = TermMatcher()
+
+            for matcher in matchers:
+                term_matcher.Add(
+                    matcher.term,
+                    matcher,
+                    case_insensitive=isinstance(matcher, _CaseInsensitiveMatcher),
+                )
+
+            substitute_func = functools.partial(term_matcher.Sub, func=CreateLink)
+
+        else:
+            matcher_lookup = _MatcherLookup(matchers)
+
+            # ----------------------------------------------------------------------
+            def Sub(
+                match: Match,
+            ) -> str:
+                matching_text = match.group(0)
+
+                matcher = matcher_lookup.Get(matching_text)
+                assert matcher is not None, matching_text
+
+                return CreateLink(matching_text, matcher)
+
+            # ----------------------------------------------------------------------
+
+            terms_regex = re.compile(
+                r"""(?#
+                Word boundary                               )\b(?#
+                Regex                                       )(?:{})(?#
+                Word boundary                               )\b(?#
+                )""".format(
+                    "|".join(matcher.CreateRegex() for matcher in matchers),
+                ),
+            )
+
+            substitute_func = functools.partial(terms_regex.sub, Sub)
+
+        return {
+            index: substitute_func(text) if is_eligible else text
+            for index, text, is_eligible in segments
+        }
 
     # ----------------------------------------------------------------------
     # |
@@ -412,3 +532,850 @@ class Plugin(PluginBase):
         term: str
         anchor: str
         postprocess_type: "Plugin.PostprocessType"
+        export: bool
+
+    # ----------------------------------------------------------------------
+    @dataclass(frozen=True)
+    class _VisitInfo(object):
+        matchers: list["_Matcher"]
+        ngram_terms: list[str]
+        stemming_lookups: list["_MatcherLookup"]
+        lemmatisation_lookups: list["_MatcherLookup"]
+        has_previous_links: bool
+
+    # ----------------------------------------------------------------------
+    # |
+    # |  Private Methods
+    # |
+    # ----------------------------------------------------------------------
+    def _UpdateExports(
+        self,
+        filename: Path,
+        postprocess_infos: list["Plugin._PostprocessInfo"],
+    ) -> None:
+        exported_infos = [pi for pi in postprocess_infos if pi.export]
+
+        if exported_infos == self._exported_infos.get(filename, []):
+            return
+
+        if exported_infos:
+            self._exported_infos[filename] = exported_infos
+        else:
+            del self._exported_infos[filename]
+
+        # The glossary will be recreated the next time that it is needed
+        object.__setattr__(self, "_glossary", None)
+
+    # ----------------------------------------------------------------------
+    def _GetGlossary(self) -> Optional["_Glossary"]:
+        if self._glossary is None and self._exported_infos:
+            object.__setattr__(self, "_glossary", _Glossary(self._exported_infos))
+
+        return self._glossary
+
+
+# ----------------------------------------------------------------------
+# |
+# |  Private Types
+# |
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class _Matcher(ABC):
+    # ----------------------------------------------------------------------
+    term: str
+    anchor: str
+    postprocess_type: Plugin.PostprocessType
+
+    # The file that defined the term, or None if the term was defined in the file being processed
+    filename: Optional[Path]
+
+    # ----------------------------------------------------------------------
+    def Clone(
+        self,
+        term: str,
+    ) -> "_Matcher":
+        return self.__class__(term, self.anchor, self.postprocess_type, self.filename)
+
+    # ----------------------------------------------------------------------
+    @abstractmethod
+    def CreateRegex(self) -> str:
+        raise Exception("Abstract method")  # pragma: no cover
+
+
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class _CaseSensitiveMatcher(_Matcher):
+    # ----------------------------------------------------------------------
+    @overridemethod
+    def CreateRegex(self) -> str:
+        return re.escape(self.term)
+
+
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class _CaseInsensitiveMatcher(_Matcher):
+    # ----------------------------------------------------------------------
+    @overridemethod
+    def CreateRegex(self) -> str:
+        return r"(?i:{})".format(re.escape(self.term))
+
+
+# ----------------------------------------------------------------------
+class _MatcherLookup(object):
+    """Resolves text to the first matcher that matches it with dictionary lookups rather than a linear scan."""
+
+    # ----------------------------------------------------------------------
+    def __init__(
+        self,
+        matchers: Iterable[_Matcher],
+        create_keys_func: Optional[Callable[[str], Iterable[str]]]=None,
+    ):
+        """`create_keys_func` returns the text that resolves to a matcher's term (by default, the term itself)."""
+
+        # Indexes are stored alongside the matchers so that the first matcher defined wins
+        # when both a case sensitive and case insensitive matcher match the same text.
+        self._exact_lookup: dict[str, tuple[int, _Matcher]]                 = {}
+        self._lower_lookup: dict[str, tuple[int, _Matcher]]                 = {}
+
+        for matcher_index, matcher in enumerate(matchers):
+            keys = [matcher.term] if create_keys_func is None else create_keys_func(matcher.term)
+
+            for key in keys:
+                if isinstance(matcher, _CaseInsensitiveMatcher):
+                    self._lower_lookup.setdefault(key.lower(), (matcher_index, matcher))
+                else:
+                    self._exact_lookup.setdefault(key, (matcher_index, matcher))
+
+    # ----------------------------------------------------------------------
+    def Get(
+        self,
+        text: str,
+    ) -> Optional[_Matcher]:
+        exact_result = self._exact_lookup.get(text, None)
+        lower_result = self._lower_lookup.get(text.lower(), None)
+
+        if exact_result is None:
+            return None if lower_result is None else lower_result[1]
+
+        if lower_result is not None and lower_result[0] < exact_result[0]:
+            return lower_result[1]
+
+        return exact_result[1]
+
+
+# ----------------------------------------------------------------------
+class _Glossary(object):
+    """Matchers for exported definitions; created once and used when processing every file."""
+
+    # ----------------------------------------------------------------------
+    def __init__(
+        self,
+        exported_infos: dict[Path, list[Plugin._PostprocessInfo]],
+    ):
+        matchers: list[_Matcher] = []
+        ngram_terms: list[str] = []
+
+        for filename, postprocess_infos in exported_infos.items():
+            these_matchers, these_ngram_terms = _CreateMatchers(postprocess_infos, filename)
+
+            matchers += these_matchers
+            ngram_terms += these_ngram_terms
+
+        stemming_lookup, lemmatisation_lookup = _CreateLookups(matchers)
+
+        self.matchers                       = matchers
+        self.ngram_terms                    = ngram_terms
+        self.stemming_lookup                = stemming_lookup
+        self.lemmatisation_lookup           = lemmatisation_lookup
+        self.prefilter                      = _Prefilter.Create(matchers)
+
+
+# ----------------------------------------------------------------------
+class _Prefilter(object):
+    """\
+    Determines, in a single pass over the content, whether any of the matchers could produce a link.
+
+    Every word that can be linked (directly or by its stem or lemma) begins with one of a set of short
+    prefixes; content that doesn't contain a word that begins with one of those prefixes can't be
+    linked. False positives are possible (and just mean that the content is processed as usual),
+    but false negatives are not.
+    """
+
+    # ----------------------------------------------------------------------
+    @classmethod
+    def Create(
+        cls,
+        matchers: list[_Matcher],
+    ) -> Optional["_Prefilter"]:
+        """Returns None if a prefix can't be determined for one or more of the matchers."""
+
+        prefixes: set[str] = set()
+
+        for matcher in matchers:
+            term = matcher.term.lower()
+
+            candidates = [term]
+
+            if matcher.postprocess_type & Plugin.PostprocessType.Stemming:
+                # The Porter stemmer only modifies the end of a word; a word always begins with the
+                # first `len(stem) - 2` characters of its stem (verified against ~850k words).
+                candidates.append(term[:max(1, len(term) - 2)])
+
+            if matcher.postprocess_type & Plugin.PostprocessType.Lemmatisation:
+                for lemma in _Lemmatize(matcher.term):
+                    lemma = lemma.lower()
+
+                    # Irregular forms (e.g. 'mice' -> 'mouse') don't share a prefix with their lemma
+                    candidates.append(lemma)
+                    candidates += _GetLemmaIndex().GetWords(lemma)
+
+            for candidate in candidates:
+                match = _PREFILTER_WORD_REGEX.search(candidate)
+                if match is None:
+                    return None
+
+                prefixes.add(match.group()[:_PREFILTER_PREFIX_MAX_LEN])
+
+        return cls(prefixes)
+
+    # ----------------------------------------------------------------------
+    @staticmethod
+    def GetWords(
+        content: str,
+    ) -> set[str]:
+        """Returns the words checked by `IsMatch`; these are created once and used with multiple prefilters."""
+
+        content = content.lower()
+
+        # Words are extracted both with and without punctuation, as the terms are matched against the
+        # content while stemmed and lemmatised tokens have had their punctuation removed.
+        words = set(_PREFILTER_WORD_REGEX.findall(content))
+        words.update(_PREFILTER_WORD_REGEX.findall(content.translate(_TOKENIZE_TRANSLATION_TABLE)))
+
+        return words
+
+    # ----------------------------------------------------------------------
+    def __init__(
+        self,
+        prefixes: set[str],
+    ):
+        self.prefixes                       = prefixes
+        self.prefix_lengths                 = sorted(set(len(prefix) for prefix in prefixes))
+
+    # ----------------------------------------------------------------------
+    def IsMatch(
+        self,
+        words: set[str],
+    ) -> bool:
+        prefixes = self.prefixes
+
+        for prefix_length in self.prefix_lengths:
+            if any(word[:prefix_length] in prefixes for word in words):
+                return True
+
+        return False
+
+
+# ----------------------------------------------------------------------
+class _StemCache(object):
+    """\
+    Memoizes stems across all of the files processed in a run and, optionally, across runs (via
+    `Load` and `Save`).
+
+    The number of stems is bounded; the least recently used stems are evicted first.
+    """
+
+    # ----------------------------------------------------------------------
+    def __init__(
+        self,
+        max_size: int,
+    ):
+        self.max_size                       = max_size
+
+        self.hits                           = 0
+        self.misses                         = 0
+
+        self._lock                          = threading.Lock()
+        self._backend                       = Plugin.StemmerBackend.BuiltIn
+        self._stem_func: Optional[Callable[[str], str]]                     = None
+        self._stems: dict[str, str]         = {}
+        self._is_modified                   = False
+
+    # ----------------------------------------------------------------------
+    @property
+    def version(self) -> str:
+        """Persisted stems are only valid when generated by the same stemmer."""
+
+        if self._backend == Plugin.StemmerBackend.Nltk:
+            import nltk
+
+            return "nltk.PorterStemmer-{}".format(nltk.__version__)
+
+        return PorterStemmer.VERSION
+
+    # ----------------------------------------------------------------------
+    def SetBackend(
+        self,
+        backend: Plugin.StemmerBackend,
+    ) -> None:
+        with self._lock:
+            if backend == self._backend:
+                return
+
+            # Stems generated by a different stemmer are no longer valid
+            self._backend = backend
+            self._stem_func = None
+            self._stems = {}
+            self._is_modified = False
+
+    # ----------------------------------------------------------------------
+    def Stem(
+        self,
+        token: str,
+    ) -> str:
+        with self._lock:
+            stem = self._stems.pop(token, None)
+
+            if stem is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+                if self._stem_func is None:
+                    if self._backend == Plugin.StemmerBackend.Nltk:
+                        from nltk.stem.porter import PorterStemmer as NltkPorterStemmer
+
+                        self._stem_func = NltkPorterStemmer().stem
+                    else:
+                        self._stem_func = PorterStemmer().Stem
+
+                stem = self._stem_func(token)
+                self._is_modified = True
+
+                if len(self._stems) >= self.max_size:
+                    del self._stems[next(iter(self._stems))]
+
+            # (Re)insert the stem so that it is the last to be evicted
+            self._stems[token] = stem
+
+            return stem
+
+    # ----------------------------------------------------------------------
+    def Load(
+        self,
+        filename: Path,
+    ) -> None:
+        if not filename.is_file():
+            return
+
+        try:
+            with filename.open(encoding="UTF-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            # The cache is an optimization; ignore content that can't be read
+            return
+
+        if not isinstance(data, dict) or data.get("version") != self.version:
+            return
+
+        stems = data.get("stems")
+        if not isinstance(stems, dict):
+            return
+
+        with self._lock:
+            # Stems persisted are ordered from least to most recently used; stems encountered during
+            # this run should be considered more recent than anything persisted.
+            self._stems = {**stems, **self._stems}
+
+            while len(self._stems) > self.max_size:
+                del self._stems[next(iter(self._stems))]
+
+    # ----------------------------------------------------------------------
+    def Save(
+        self,
+        filename: Path,
+    ) -> None:
+        if not self._is_modified and filename.is_file():
+            return
+
+        with self._lock:
+            content = json.dumps(
+                {
+                    "version": self.version,
+                    "stems": self._stems,
+                },
+            )
+
+            self._is_modified = False
+
+        filename.parent.mkdir(parents=True, exist_ok=True)
+
+        temp_filename = filename.with_suffix(".tmp")
+
+        with temp_filename.open("w", encoding="UTF-8") as f:
+            f.write(content)
+
+        temp_filename.replace(filename)
+
+    # ----------------------------------------------------------------------
+    def GetStatistics(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        if lookups == 0:
+            return {}
+
+        return {
+            "stem_cache_hits": self.hits,
+            "stem_cache_misses": self.misses,
+            "stem_cache_hit_rate": self.hits / lookups,
+        }
+
+
+# ----------------------------------------------------------------------
+class _NgramTrieCache(object):
+    """\
+    Memoizes the tries used to merge the words of multi-word terms during tokenization, keyed by the
+    set of terms. Files that share a glossary (and don't define multi-word terms of their own) share
+    a single trie.
+
+    The number of tries is bounded; the least recently used tries are evicted first.
+    """
+
+    # ----------------------------------------------------------------------
+    def __init__(
+        self,
+        max_size: int,
+    ):
+        self.max_size                       = max_size
+
+        self.hits                           = 0
+        self.misses                         = 0
+
+        self._lock                          = threading.Lock()
+        self._tries: dict[frozenset[str], dict[str, Any]]                   = {}
+        self._trie_sizes: dict[frozenset[str], int]                         = {}
+        self._plurals: dict[str, str]       = {}
+        self._plurals_size                  = 0
+
+    # ----------------------------------------------------------------------
+    def Get(
+        self,
+        terms: Iterable[str],
+    ) -> dict[str, Any]:
+        key = frozenset(terms)
+        if not key:
+            return {}
+
+        with self._lock:
+            trie = self._tries.pop(key, None)
+
+            if trie is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+                ngram_terms: list[list[str]] = []
+
+                for term in key:
+                    ngram_terms.append(term.split(" "))
+
+                    # As a convenience, attempt to create the plural version of this ngram.
+                    # I don't like this code, as what we really need is reverse stemming. Furthermore,
+                    # doing this is a slippery slope as what happens when we need to support other stem
+                    # suffixes. Unfortunately, it doesn't seem like nltk provides this functionality
+                    # so we are doing the most common cases here.
+                    trailing_token = ngram_terms[-1][-1]
+
+                    plural = self._plurals.get(trailing_token, None)
+                    if plural is None:
+                        plural = inflect.plural(trailing_token)
+                        self._plurals[trailing_token] = plural
+                        self._plurals_size += sys.getsizeof(trailing_token) + sys.getsizeof(plural)
+
+                    if plural != trailing_token:
+                        ngram_terms.append(ngram_terms[-1][:-1] + [plural, ])
+
+                trie = _CreateNgramTrie(ngram_terms)
+
+                if len(self._tries) >= self.max_size:
+                    evicted_key = next(iter(self._tries))
+
+                    del self._tries[evicted_key]
+                    self._trie_sizes.pop(evicted_key, None)
+
+            # (Re)insert the trie so that it is the last to be evicted
+            self._tries[key] = trie
+
+            return trie
+
+    # ----------------------------------------------------------------------
+    def GetStatistics(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        if lookups == 0:
+            return {}
+
+        with self._lock:
+            num_bytes = sys.getsizeof(self._tries) + sys.getsizeof(self._plurals) + self._plurals_size
+
+            for key, trie in self._tries.items():
+                # Tries are immutable once created, so their (expensive to calculate) sizes are memoized
+                trie_size = self._trie_sizes.get(key, None)
+                if trie_size is None:
+                    trie_size = sys.getsizeof(key) + sum(sys.getsizeof(term) for term in key) + _GetNgramTrieSize(trie)
+                    self._trie_sizes[key] = trie_size
+
+                num_bytes += trie_size
+
+            num_tries = len(self._tries)
+
+        return {
+            "ngram_trie_cache_hits": self.hits,
+            "ngram_trie_cache_misses": self.misses,
+            "ngram_trie_cache_hit_rate": self.hits / lookups,
+            "ngram_trie_cache_tries": num_tries,
+            "ngram_trie_cache_bytes": num_bytes,
+        }
+
+
+# ----------------------------------------------------------------------
+# |
+# |  Private Data
+# |
+# ----------------------------------------------------------------------
+_STEM_CACHE_MAX_SIZE                        = 100000
+
+_stem_cache                                 = _StemCache(_STEM_CACHE_MAX_SIZE)
+
+_NGRAM_TRIE_CACHE_MAX_SIZE                  = 64
+
+_ngram_trie_cache                           = _NgramTrieCache(_NGRAM_TRIE_CACHE_MAX_SIZE)
+
+# Generated by Data/GenerateLemmas.py; the file is memory-mapped when lemmatisation is first used.
+_LEMMAS_FILENAME                            = Path(__file__).parent / "Data" / "Lemmas.txt"
+
+_lemma_index_lock                           = threading.Lock()
+_lemma_index: Optional[LemmaIndex]          = None
+
+_DEFAULT_DEFINITION_TEMPLATE                = Template(
+    """\
+    <p>
+      <div><i><a id="{anchor}">{key}</a></i></div>
+      <div>{indentation}{definition}</div>
+    </p>
+    """,
+)
+
+_HTML_LIST_DEFINITION_TEMPLATE              = Template(
+    """\
+    {indentation}<dt><a id="{anchor}">{key}</a></dt>
+    {indentation}<dd>{definition}</dd>
+    """,
+)
+
+# The term is placed within the anchor so that it isn't linked to itself during postprocessing
+_MARKDOWN_LIST_DEFINITION_TEMPLATE          = Template(
+    """\
+    - **<a id="{anchor}">{key}</a>**: {definition}
+    """,
+)
+
+_LINK_TEMPLATE                              = Template(
+    '<a href="{href}" data-definition-list-link=1>{text}</a>',
+    dedent=False,
+)
+
+_LINK_REGEX                                 = RegularExpression.TemplateStringToRegex(
+    _LINK_TEMPLATE.content,
+    match_whole_string=False,
+)
+
+# Exported definitions are declared with `export=True`
+_EXPORT_REGEX                               = re.compile(r"\bexport\s*=\s*True\b")
+
+# Substring present in all links; used to avoid searching for links in content without any
+_LINK_MARKER                                = "data-definition-list-link"
+
+# The types of spans visited when inserting links and when replacing links inserted during previous invocations
+_LINK_SPAN_TYPES: set[SpanType]             = {SpanType.Prose}
+_PREVIOUS_LINKS_SPAN_TYPES: set[SpanType]   = {SpanType.Prose, SpanType.Heading, SpanType.Link, SpanType.Markup}
+
+# Punctuation (other than hyphens, which are part of words) is removed from words
+_TOKENIZE_TRANSLATION_TABLE                 = str.maketrans(
+    "",
+    "",
+    "".join(char for char in string.punctuation if char != "-"),
+)
+
+# Words used when prefiltering content
+_PREFILTER_WORD_REGEX                       = re.compile(r"\w+")
+
+# Prefixes are short so that the set of prefixes remains small for very large glossaries
+_PREFILTER_PREFIX_MAX_LEN                   = 4
+
+# Key used to mark the end of an ngram in an ngram trie; this can never collide with a word
+_NGRAM_TRIE_LEAF_KEY                        = ""
+
+
+# ----------------------------------------------------------------------
+# |
+# |  Private Functions
+# |
+# ----------------------------------------------------------------------
+def _CreateMatchers(
+    postprocess_infos: list[Plugin._PostprocessInfo],
+    filename: Optional[Path],
+) -> tuple[list[_Matcher], list[str]]:
+    """Returns the matchers and multi-word terms (used during tokenization) for the definitions."""
+
+    matchers: list[_Matcher] = []
+    ngram_terms: list[str] = []
+
+    for pi in postprocess_infos:
+        prev_matchers_len = len(matchers)
+
+        if pi.postprocess_type & Plugin.PostprocessType.CaseInsensitive:
+            matchers.append(_CaseInsensitiveMatcher(pi.term, pi.anchor, pi.postprocess_type, filename))
+        elif pi.postprocess_type & Plugin.PostprocessType.Exact:
+            matchers.append(_CaseSensitiveMatcher(pi.term, pi.anchor, pi.postprocess_type, filename))
+
+        if (
+            pi.postprocess_type & Plugin.PostprocessType.Stemming
+            or pi.postprocess_type & Plugin.PostprocessType.Lemmatisation
+        ):
+            added_matcher = len(matchers) != prev_matchers_len
+
+            if not added_matcher:
+                raise ValueError("Stemming/Lemmatisation must be used with a CaseInsensitive/Exact flag.")
+
+            if " " in pi.term:
+                ngram_terms.append(pi.term)
+
+    return matchers, ngram_terms
+
+
+# ----------------------------------------------------------------------
+def _CreateLookups(
+    matchers: list[_Matcher],
+) -> tuple[Optional[_MatcherLookup], Optional[_MatcherLookup]]:
+    """Returns the lookups used to resolve stemmed tokens and lemmatised tokens."""
+
+    stemming_matchers: list[_Matcher] = []
+    lemmatisation_matchers: list[_Matcher] = []
+
+    for matcher in matchers:
+        if matcher.postprocess_type & Plugin.PostprocessType.Stemming:
+            stemming_matchers.append(matcher)
+        if matcher.postprocess_type & Plugin.PostprocessType.Lemmatisation:
+            lemmatisation_matchers.append(matcher)
+
+    return (
+        _MatcherLookup(stemming_matchers) if stemming_matchers else None,
+        _MatcherLookup(lemmatisation_matchers, _Lemmatize) if lemmatisation_matchers else None,
+    )
+
+
+# ----------------------------------------------------------------------
+def _RestoreCase(
+    token: str,
+    value: str,
+) -> str:
+    """\
+    Stems and lemmas will always be lower case, but we want to maintain the case of the original
+    token whenever we can.
+    """
+
+    if token[0].isupper():
+        value_upper = value[0].upper()
+        if value_upper == token[0]:
+            value = "{}{}".format(value_upper, value[1:])
+
+    return value
+
+
+# ----------------------------------------------------------------------
+def _GetLemmaIndex() -> LemmaIndex:
+    global _lemma_index  # pylint: disable=global-statement
+
+    with _lemma_index_lock:
+        if _lemma_index is None:
+            _lemma_index = LemmaIndex(_LEMMAS_FILENAME)
+
+        return _lemma_index
+
+
+# ----------------------------------------------------------------------
+def _Lemmatize(
+    text: str,
+) -> tuple[str, ...]:
+    """Returns the lemmas of the text; only the last word of multi-word or hyphenated text is lemmatised."""
+
+    lower_text = text.lower()
+    split_index = max(lower_text.rfind(" "), lower_text.rfind("-")) + 1
+
+    prefix = lower_text[:split_index]
+
+    return tuple(
+        _RestoreCase(text, prefix + lemma)
+        for lemma in _GetLemmaIndex().Lemmatize(lower_text[split_index:])
+    )
+
+
+# ----------------------------------------------------------------------
+def _CreateSegments(
+    spans: list[VisitedSpan],
+    has_previous_links: bool,
+) -> list[tuple[int, str, bool]]:
+    """\
+    Returns the index, text, and whether links may be inserted within each span that may be
+    modified. Links inserted during previous invocations are replaced by their text, which is always
+    eligible.
+    """
+
+    segments: list[tuple[int, str, bool]] = []
+
+    for span in spans:
+        text = span.text
+
+        if span.type == SpanType.Prose:
+            segments.append((span.index, text, True))
+            continue
+
+        if has_previous_links and _LINK_MARKER in text:
+            if span.type == SpanType.Link:
+                match = _LINK_REGEX.fullmatch(text)
+                if match is not None:
+                    # The text of each previous link is matched independently of the content around it
+                    segments.append((span.index, match.group("text"), True))
+                    continue
+
+            # Links were inserted into headings, links, and markup by earlier versions of this plugin
+            segments.append((span.index, _LINK_REGEX.sub(lambda match: match.group("text"), text), False))
+
+    return segments
+
+
+# ----------------------------------------------------------------------
+def _TokenizeWords(
+    segments: list[tuple[int, str, bool]],
+) -> Iterator[str]:
+    """Yields the candidate words within the segments where links may be inserted."""
+
+    for _, text, is_eligible in segments:
+        if is_eligible:
+            yield from text.translate(_TOKENIZE_TRANSLATION_TABLE).split()
+
+
+# ----------------------------------------------------------------------
+def _CreateNgramTrie(
+    ngram_terms: list[list[str]],
+) -> dict[str, Any]:
+    root: dict[str, Any] = {}
+
+    for ngram_term in ngram_terms:
+        node = root
+
+        for word in ngram_term:
+            node = node.setdefault(word, {})
+
+        node[_NGRAM_TRIE_LEAF_KEY] = True
+
+    return root
+
+
+# ----------------------------------------------------------------------
+def _GetNgramTrieSize(
+    ngram_trie: dict[str, Any],
+) -> int:
+    """Returns the approximate number of bytes used by the trie (including its words)."""
+
+    num_bytes = 0
+    nodes = [ngram_trie]
+
+    while nodes:
+        node = nodes.pop()
+
+        num_bytes += sys.getsizeof(node)
+
+        for word, child in node.items():
+            num_bytes += sys.getsizeof(word)
+
+            if isinstance(child, dict):
+                nodes.append(child)
+
+    return num_bytes
+
+
+# ----------------------------------------------------------------------
+def _MergeNgrams(
+    words: Iterator[str],
+    ngram_trie: dict[str, Any],
+) -> Iterator[str]:
+    """\
+    Merges words that form ngrams into a single (space-delimited) token; the longest ngram starting
+    at a word wins. Only the words required to determine a match are buffered.
+    """
+
+    if not ngram_trie:
+        yield from words
+        return
+
+    pending: list[str] = []
+
+    while True:
+        if not pending:
+            word = next(words, None)
+            if word is None:
+                break
+
+            pending.append(word)
+
+        node = ngram_trie.get(pending[0], None)
+        if node is None:
+            yield pending.pop(0)
+            continue
+
+        ngram_len = 0
+        index = 1
+
+        while True:
+            if _NGRAM_TRIE_LEAF_KEY in node:
+                ngram_len = index
+
+            if index == len(pending):
+                word = next(words, None)
+                if word is None:
+                    break
+
+                pending.append(word)
+
+            node = node.get(pending[index], None)
+            if node is None:
+                break
+
+            index += 1
+
+        if ngram_len == 0:
+            yield pending.pop(0)
+            continue
+
+        yield " ".join(pending[:ngram_len])
+        del pending[:ngram_len]
+
+
+# ----------------------------------------------------------------------
+def _RenderDefinitions(
+    template: Template,
+    definitions: dict[str, Plugin.DefinitionInfo],
+    indentation: str,
+) -> str:
+    buffer: list[str] = []
+
+    for key, value in definitions.items():
+        template.RenderTo(
+            buffer,
+            anchor=value.anchor,
+            key=key,
+            indentation=indentation,
+            definition=value.definition,
+        )
+
+    return "".join(buffer)
@@ -0,0 +1,222 @@
+# ----------------------------------------------------------------------
+# |
+# |  DefinitionListPlugin_PerformanceTest.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-19 12:03:16
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2023
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Performance tests for DefinitionListPlugin.py"""
+
+import random
+import sys
+import time
+
+from pathlib import Path
+
+import pytest
+
+from Common_Foundation.ContextlibEx import ExitStack
+from Common_Foundation import PathEx
+
+
+# ----------------------------------------------------------------------
+sys.path.insert(0, str(PathEx.EnsureDir(Path(__file__).parent.parent.parent)))
+with ExitStack(lambda: sys.path.pop(0)):
+    from MarkdownModifier.MarkdownSpans import EnumerateSpans, VisitedSpan
+    from Plugins import DefinitionListPlugin as DefinitionListPluginModule
+    from Plugins.DefinitionListPlugin import Plugin as DefinitionListPlugin
+
+
+# ----------------------------------------------------------------------
+# Matching with a regular expression alternation is prohibitively slow with very large glossaries,
+# so it is only measured up to this number of terms.
+_MAX_REGEX_TERMS                            = 10000
+
+
+# ----------------------------------------------------------------------
+@pytest.mark.parametrize("num_terms", [100, 1000, 10000, 100000])
+def test_LinkTerms(num_terms, _vocabulary, monkeypatch):
+    terms = _vocabulary[:num_terms]
+    content = " ".join(random.Random(num_terms).choices(_vocabulary[:num_terms * 2], k=20000))
+
+    definitions = {
+        term: DefinitionListPlugin.DefinitionInfo(
+            "",
+            postprocess_type=DefinitionListPlugin.PostprocessType.CaseInsensitive,
+        )
+        for term in terms
+    }
+
+    results: dict[str, tuple[str, float]] = {}
+
+    for desc, threshold in [
+        ("TermMatcher", 1),
+        ("Regex", sys.maxsize),
+    ]:
+        if threshold == sys.maxsize and num_terms > _MAX_REGEX_TERMS:
+            continue
+
+        monkeypatch.setattr(DefinitionListPlugin, "TERM_MATCHER_THRESHOLD", threshold)
+
+        plugin = DefinitionListPlugin()
+        filename = Path("filename")
+
+        plugin.Execute(filename, definitions)
+
+        start = time.perf_counter()
+        result = _Visit(plugin, filename, content)
+
+        results[desc] = (result, time.perf_counter() - start)
+
+    assert len(set(result for result, _ in results.values())) == 1
+
+    # Roughly half of the words in the content are defined terms
+    (result, _), *_ = results.values()
+    assert result.count("data-definition-list-link") > 5000
+
+    sys.stdout.write(
+        "\n{} terms:\n{}\n".format(
+            num_terms,
+            "\n".join(
+                "    {:<12} {:.3f}s".format(desc, seconds)
+                for desc, (_, seconds) in results.items()
+            ),
+        ),
+    )
+
+
+# ----------------------------------------------------------------------
+@pytest.mark.parametrize("num_terms", [100, 1000, 10000])
+def test_StemmingVsLemmatisation(num_terms, _inflected_words, monkeypatch):
+    lemmas = list(_inflected_words)
+
+    terms = lemmas[:num_terms]
+    content = " ".join(
+        random.Random(num_terms).choices(
+            [word for lemma in lemmas[:num_terms * 2] for word in _inflected_words[lemma]],
+            k=20000,
+        ),
+    )
+
+    results: dict[str, float] = {}
+    num_links: dict[str, int] = {}
+
+    for desc, postprocess_type in [
+        ("Stemming", DefinitionListPlugin.PostprocessType.Stemming),
+        ("Lemmatisation", DefinitionListPlugin.PostprocessType.Lemmatisation),
+    ]:
+        definitions = {
+            term: DefinitionListPlugin.DefinitionInfo(
+                "",
+                postprocess_type=DefinitionListPlugin.PostprocessType.CaseInsensitive | postprocess_type,
+            )
+            for term in terms
+        }
+
+        # Start without any memoized stems or lemmas
+        monkeypatch.setattr(
+            DefinitionListPluginModule,
+            "_stem_cache",
+            DefinitionListPluginModule._StemCache(DefinitionListPluginModule._STEM_CACHE_MAX_SIZE),  # pylint: disable=protected-access
+        )
+        monkeypatch.setattr(DefinitionListPluginModule, "_lemma_index", None)
+
+        plugin = DefinitionListPlugin()
+        filename = Path("filename")
+
+        for pass_desc in ["cold", "warm"]:
+            plugin.Execute(filename, definitions)
+
+            start = time.perf_counter()
+            result = _Visit(plugin, filename, content)
+
+            results["{} ({})".format(desc, pass_desc)] = time.perf_counter() - start
+            num_links["{} ({})".format(desc, pass_desc)] = result.count("data-definition-list-link")
+
+    # Memoized stems and lemmas don't change the results, and both approaches link inflected forms
+    assert num_links["Stemming (cold)"] == num_links["Stemming (warm)"]
+    assert num_links["Lemmatisation (cold)"] == num_links["Lemmatisation (warm)"]
+    assert num_links["Stemming (cold)"] > 5000
+    assert num_links["Lemmatisation (cold)"] > 5000
+
+    sys.stdout.write(
+        "\n{} terms:\n{}\n".format(
+            num_terms,
+            "\n".join(
+                "    {:<24} {:.3f}s".format(desc, seconds)
+                for desc, seconds in results.items()
+            ),
+        ),
+    )
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _Visit(
+    plugin: DefinitionListPlugin,
+    filename: Path,
+    content: str,
+) -> str:
+    """Visits the spans of the content in the same way that `Modify` does."""
+
+    span_types = plugin.BeginVisit(filename, content)
+    if not span_types:
+        return content
+
+    spans = list(EnumerateSpans(content))
+    span_texts = [content[span.start:span.end] for span in spans]
+
+    for index, text in plugin.VisitSpans(
+        filename,
+        [
+            VisitedSpan(index, span.type, span_texts[index])
+            for index, span in enumerate(spans)
+            if span.type in span_types
+        ],
+    ).items():
+        span_texts[index] = text
+
+    return "".join(span_texts)
+
+
+# ----------------------------------------------------------------------
+@pytest.fixture(scope="module")
+def _vocabulary() -> list[str]:
+    generator = random.Random(0)
+
+    words: dict[str, None] = {}
+
+    while len(words) < 200000:
+        words["".join(generator.choices("abcdefghijklmnopqrstuvwxyz", k=generator.randint(5, 10)))] = None
+
+    return list(words)
+
+
+# ----------------------------------------------------------------------
+@pytest.fixture(scope="module")
+def _inflected_words() -> dict[str, list[str]]:
+    """Returns lemmas and their inflected forms (including the lemma itself)."""
+
+    words: dict[str, list[str]] = {}
+
+    with DefinitionListPluginModule._LEMMAS_FILENAME.open(encoding="UTF-8") as f:  # pylint: disable=protected-access
+        for line in f:
+            if line.startswith("#"):
+                continue
+
+            word, lemmas = line.rstrip().split("\t")
+            lemma = lemmas.split("/")[0]
+
+            if lemma.isalpha():
+                words.setdefault(lemma, [lemma]).append(word)
+
+    return words
@@ -25,6 +25,7 @@ from typing import Callable, cast, ClassVar, Iterable, Iterator, Optional, Union
 from Common_Foundation.Types import overridemethod
 
 from MarkdownModifier.Plugin import Plugin as PluginBase
+from MarkdownModifier.Templates import Template
 
 
 # ----------------------------------------------------------------------
@@ -88,7 +89,8 @@ class Plugin(PluginBase):
     # ----------------------------------------------------------------------
     name: ClassVar[str]                     = "TableOfContents"
 
-    _sections: dict[str, "Plugin._Options"] = field(init=False, default_factory=dict)
+    # Sections, organized by the file that defined them, until that file is postprocessed
+    _sections: dict[Path, dict[str, "Plugin._Options"]]                     = field(init=False, default_factory=dict)
 
     # ----------------------------------------------------------------------
     # |
@@ -100,29 +102,107 @@ class Plugin(PluginBase):
         filename: Path,  # pylint: disable=unused-argument
         line_items: Iterable[LineItemInfo],
     ) -> str:
-        contents: list[str] = []
+        buffer: list[str] = []
 
         for line_item in line_items:
-            content = line_item.text
+            (
+                _DEFAULT_UNLINKED_LINE_ITEM_TEMPLATE if line_item.anchor is None else _DEFAULT_LINKED_LINE_ITEM_TEMPLATE
+            ).RenderTo(
+                buffer,
+                prefix=line_item.prefix.replace(" ", "&nbsp;"),
+                separator=" " if line_item.prefix else "",
+                text=line_item.text,
+                anchor=line_item.anchor,
+            )
+
+        return "\n".join(buffer)
+
+    # ----------------------------------------------------------------------
+    @staticmethod
+    def MarkdownListGenerateTableOfContents(
+        filename: Path,  # pylint: disable=unused-argument
+        line_items: Iterable[LineItemInfo],
+    ) -> str:
+        """Generates the table of contents as a (nested) Markdown list."""
+
+        buffer: list[str] = []
+
+        for line_item in line_items:
+            whitespace, label = _SplitPrefix(line_item.prefix)
+
+            (
+                _MARKDOWN_UNLINKED_LINE_ITEM_TEMPLATE if line_item.anchor is None else _MARKDOWN_LINKED_LINE_ITEM_TEMPLATE
+            ).RenderTo(
+                buffer,
+                whitespace=whitespace,
+                label=label,
+                separator=" " if label else "",
+                text=line_item.text,
+                anchor=line_item.anchor,
+            )
+
+        return "\n".join(buffer)
+
+    # ----------------------------------------------------------------------
+    @staticmethod
+    def HtmlListGenerateTableOfContents(
+        filename: Path,  # pylint: disable=unused-argument
+        line_items: Iterable[LineItemInfo],
+    ) -> str:
+        """Generates the table of contents as nested HTML lists (<ul>)."""
 
-            if line_item.anchor is not None:
-                content = '<a href="#{}">{}</a>'.format(line_item.anchor, content)
+        buffer: list[str] = []
+        whitespace_lengths: list[int] = []
 
-            content = "<div>{}{}{}</div>".format(
-                line_item.prefix.replace(" ", "&nbsp;"),
-                " " if line_item.prefix else "",
-                content,
+        for line_item in line_items:
+            whitespace, label = _SplitPrefix(line_item.prefix)
+
+            if not whitespace_lengths or len(whitespace) > whitespace_lengths[-1]:
+                # Start a nested list within the current (open) list item
+                buffer.append("<ul>")
+                whitespace_lengths.append(len(whitespace))
+            else:
+                buffer[-1] += "</li>"
+
+                while len(whitespace_lengths) > 1 and len(whitespace) < whitespace_lengths[-1]:
+                    buffer.append("</ul></li>")
+                    whitespace_lengths.pop()
+
+            (
+                _HTML_UNLINKED_LINE_ITEM_TEMPLATE if line_item.anchor is None else _HTML_LINKED_LINE_ITEM_TEMPLATE
+            ).RenderTo(
+                buffer,
+                label=label,
+                separator=" " if label else "",
+                text=line_item.text,
+                anchor=line_item.anchor,
             )
 
-            contents.append(content)
+        if whitespace_lengths:
+            buffer[-1] += "</li>"
+            buffer += ["</ul></li>", ] * (len(whitespace_lengths) - 1)
+            buffer.append("</ul>")
 
-        return "\n".join(contents)
+        return "\n".join(buffer)
+
+    # ----------------------------------------------------------------------
+    @overridemethod
+    def Preprocess(
+        self,
+        filename: Path,
+        content: str,
+    ) -> str:
+        # Discard the sections of a previous modification of this file that failed before it was
+        # postprocessed.
+        self._sections.pop(filename, None)
+
+        return content
 
     # ----------------------------------------------------------------------
     @overridemethod
     def Execute(
         self,
-        filename: Path,  # pylint: disable=unused-argument
+        filename: Path,
         *,
         heading_min: int=1,
         heading_max: int=6,
@@ -130,18 +210,20 @@ class Plugin(PluginBase):
         line_item_prefix_strategy: LineItemPrefixStrategyType=LineItemPrefixType.Numeric,
         generate_table_of_contents_func: GenerateTableOfContentsFuncType=DefaultGenerateTableOfContents,
         unknown_heading_name: str=UNKNOWN_HEADING_NAME,
+        anchor_style: PluginBase.AnchorStyle=PluginBase.AnchorStyle.Default,
     ) -> str:
         # Defer processing, as other plugins might generate content that should be included in the
         # output of this plugin.
         unique_id = self.__class__.CreatePlaceholderId()
 
-        self._sections[unique_id] = Plugin._Options(
+        self._sections.setdefault(filename, {})[unique_id] = Plugin._Options(
             heading_min,
             heading_max,
             indentation,
             line_item_prefix_strategy,
             generate_table_of_contents_func,
             unknown_heading_name,
+            anchor_style,
         )
 
         return str(unique_id)
@@ -153,6 +235,10 @@ class Plugin(PluginBase):
         filename: Path,
         content: str,
     ) -> str:
+        sections = self._sections.pop(filename, None)
+        if not sections:
+            return content
+
         # Extract the headings
 
         # ----------------------------------------------------------------------
@@ -160,7 +246,7 @@ class Plugin(PluginBase):
         class ExtractedHeading(object):
             level: int
             text: str
-            anchor: str
+            explicit_anchor: Optional[str]
 
         # ----------------------------------------------------------------------
 
@@ -178,18 +264,39 @@ class Plugin(PluginBase):
             content,
             re.MULTILINE,
         ):
-            text = match.group("text")
-
             headings.append(
                 ExtractedHeading(
                     len(match.group("level")),
-                    text,
-                    match.group("anchor") or self.__class__.CreateAnchorName(text),
+                    match.group("text"),
+                    match.group("anchor") or None,
                 ),
             )
 
+        # Anchors are created on demand, as different sections may use different anchor styles
+        anchors_by_style: dict[PluginBase.AnchorStyle, list[str]] = {}
+
+        # ----------------------------------------------------------------------
+        def GetAnchors(
+            style: PluginBase.AnchorStyle,
+        ) -> list[str]:
+            anchors = anchors_by_style.get(style, None)
+
+            if anchors is None:
+                anchor_names = self.__class__.AnchorNames(style)
+
+                anchors = [
+                    heading.explicit_anchor or anchor_names.Create(heading.text)
+                    for heading in headings
+                ]
+
+                anchors_by_style[style] = anchors
+
+            return anchors
+
+        # ----------------------------------------------------------------------
+
         # Populate the placeholder content
-        for unique_id, options in self._sections.items():
+        for unique_id, options in sections.items():
             # ----------------------------------------------------------------------
             def GenerateLineItems() -> Iterator[Plugin.LineItemInfo]:
                 # ----------------------------------------------------------------------
@@ -218,7 +325,9 @@ class Plugin(PluginBase):
                 heading_infos: list[HeadingInfoEx] = []
                 heading_counters: list[int] = []
 
-                for heading in headings:
+                anchors = GetAnchors(options.anchor_style)
+
+                for heading, anchor in zip(headings, anchors):
                     if heading.level > options.heading_max:
                         continue
 
@@ -279,7 +388,7 @@ class Plugin(PluginBase):
 
                     yield heading_infos[-1].CreateLineItemInfo(
                         options.line_item_prefix_func(cast(list[Plugin.HeadingInfo], heading_infos)),
-                        heading.anchor,
+                        anchor,
                     )
 
             # ----------------------------------------------------------------------
@@ -309,6 +418,8 @@ class Plugin(PluginBase):
 
         unknown_heading_name: str
 
+        anchor_style: PluginBase.AnchorStyle
+
         # ----------------------------------------------------------------------
         def __post_init__(
             self,
@@ -372,3 +483,32 @@ class Plugin(PluginBase):
             # ----------------------------------------------------------------------
 
             object.__setattr__(self, "line_item_prefix_func", LineItemPrefix)
+
+
+# ----------------------------------------------------------------------
+# |
+# |  Private Data
+# |
+# ----------------------------------------------------------------------
+_DEFAULT_LINKED_LINE_ITEM_TEMPLATE          = Template('<div>{prefix}{separator}<a href="#{anchor}">{text}</a></div>')
+_DEFAULT_UNLINKED_LINE_ITEM_TEMPLATE        = Template("<div>{prefix}{separator}{text}</div>")
+
+_MARKDOWN_LINKED_LINE_ITEM_TEMPLATE         = Template("{whitespace}- {label}{separator}[{text}](#{anchor})")
+_MARKDOWN_UNLINKED_LINE_ITEM_TEMPLATE       = Template("{whitespace}- {label}{separator}{text}")
+
+_HTML_LINKED_LINE_ITEM_TEMPLATE             = Template('<li>{label}{separator}<a href="#{anchor}">{text}</a>')
+_HTML_UNLINKED_LINE_ITEM_TEMPLATE           = Template("<li>{label}{separator}{text}")
+
+
+# ----------------------------------------------------------------------
+# |
+# |  Private Functions
+# |
+# ----------------------------------------------------------------------
+def _SplitPrefix(
+    prefix: str,
+) -> tuple[str, str]:
+    """Splits a line item prefix into its leading whitespace (indicating its depth) and its label."""
+
+    label = prefix.lstrip(" ")
+    return prefix[:len(prefix) - len(label)], label
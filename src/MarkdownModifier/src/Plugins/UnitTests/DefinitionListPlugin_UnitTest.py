@@ -15,6 +15,7 @@
 # ----------------------------------------------------------------------
 """Unit tests for DefinitionListPlugin.py"""
 
+import json
 import re
 import sys
 import textwrap
@@ -31,6 +32,7 @@ from Common_Foundation import PathEx
 # ----------------------------------------------------------------------
 sys.path.insert(0, str(PathEx.EnsureDir(Path(__file__).parent.parent.parent)))
 with ExitStack(lambda: sys.path.pop(0)):
+    from MarkdownModifier.MarkdownSpans import EnumerateSpans, VisitedSpan
     from Plugins.DefinitionListPlugin import Plugin as DefinitionListPlugin
 
 
@@ -143,6 +145,31 @@ def test_OldContentIsRemoved():
     )
 
 
+# ----------------------------------------------------------------------
+def test_PreviousLinksAreUpdated():
+    _Execute(
+        textwrap.dedent(
+            """\
+            <a href="#old-anchor" data-definition-list-link=1>foo</a> and <a href="#foo" data-definition-list-link=1>foo bar</a>
+            """,
+        ),
+        textwrap.dedent(
+            """\
+            <p>
+              <div><i><a id="foo">foo</a></i></div>
+              <div>  The definition.</div>
+            </p>
+
+            <a href="#foo" data-definition-list-link=1>foo</a> and <a href="#foo" data-definition-list-link=1>foo</a> bar
+
+            """,
+        ),
+        {
+            "foo": "The definition.",
+        },
+    )
+
+
 # ----------------------------------------------------------------------
 def test_NoPostprocessingGlobal(_content, _definition_list):
     _Execute(
@@ -409,13 +436,51 @@ def test_StemmingCaseInsensitiveGlobal(_content, _definition_list):
 
 
 # ----------------------------------------------------------------------
-@pytest.mark.skip("Lemmatisation is not supported yet")
 def test_LemmatisationExactGlobal(_content, _definition_list):
     _Execute(
         _content,
         textwrap.dedent(
             """\
-            TODO
+            <p>
+              <div><i><a id="foo">Foo</a></i></div>
+              <div>  This is the definition for <a href="#foo" data-definition-list-link=1>Foo</a>.</div>
+            </p>
+            <p>
+              <div><i><a id="bar">Bar</a></i></div>
+              <div>  And here is <a href="#bar" data-definition-list-link=1>Bar</a>.</div>
+            </p>
+            <p>
+              <div><i><a id="one-two">one two</a></i></div>
+              <div>  What happens when we search for multiple words?</div>
+            </p>
+            <p>
+              <div><i><a id="hyphenated-word">hyphenated-word</a></i></div>
+              <div>  And <a href="#hyphenated-word" data-definition-list-link=1>hyphenated-words</a>?</div>
+            </p>
+
+            <a href="#foo" data-definition-list-link=1>Foo</a>
+            <a href="#foo" data-definition-list-link=1>Foo</a>'s
+            Foos
+            Fooing
+            Fooed
+            Fooey
+
+            <a href="#bar" data-definition-list-link=1>Bar</a>
+            bar
+            <a href="#bar" data-definition-list-link=1>Bars</a>
+            bars
+            <a href="#bar" data-definition-list-link=1>Barring</a>
+            <a href="#bar" data-definition-list-link=1>Barred</a>
+            Bared
+            Barific
+
+            <a href="#one-two" data-definition-list-link=1>one two</a>
+            one twoes
+
+            <a href="#hyphenated-word" data-definition-list-link=1>hyphenated-word</a>
+            <a href="#hyphenated-word" data-definition-list-link=1>hyphenated-words</a>?
+            <a href="#hyphenated-word" data-definition-list-link=1>hyphenated-wording</a>
+
             """,
         ),
         _definition_list,
@@ -424,13 +489,51 @@ def test_LemmatisationExactGlobal(_content, _definition_list):
 
 
 # ----------------------------------------------------------------------
-@pytest.mark.skip("Lemmatisation is not supported yet")
 def test_LemmatisationCaseInsensitiveGlobal(_content, _definition_list):
     _Execute(
         _content,
         textwrap.dedent(
             """\
-            TODO
+            <p>
+              <div><i><a id="foo">Foo</a></i></div>
+              <div>  This is the definition for <a href="#foo" data-definition-list-link=1>Foo</a>.</div>
+            </p>
+            <p>
+              <div><i><a id="bar">Bar</a></i></div>
+              <div>  And here is <a href="#bar" data-definition-list-link=1>Bar</a>.</div>
+            </p>
+            <p>
+              <div><i><a id="one-two">one two</a></i></div>
+              <div>  What happens when we search for multiple words?</div>
+            </p>
+            <p>
+              <div><i><a id="hyphenated-word">hyphenated-word</a></i></div>
+              <div>  And <a href="#hyphenated-word" data-definition-list-link=1>hyphenated-words</a>?</div>
+            </p>
+
+            <a href="#foo" data-definition-list-link=1>Foo</a>
+            <a href="#foo" data-definition-list-link=1>Foo</a>'s
+            Foos
+            Fooing
+            Fooed
+            Fooey
+
+            <a href="#bar" data-definition-list-link=1>Bar</a>
+            <a href="#bar" data-definition-list-link=1>bar</a>
+            <a href="#bar" data-definition-list-link=1>Bars</a>
+            <a href="#bar" data-definition-list-link=1>bars</a>
+            <a href="#bar" data-definition-list-link=1>Barring</a>
+            <a href="#bar" data-definition-list-link=1>Barred</a>
+            Bared
+            Barific
+
+            <a href="#one-two" data-definition-list-link=1>one two</a>
+            one twoes
+
+            <a href="#hyphenated-word" data-definition-list-link=1>hyphenated-word</a>
+            <a href="#hyphenated-word" data-definition-list-link=1>hyphenated-words</a>?
+            <a href="#hyphenated-word" data-definition-list-link=1>hyphenated-wording</a>
+
             """,
         ),
         _definition_list,
@@ -438,6 +541,38 @@ def test_LemmatisationCaseInsensitiveGlobal(_content, _definition_list):
     )
 
 
+# ----------------------------------------------------------------------
+def test_LemmatisationIrregularForms():
+    # Irregular forms can't be stemmed
+    _Execute(
+        "Mice and geese ran; a mouse runs.",
+        textwrap.dedent(
+            """\
+            <p>
+              <div><i><a id="mouse">Mouse</a></i></div>
+              <div>  A small rodent.</div>
+            </p>
+            <p>
+              <div><i><a id="goose">Goose</a></i></div>
+              <div>  A large bird.</div>
+            </p>
+            <p>
+              <div><i><a id="run">Run</a></i></div>
+              <div>  To move quickly.</div>
+            </p>
+
+            <a href="#mouse" data-definition-list-link=1>Mice</a> and <a href="#goose" data-definition-list-link=1>geese</a> <a href="#run" data-definition-list-link=1>ran</a>; a <a href="#mouse" data-definition-list-link=1>mouse</a> <a href="#run" data-definition-list-link=1>runs</a>.
+            """,
+        ),
+        {
+            "Mouse": "A small rodent.",
+            "Goose": "A large bird.",
+            "Run": "To move quickly.",
+        },
+        postprocess_type=DefinitionListPlugin.PostprocessType.CaseInsensitive | DefinitionListPlugin.PostprocessType.Lemmatisation,
+    )
+
+
 # ----------------------------------------------------------------------
 def test_CaseInsensitiveItem(_content, _definition_list):
     _definition_list["Bar"] = DefinitionListPlugin.DefinitionInfo(
@@ -495,6 +630,607 @@ def test_CaseInsensitiveItem(_content, _definition_list):
     )
 
 
+# ----------------------------------------------------------------------
+def test_FirstDefinitionWins():
+    _Execute(
+        textwrap.dedent(
+            """\
+            foo
+            FOO
+            Foo
+            """,
+        ),
+        textwrap.dedent(
+            """\
+            <p>
+              <div><i><a id="first">FOO</a></i></div>
+              <div>  The first.</div>
+            </p>
+            <p>
+              <div><i><a id="second">foo</a></i></div>
+              <div>  The second.</div>
+            </p>
+            <p>
+              <div><i><a id="third">Foo</a></i></div>
+              <div>  The third.</div>
+            </p>
+
+            <a href="#first" data-definition-list-link=1>foo</a>
+            <a href="#first" data-definition-list-link=1>FOO</a>
+            <a href="#first" data-definition-list-link=1>Foo</a>
+
+            """,
+        ),
+        {
+            "FOO": DefinitionListPlugin.DefinitionInfo(
+                "The first.",
+                anchor="first",
+                postprocess_type=DefinitionListPlugin.PostprocessType.CaseInsensitive,
+            ),
+            "foo": DefinitionListPlugin.DefinitionInfo(
+                "The second.",
+                anchor="second",
+                postprocess_type=DefinitionListPlugin.PostprocessType.Exact,
+            ),
+            "Foo": DefinitionListPlugin.DefinitionInfo(
+                "The third.",
+                anchor="third",
+                postprocess_type=DefinitionListPlugin.PostprocessType.Exact,
+            ),
+        },
+    )
+
+
+# ----------------------------------------------------------------------
+def test_FirstStemmedDefinitionWins():
+    _Execute(
+        textwrap.dedent(
+            """\
+            tests
+            """,
+        ),
+        textwrap.dedent(
+            """\
+            <p>
+              <div><i><a id="first">TEST</a></i></div>
+              <div>  The first.</div>
+            </p>
+            <p>
+              <div><i><a id="second">test</a></i></div>
+              <div>  The second.</div>
+            </p>
+
+            <a href="#first" data-definition-list-link=1>tests</a>
+
+            """,
+        ),
+        {
+            "TEST": DefinitionListPlugin.DefinitionInfo(
+                "The first.",
+                anchor="first",
+                postprocess_type=DefinitionListPlugin.PostprocessType.CaseInsensitive | DefinitionListPlugin.PostprocessType.Stemming,
+            ),
+            "test": DefinitionListPlugin.DefinitionInfo(
+                "The second.",
+                anchor="second",
+                postprocess_type=DefinitionListPlugin.PostprocessType.Exact | DefinitionListPlugin.PostprocessType.Stemming,
+            ),
+        },
+    )
+
+
+# ----------------------------------------------------------------------
+def test_StemmingSkipsHtmlAndCode():
+    # Words within HTML tags and code are not tokenized, so variations of terms found there are not linked
+    _Execute(
+        textwrap.dedent(
+            """\
+            Fooing, <span title="Fooed">the</span> Foos `Fooers` and
+
+            ```
+            Fooed
+            ```
+            """,
+        ),
+        textwrap.dedent(
+            """\
+            <p>
+              <div><i><a id="foo">Foo</a></i></div>
+              <div>  The definition.</div>
+            </p>
+
+            <a href="#foo" data-definition-list-link=1>Fooing</a>, <span title="Fooed">the</span> <a href="#foo" data-definition-list-link=1>Foos</a> `Fooers` and
+
+            ```
+            Fooed
+            ```
+
+            """,
+        ),
+        {
+            "Foo": "The definition.",
+        },
+    )
+
+
+# ----------------------------------------------------------------------
+def test_SkipsCodeHeadingsAndLinks():
+    # Links are only inserted in prose; links inserted in ineligible content by earlier versions are removed
+    _Execute(
+        textwrap.dedent(
+            """\
+            # Foo
+            ## <a href="#foo" data-definition-list-link=1>Foo</a> Again
+
+            Foo Heading
+            ===========
+
+            <div>Foo</div> <span title="Foo">Foo</span> `Foo` [Foo](https://example.com/Foo) <a href="#other">Foo</a>
+
+            ```
+            Foo
+            ```
+
+                Foo
+
+            <!-- Foo -->
+            [Foo]: https://example.com/Foo
+
+            An unmatched ` and Foo.
+
+            Foo `Foo`
+            """,
+        ),
+        textwrap.dedent(
+            """\
+            <p>
+              <div><i><a id="foo">Foo</a></i></div>
+              <div>  The definition.</div>
+            </p>
+
+            # Foo
+            ## Foo Again
+
+            Foo Heading
+            ===========
+
+            <div><a href="#foo" data-definition-list-link=1>Foo</a></div> <span title="Foo"><a href="#foo" data-definition-list-link=1>Foo</a></span> `Foo` [Foo](https://example.com/Foo) <a href="#other">Foo</a>
+
+            ```
+            Foo
+            ```
+
+                Foo
+
+            <!-- Foo -->
+            [Foo]: https://example.com/Foo
+
+            An unmatched ` and <a href="#foo" data-definition-list-link=1>Foo</a>.
+
+            <a href="#foo" data-definition-list-link=1>Foo</a> `Foo`
+
+            """,
+        ),
+        {
+            "Foo": "The definition.",
+        },
+    )
+
+
+# ----------------------------------------------------------------------
+class TestTermMatcher(object):
+    """Ensure that results are the same when links are inserted with a TermMatcher rather than a regular expression."""
+
+    # ----------------------------------------------------------------------
+    @pytest.fixture(autouse=True)
+    def _force_term_matcher(self, monkeypatch):
+        monkeypatch.setattr(DefinitionListPlugin, "TERM_MATCHER_THRESHOLD", 1)
+
+    # ----------------------------------------------------------------------
+    def test_StandardWithPostprocessing(self, _content, _definition_list):
+        test_StandardWithPostprocessing(_content, _definition_list)
+
+    # ----------------------------------------------------------------------
+    def test_OldContentIsRemoved(self):
+        test_OldContentIsRemoved()
+
+    # ----------------------------------------------------------------------
+    def test_PreviousLinksAreUpdated(self):
+        test_PreviousLinksAreUpdated()
+
+    # ----------------------------------------------------------------------
+    def test_StemmingExactGlobal(self, _content, _definition_list):
+        test_StemmingExactGlobal(_content, _definition_list)
+
+    # ----------------------------------------------------------------------
+    def test_FirstDefinitionWins(self):
+        test_FirstDefinitionWins()
+
+    # ----------------------------------------------------------------------
+    def test_SkipsCodeHeadingsAndLinks(self):
+        test_SkipsCodeHeadingsAndLinks()
+
+
+# ----------------------------------------------------------------------
+def test_HtmlListGenerateContent(_definition_list):
+    _Execute(
+        "",
+        textwrap.dedent(
+            """\
+            <dl>
+              <dt><a id="foo">Foo</a></dt>
+              <dd>This is the definition for <a href="#foo" data-definition-list-link=1>Foo</a>.</dd>
+              <dt><a id="bar">Bar</a></dt>
+              <dd>And here is <a href="#bar" data-definition-list-link=1>Bar</a>.</dd>
+              <dt><a id="one-two">one two</a></dt>
+              <dd>What happens when we search for multiple words?</dd>
+              <dt><a id="hyphenated-word">hyphenated-word</a></dt>
+              <dd>And <a href="#hyphenated-word" data-definition-list-link=1>hyphenated-words</a>?</dd>
+            </dl>
+
+
+            """,
+        ),
+        _definition_list,
+        generate_content_func=DefinitionListPlugin.HtmlListGenerateContent,
+    )
+
+
+# ----------------------------------------------------------------------
+def test_MarkdownListGenerateContent(_definition_list):
+    _Execute(
+        "",
+        textwrap.dedent(
+            """\
+            - **<a id="foo">Foo</a>**: This is the definition for <a href="#foo" data-definition-list-link=1>Foo</a>.
+            - **<a id="bar">Bar</a>**: And here is <a href="#bar" data-definition-list-link=1>Bar</a>.
+            - **<a id="one-two">one two</a>**: What happens when we search for multiple words?
+            - **<a id="hyphenated-word">hyphenated-word</a>**: And <a href="#hyphenated-word" data-definition-list-link=1>hyphenated-words</a>?
+
+
+            """,
+        ),
+        _definition_list,
+        generate_content_func=DefinitionListPlugin.MarkdownListGenerateContent,
+    )
+
+
+# ----------------------------------------------------------------------
+def test_GitHubAnchorStyle():
+    _Execute(
+        "",
+        textwrap.dedent(
+            """\
+            <p>
+              <div><i><a id="c">C#</a></i></div>
+              <div>  A language.</div>
+            </p>
+            <p>
+              <div><i><a id="c-1">C</a></i></div>
+              <div>  An abbreviation.</div>
+            </p>
+
+
+            """,
+        ),
+        {
+            "C#": DefinitionListPlugin.DefinitionInfo(
+                "A language.",
+                postprocess_type=DefinitionListPlugin.PostprocessType.NoPostprocessing,
+            ),
+            "C": DefinitionListPlugin.DefinitionInfo(
+                "An abbreviation.",
+                postprocess_type=DefinitionListPlugin.PostprocessType.NoPostprocessing,
+            ),
+        },
+        anchor_style=DefinitionListPlugin.AnchorStyle.GitHub,
+    )
+
+
+# ----------------------------------------------------------------------
+class TestStemCache(object):
+    # ----------------------------------------------------------------------
+    def test_Statistics(self, _content, _definition_list):
+        plugin = DefinitionListPlugin()
+
+        # Populate the cache
+        test_StandardWithPostprocessing(_content, _definition_list)
+
+        prev_statistics = plugin.GetStatistics()
+
+        test_StandardWithPostprocessing(_content, _definition_list)
+
+        statistics = plugin.GetStatistics()
+
+        # All of the tokens should have been found in the cache the second time around
+        assert statistics["stem_cache_hits"] > prev_statistics["stem_cache_hits"]
+        assert statistics["stem_cache_misses"] == prev_statistics["stem_cache_misses"]
+        assert 0.0 < statistics["stem_cache_hit_rate"] <= 1.0
+
+    # ----------------------------------------------------------------------
+    def test_SaveAndLoad(self, _content, _definition_list, tmp_path):
+        plugin = DefinitionListPlugin()
+
+        test_StandardWithPostprocessing(_content, _definition_list)
+
+        plugin.SaveCache(tmp_path)
+
+        cache_filename = tmp_path / "DefinitionList.stems.json"
+        assert cache_filename.is_file()
+
+        with cache_filename.open() as f:
+            data = json.load(f)
+
+        assert data["version"].startswith("MarkdownModifier.PorterStemmer-")
+        assert data["stems"]["Fooing"] == "foo"
+
+        plugin.LoadCache(tmp_path)
+
+    # ----------------------------------------------------------------------
+    def test_NltkBackend(self, _content, _definition_list, tmp_path, monkeypatch):
+        plugin = DefinitionListPlugin()
+
+        monkeypatch.setattr(DefinitionListPlugin, "STEMMER_BACKEND", DefinitionListPlugin.StemmerBackend.Nltk)
+
+        # Both backends produce the same stems
+        test_StandardWithPostprocessing(_content, _definition_list)
+
+        plugin.SaveCache(tmp_path)
+
+        with (tmp_path / "DefinitionList.stems.json").open() as f:
+            data = json.load(f)
+
+        assert data["version"].startswith("nltk.PorterStemmer-")
+        assert data["stems"]["Fooing"] == "foo"
+
+    # ----------------------------------------------------------------------
+    def test_LoadInvalid(self, tmp_path):
+        plugin = DefinitionListPlugin()
+
+        # Missing files, invalid content, and content generated by a different stemmer are ignored
+        plugin.LoadCache(tmp_path)
+
+        cache_filename = tmp_path / "DefinitionList.stems.json"
+
+        with cache_filename.open("w") as f:
+            f.write("This is not json")
+
+        plugin.LoadCache(tmp_path)
+
+        with cache_filename.open("w") as f:
+            json.dump({"version": "a different stemmer", "stems": {"Fooing": "invalid"}}, f)
+
+        plugin.LoadCache(tmp_path)
+
+        _Execute(
+            "Fooing",
+            textwrap.dedent(
+                """\
+                <p>
+                  <div><i><a id="foo">Foo</a></i></div>
+                  <div>  The definition.</div>
+                </p>
+
+                <a href="#foo" data-definition-list-link=1>Fooing</a>
+                """,
+            ),
+            {
+                "Foo": "The definition.",
+            },
+        )
+
+
+# ----------------------------------------------------------------------
+class TestNgramTrieCache(object):
+    # ----------------------------------------------------------------------
+    def test_Statistics(self, _content, _definition_list):
+        plugin = DefinitionListPlugin()
+
+        test_StandardWithPostprocessing(_content, _definition_list)
+
+        prev_statistics = plugin.GetStatistics()
+
+        test_StandardWithPostprocessing(_content, _definition_list)
+
+        statistics = plugin.GetStatistics()
+
+        # The multi-word terms haven't changed, so the trie is reused
+        assert statistics["ngram_trie_cache_hits"] == prev_statistics["ngram_trie_cache_hits"] + 1
+        assert statistics["ngram_trie_cache_misses"] == prev_statistics["ngram_trie_cache_misses"]
+        assert 0.0 < statistics["ngram_trie_cache_hit_rate"] <= 1.0
+        assert statistics["ngram_trie_cache_tries"] >= 1
+        assert statistics["ngram_trie_cache_bytes"] > 0
+
+    # ----------------------------------------------------------------------
+    def test_SharedGlossary(self):
+        plugin = DefinitionListPlugin()
+
+        prev_statistics = plugin.GetStatistics()
+
+        plugin.Execute(Path("Glossary.md"), {"red panda": "An animal."}, export=True)
+        _Postprocess(plugin, Path("Glossary.md"), "")
+
+        for index in range(3):
+            assert _Postprocess(plugin, Path("Page{}.md".format(index)), "red pandas") == (
+                '<a href="Glossary.md#red-panda" data-definition-list-link=1>red pandas</a>'
+            )
+
+        statistics = plugin.GetStatistics()
+
+        # The trie (and the plural of 'panda') is created once and shared by all of the pages
+        assert statistics["ngram_trie_cache_misses"] == prev_statistics.get("ngram_trie_cache_misses", 0) + 1
+        assert statistics["ngram_trie_cache_hits"] == prev_statistics.get("ngram_trie_cache_hits", 0) + 2
+
+        plugin.Execute(Path("Glossary.md"), {}, export=True)
+        _Postprocess(plugin, Path("Glossary.md"), "")
+
+
+# ----------------------------------------------------------------------
+class TestPrefilter(object):
+    # ----------------------------------------------------------------------
+    @pytest.fixture
+    def _plugin(self):
+        plugin = DefinitionListPlugin()
+
+        plugin.Execute(
+            Path("Glossary.md"),
+            {
+                "Gizmo": "A gadget.",
+                "Mouse": DefinitionListPlugin.DefinitionInfo(
+                    "A small rodent.",
+                    postprocess_type=DefinitionListPlugin.PostprocessType.CaseInsensitive | DefinitionListPlugin.PostprocessType.Lemmatisation,
+                ),
+                "co-op": "A cooperative.",
+            },
+            export=True,
+        )
+        _Postprocess(plugin, Path("Glossary.md"), "")
+
+        yield plugin
+
+        plugin.Execute(Path("Glossary.md"), {}, export=True)
+        _Postprocess(plugin, Path("Glossary.md"), "")
+
+    # ----------------------------------------------------------------------
+    def test_NoCandidates(self, _plugin):
+        content = "Nothing to link here; not even a gadget."
+
+        prev_statistics = _plugin.GetStatistics()
+
+        assert _Postprocess(_plugin, Path("Page.md"), content) == content
+
+        # The content wasn't tokenized or stemmed
+        assert _plugin.GetStatistics().get("stem_cache_misses") == prev_statistics.get("stem_cache_misses")
+        assert _plugin.GetStatistics().get("stem_cache_hits") == prev_statistics.get("stem_cache_hits")
+
+    # ----------------------------------------------------------------------
+    @pytest.mark.parametrize(
+        "content, expected",
+        [
+            ("GIZMOS", '<a href="Glossary.md#gizmo" data-definition-list-link=1>GIZMOS</a>'),
+            ("Two mice", 'Two <a href="Glossary.md#mouse" data-definition-list-link=1>mice</a>'),
+            ("Two co-ops.", 'Two <a href="Glossary.md#co-op" data-definition-list-link=1>co-ops</a>.'),
+            ("a/Gizmo", 'a/<a href="Glossary.md#gizmo" data-definition-list-link=1>Gizmo</a>'),
+        ],
+    )
+    def test_Candidates(self, _plugin, content, expected):
+        assert _Postprocess(_plugin, Path("Page.md"), content) == expected
+
+
+# ----------------------------------------------------------------------
+class TestExport(object):
+    # ----------------------------------------------------------------------
+    def test_Standard(self):
+        plugin = DefinitionListPlugin()
+
+        glossary_filename = Path("root/Glossary.md")
+        page_filename = Path("root/Dir/Page.md")
+
+        definitions = plugin.Execute(
+            glossary_filename,
+            {
+                "Foo Bar": "Another definition.",
+                "foo": "The definition.",
+            },
+            export=True,
+        )
+
+        assert _Postprocess(plugin, glossary_filename, definitions + "foo\n").endswith(
+            '<a href="#foo" data-definition-list-link=1>foo</a>\n',
+        )
+
+        assert _Postprocess(plugin, page_filename, "The foos and Foo Bar.\n") == (
+            'The <a href="../Glossary.md#foo" data-definition-list-link=1>foos</a> and '
+            '<a href="../Glossary.md#foo-bar" data-definition-list-link=1>Foo Bar</a>.\n'
+        )
+
+    # ----------------------------------------------------------------------
+    def test_LocalDefinitionsWin(self):
+        plugin = DefinitionListPlugin()
+
+        glossary_filename = Path("Glossary.md")
+        page_filename = Path("Page.md")
+
+        _Postprocess(
+            plugin,
+            glossary_filename,
+            plugin.Execute(glossary_filename, {"foo": "The definition.", "bar": "Bar."}, export=True),
+        )
+
+        definitions = plugin.Execute(page_filename, {"foo": "The local definition."})
+
+        assert _Postprocess(plugin, page_filename, definitions + "foo bar\n").endswith(
+            '<a href="#foo" data-definition-list-link=1>foo</a> '
+            '<a href="Glossary.md#bar" data-definition-list-link=1>bar</a>\n',
+        )
+
+    # ----------------------------------------------------------------------
+    def test_NotExported(self):
+        plugin = DefinitionListPlugin()
+
+        _Postprocess(
+            plugin,
+            Path("One.md"),
+            plugin.Execute(Path("One.md"), {"foo": "The definition."}),
+        )
+
+        # Definitions that aren't exported are only linked in the file that defines them
+        assert _Postprocess(plugin, Path("Two.md"), "foo\n") == "foo\n"
+
+    # ----------------------------------------------------------------------
+    def test_ExportRemoved(self):
+        plugin = DefinitionListPlugin()
+
+        _Postprocess(
+            plugin,
+            Path("Glossary.md"),
+            plugin.Execute(Path("Glossary.md"), {"foo": "The definition."}, export=True),
+        )
+
+        assert _Postprocess(plugin, Path("Page.md"), "foo\n") == '<a href="Glossary.md#foo" data-definition-list-link=1>foo</a>\n'
+
+        # Process the glossary file again, this time without exported definitions
+        _Postprocess(
+            plugin,
+            Path("Glossary.md"),
+            plugin.Execute(Path("Glossary.md"), {"foo": "The definition."}),
+        )
+
+        assert _Postprocess(plugin, Path("Page.md"), '<a href="Glossary.md#foo" data-definition-list-link=1>foo</a>\n') == "foo\n"
+
+    # ----------------------------------------------------------------------
+    def test_IsPrerequisite(self):
+        plugin = DefinitionListPlugin()
+
+        assert plugin.IsPrerequisite(Path("Glossary.md"), 'DefinitionList({"foo": "bar"}, export=True)')
+        assert plugin.IsPrerequisite(Path("Glossary.md"), 'DefinitionList({"foo": "bar"}, export = True)')
+        assert not plugin.IsPrerequisite(Path("Glossary.md"), 'DefinitionList({"foo": "bar"})')
+        assert not plugin.IsPrerequisite(Path("Glossary.md"), 'DefinitionList({"foo": "bar"}, export=False)')
+        assert not plugin.IsPrerequisite(Path("Page.md"), "No definitions here.")
+
+    # ----------------------------------------------------------------------
+    def test_GetDependencies(self):
+        plugin = DefinitionListPlugin()
+
+        _Postprocess(
+            plugin,
+            Path("Glossary.md"),
+            plugin.Execute(Path("Glossary.md"), {"foo": "The definition."}, export=True),
+        )
+
+        # The file exporting the definitions doesn't depend upon itself
+        assert plugin.GetDependencies(Path("Glossary.md")) == set()
+
+        _Postprocess(plugin, Path("Page.md"), "Nothing to link.\n")
+
+        # Pages depend upon all files that export definitions, as changes to those files may change
+        # the links in the page.
+        assert plugin.GetDependencies(Path("Page.md")) == {Path("Glossary.md")}
+
+        # Dependencies are reported once
+        assert plugin.GetDependencies(Path("Page.md")) == set()
+
+
 # ----------------------------------------------------------------------
 def test_ErrorPostprocessValues():
     with pytest.raises(
@@ -573,10 +1309,39 @@ def _Execute(
     plugin = DefinitionListPlugin()
     filename = Path("filename")
 
-    assert plugin.Postprocess(
+    assert _Postprocess(
+        plugin,
         filename,
         content_template.format(
             definitions=plugin.Execute(filename, *args, **kwargs),
             content=content,
         ),
     ).replace("&nbsp;", " ") == expected
+
+
+# ----------------------------------------------------------------------
+def _Postprocess(
+    plugin: DefinitionListPlugin,
+    filename: Path,
+    content: str,
+) -> str:
+    """Visits the spans of the content in the same way that `Modify` does."""
+
+    span_types = plugin.BeginVisit(filename, content)
+    if not span_types:
+        return content
+
+    spans = list(EnumerateSpans(content))
+    span_texts = [content[span.start:span.end] for span in spans]
+
+    for index, text in plugin.VisitSpans(
+        filename,
+        [
+            VisitedSpan(index, span.type, span_texts[index])
+            for index, span in enumerate(spans)
+            if span.type in span_types
+        ],
+    ).items():
+        span_texts[index] = text
+
+    return "".join(span_texts)
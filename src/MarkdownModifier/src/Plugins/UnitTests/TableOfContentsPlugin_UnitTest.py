@@ -319,6 +319,89 @@ class TestSingle(object):
             generate_table_of_contents_func=Generate,
         )
 
+    # ----------------------------------------------------------------------
+    def test_MarkdownListGenerateFunc(self, _content):
+        _Execute(
+            _content,
+            textwrap.dedent(
+                """\
+                - 1 [One](#one)
+                  - 1.1 [One.1](#one1)
+                    - 1.1.1 [One.1.1](#one11)
+                      - 1.1.1.1 [One 1.1.1.1](#one-1111)
+                  - 1.2 [One.2](#one2)
+                - 2 [Two](#two)
+                  - 2.1 Unknown
+                    - 2.1.1 [Two.1.1](#two11)
+                - 3 [Three](#three)
+                - 4 [Four](#four)
+                {}
+                """,
+            ).format(_content),
+            generate_table_of_contents_func=TableOfContentsPlugin.MarkdownListGenerateTableOfContents,
+        )
+
+    # ----------------------------------------------------------------------
+    def test_HtmlListGenerateFunc(self, _content):
+        _Execute(
+            _content,
+            textwrap.dedent(
+                """\
+                <ul>
+                <li>1 <a href="#one">One</a>
+                <ul>
+                <li>1.1 <a href="#one1">One.1</a>
+                <ul>
+                <li>1.1.1 <a href="#one11">One.1.1</a>
+                <ul>
+                <li>1.1.1.1 <a href="#one-1111">One 1.1.1.1</a></li>
+                </ul></li>
+                </ul></li>
+                <li>1.2 <a href="#one2">One.2</a></li>
+                </ul></li>
+                <li>2 <a href="#two">Two</a>
+                <ul>
+                <li>2.1 Unknown
+                <ul>
+                <li>2.1.1 <a href="#two11">Two.1.1</a></li>
+                </ul></li>
+                </ul></li>
+                <li>3 <a href="#three">Three</a></li>
+                <li>4 <a href="#four">Four</a></li>
+                </ul>
+                {}
+                """,
+            ).format(_content),
+            generate_table_of_contents_func=TableOfContentsPlugin.HtmlListGenerateTableOfContents,
+        )
+
+    # ----------------------------------------------------------------------
+    def test_GitHubAnchorStyle(self):
+        content = textwrap.dedent(
+            """\
+            # Getting Started!
+            ## Example
+            # What's New? (v1.2)
+            ## Example
+            ## Example-1
+            """,
+        )
+
+        _Execute(
+            content,
+            textwrap.dedent(
+                """\
+                <div>1 <a href="#getting-started">Getting Started!</a></div>
+                <div>  1.1 <a href="#example">Example</a></div>
+                <div>2 <a href="#whats-new-v12">What's New? (v1.2)</a></div>
+                <div>  2.1 <a href="#example-1">Example</a></div>
+                <div>  2.2 <a href="#example-1-1">Example-1</a></div>
+                {}
+                """,
+            ).format(content),
+            anchor_style=TableOfContentsPlugin.AnchorStyle.GitHub,
+        )
+
 
 # ----------------------------------------------------------------------
 def test_MultipleSections(_content):